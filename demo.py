@@ -14,7 +14,6 @@ from zapi import (
     ZAPIError,
     ZAPINetworkError,
     ZAPIValidationError,
-    analyze_har_file,
 )
 
 # ---------------------------------------------------------------------------
@@ -23,41 +22,46 @@ from zapi import (
 DEMO_URL = "<INSERT_URL_HERE>"
 OUTPUT_FILE = Path("demo_session.har")
 HEADLESS_BROWSER = False
+# Record scripted actions (navigate/click/fill/wait_for) so the capture can be replayed headless
+RECORD_FLOW = False
 
 
-def record_session(zapi_client: ZAPI, url: str, output_path: Path) -> None:
-    """Record a HAR file by letting the user drive the browser."""
+def record_session(zapi_client: ZAPI, url: str, output_path: Path) -> Optional[Path]:
+    """Record a HAR file by letting the user drive the browser, then filter it in the same pass."""
     print(f"🌐 Launching browser and navigating to: {url}")
-    session = zapi_client.launch_browser(url=url, headless=HEADLESS_BROWSER)
+    session = zapi_client.launch_browser(url=url, headless=HEADLESS_BROWSER, record_flow=RECORD_FLOW)
     try:
         print("✅ Browser launched successfully!")
         input("📋 Use the browser freely, then press ENTER to save the HAR...")
 
-        print("💾 Saving session logs...")
-        session.dump_logs(str(output_path))
+        print("💾 Saving and analyzing session logs...")
+        filtered_path = output_path.with_name(f"{output_path.stem}_filtered.har")
+        try:
+            stats = session.dump_logs(str(output_path), filtered=True, filtered_filepath=str(filtered_path))
+        except HarProcessingError as exc:
+            print(f"⚠️ HAR analysis failed: {exc}")
+            print("   Continuing with the original HAR.")
+            stats = None
         print(f"✅ Session saved to: {output_path}")
+
+        if RECORD_FLOW:
+            flow_path = session.save_flow(output_path.with_suffix(".flow.json"))
+            print(f"🎬 Scripted actions saved to: {flow_path} (replay with ZAPI.replay_flows)")
     finally:
         session.close()
         print("🧹 Browser session closed.")
 
-
-def analyze_har_file_with_filter(source_path: Path) -> Optional[Path]:
-    """Analyze the HAR and produce a filtered file for API-only calls."""
-    print("\n🔍 Analyzing HAR file...")
-    try:
-        stats, report, filtered_path = analyze_har_file(str(source_path), save_filtered=True)
-    except HarProcessingError as exc:
-        print(f"⚠️ HAR analysis failed: {exc}")
-        print("   Continuing with the original HAR.")
+    if stats is None:
         return None
 
     print("\n📊 HAR Analysis Results:")
     print(f"   ✅ API-relevant entries: {stats.valid_entries:,}")
     print(f"   💰 Estimated cost: ${stats.estimated_cost_usd:.2f}")
     print(f"   ⏱️  Estimated processing time: {round(stats.estimated_time_minutes)} minutes")
-    if filtered_path:
-        print(f"   🧹 Filtered HAR saved to: {filtered_path}")
-    return Path(filtered_path).resolve() if filtered_path else None
+    if stats.valid_entries == 0:
+        return None
+    print(f"   🧹 Filtered HAR saved to: {filtered_path}")
+    return filtered_path.resolve()
 
 
 def pick_upload_file(original_path: Path, filtered_path: Optional[Path]) -> Path:
@@ -84,9 +88,7 @@ def main() -> int:
 
     try:
         z = ZAPI()
-        record_session(z, url, output_path)
-
-        filtered_path = analyze_har_file_with_filter(output_path)
+        filtered_path = record_session(z, url, output_path)
         upload_path = pick_upload_file(output_path, filtered_path)
 
         confirm = input("\n💡 Ready to upload. Press ENTER to continue or 'n' to cancel: ").strip().lower()
@@ -7,6 +7,7 @@ operations or integration with async frameworks.
 
 import asyncio
 
+from zapi import ZAPI
 from zapi.session import BrowserSession
 
 
@@ -17,10 +18,10 @@ async def main():
     print("Example 1: Direct async API usage")
     session = BrowserSession(auth_token="YOUR_TOKEN", headless=True)
 
-    await session._initialize(initial_url="https://app.example.com")
-    await session._wait_for_async(timeout=2000)
-    await session._dump_logs_async("async_example1.har")
-    await session._close_async()
+    await session.start("https://app.example.com")
+    await session.await_for_selector(timeout=2000)
+    await session.adump_logs("async_example1.har")
+    await session.aclose()
     print("✓ HAR file saved to async_example1.har\n")
 
     # Example 2: Concurrent sessions (multiple browsers at once)
@@ -29,10 +30,10 @@ async def main():
     async def capture_session(url, output_file):
         """Helper to capture a session."""
         session = BrowserSession(auth_token="YOUR_TOKEN", headless=True)
-        await session._initialize(initial_url=url)
-        await session._wait_for_async(timeout=1000)
-        await session._dump_logs_async(output_file)
-        await session._close_async()
+        await session.start(url)
+        await session.await_for_selector(timeout=1000)
+        await session.adump_logs(output_file)
+        await session.aclose()
         print(f"✓ Captured {url} -> {output_file}")
 
     # Run multiple sessions concurrently
@@ -46,14 +47,23 @@ async def main():
     # Example 3: Async context manager
     print("Example 3: Using async context manager")
     session = BrowserSession(auth_token="YOUR_TOKEN", headless=True)
-    await session._initialize(initial_url="https://app.example.com")
+    await session.start("https://app.example.com")
 
     async with session:
-        await session._navigate_async("/dashboard")
-        await session._wait_for_async(timeout=2000)
-        await session._dump_logs_async("async_context.har")
+        await session.anavigate("/dashboard")
+        await session.await_for_selector(timeout=2000)
+        await session.adump_logs("async_context.har")
     print("✓ HAR file saved to async_context.har (auto-cleanup)\n")
 
+    # Example 4: Launching through ZAPI from a running event loop
+    print("Example 4: Using ZAPI.alaunch_browser")
+    z = ZAPI(client_id="YOUR_CLIENT_ID", secret="YOUR_SECRET")
+    session = await z.alaunch_browser(url="https://app.example.com")
+    async with session:
+        await session.aclick("#settings-button")
+        await session.adump_logs("async_launch.har")
+    print("✓ HAR file saved to async_launch.har\n")
+
     print("All async examples completed!")
 
 
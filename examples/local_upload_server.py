@@ -0,0 +1,152 @@
+"""
+Local stand-in for the ZAPI chunked upload endpoints.
+
+Implements the part protocol used by ``zapi.upload.ResumableUploader`` so
+resumable uploads can be tried and tested without the hosted service. Parts
+are written to a directory and assembled on completion.
+
+Run it, then upload against it:
+
+    python examples/local_upload_server.py --port 8765 --fail-every 5
+
+    from zapi.upload import ResumableUploader
+    uploader = ResumableUploader("http://127.0.0.1:8765", auth_token="local")
+    uploader.upload("session.har")   # re-run after a failure to resume
+
+``--fail-every N`` drops every Nth part request to simulate flaky links.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import shutil
+import tempfile
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+UPLOADS_PATH = "/v1/api-discovery/uploads"
+PART_ROUTE = re.compile(rf"^{UPLOADS_PATH}/([0-9a-f]+)/parts/(\d+)$")
+COMPLETE_ROUTE = re.compile(rf"^{UPLOADS_PATH}/([0-9a-f]+)/complete$")
+
+
+class UploadStore:
+    """Keeps upload sessions and their parts on disk."""
+
+    def __init__(self, root: Path, fail_every: int = 0):
+        self.root = root
+        self.fail_every = fail_every
+        self.uploads: dict[str, dict] = {}
+        self.part_requests = 0
+        self.lock = threading.Lock()
+
+    def create(self, spec: dict) -> str:
+        upload_id = uuid.uuid4().hex
+        (self.root / upload_id).mkdir(parents=True)
+        with self.lock:
+            self.uploads[upload_id] = spec
+        return upload_id
+
+    def should_fail(self) -> bool:
+        with self.lock:
+            self.part_requests += 1
+            return bool(self.fail_every) and self.part_requests % self.fail_every == 0
+
+
+class UploadHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    store: UploadStore
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def do_POST(self):
+        if self.path == UPLOADS_PATH:
+            spec = json.loads(self._read_body())
+            upload_id = self.store.create(spec)
+            print(f"created upload {upload_id}: {spec['filename']} ({spec['size']} bytes, {spec['part_count']} parts)")
+            return self._send_json(201, {"upload_id": upload_id})
+
+        match = COMPLETE_ROUTE.match(self.path)
+        if match:
+            upload_id = match.group(1)
+            spec = self.store.uploads.get(upload_id)
+            if spec is None:
+                return self._send_json(404, {"error": "unknown upload"})
+
+            parts = json.loads(self._read_body())["parts"]
+            output = self.store.root / f"{upload_id}.har"
+            digest = hashlib.sha256()
+            with open(output, "wb") as out:
+                for part in sorted(parts, key=lambda p: p["part"]):
+                    data = (self.store.root / upload_id / str(part["part"])).read_bytes()
+                    if hashlib.sha256(data).hexdigest() != part["sha256"]:
+                        return self._send_json(400, {"error": f"checksum mismatch in part {part['part']}"})
+                    digest.update(data)
+                    out.write(data)
+
+            if output.stat().st_size != spec["size"]:
+                return self._send_json(400, {"error": "assembled size does not match"})
+            print(f"completed upload {upload_id} -> {output}")
+            return self._send_json(200, {"status": "uploaded", "upload_id": upload_id, "sha256": digest.hexdigest()})
+
+        self._send_json(404, {"error": "not found"})
+
+    def do_PUT(self):
+        match = PART_ROUTE.match(self.path)
+        if not match or match.group(1) not in self.store.uploads:
+            return self._send_json(404, {"error": "unknown upload"})
+
+        data = self._read_body()
+        if self.store.should_fail():
+            # Simulate a dropped connection mid-upload
+            self.close_connection = True
+            self.connection.shutdown(2)
+            return
+
+        checksum = hashlib.sha256(data).hexdigest()
+        if checksum != self.headers.get("X-Part-SHA256"):
+            return self._send_json(400, {"error": "checksum mismatch"})
+
+        (self.store.root / match.group(1) / match.group(2)).write_bytes(data)
+        self._send_json(200, {"part": int(match.group(2)), "sha256": checksum})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the ZAPI chunked upload endpoints")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--storage", help="Directory for received parts (default: a temporary directory)")
+    parser.add_argument("--fail-every", type=int, default=0, help="Drop every Nth part request")
+    args = parser.parse_args()
+
+    root = Path(args.storage or tempfile.mkdtemp(prefix="zapi-uploads-"))
+    UploadHandler.store = UploadStore(root, fail_every=args.fail_every)
+    server = ThreadingHTTPServer((args.host, args.port), UploadHandler)
+    print(f"Upload server listening on http://{args.host}:{args.port} (storing parts in {root})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if not args.storage:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
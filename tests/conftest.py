@@ -0,0 +1,132 @@
+"""Offline stand-ins for the ZAPI backend, shared by the test modules."""
+
+import base64
+import io
+import itertools
+import json
+import time
+from typing import Any, Callable, Optional, Union
+from urllib.parse import urlparse
+
+import pytest
+import requests
+
+from zapi import ZAPI
+from zapi.transport import ZAPITransport
+
+Handler = Union[requests.Response, BaseException, Callable[..., Any], list]
+
+
+def make_response(
+    status_code: int = 200, json_body: Any = None, headers: Optional[dict[str, str]] = None
+) -> requests.Response:
+    """Build a requests.Response with a JSON body."""
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    if json_body is not None:
+        response._content = json.dumps(json_body).encode()
+        response.headers.setdefault("Content-Type", "application/json")
+    else:
+        response._content = b""
+    response.raw = io.BytesIO(response._content)
+    return response
+
+
+_token_ids = itertools.count()
+
+
+def make_jwt(expires_in: float = 3600.0) -> str:
+    """Unsigned JWT whose exp claim is ``expires_in`` seconds from now (a new token on every call)."""
+    payload = json.dumps({"exp": time.time() + expires_in, "sub": "client", "jti": next(_token_ids)}).encode()
+    return "eyJhbGciOiAibm9uZSJ9." + base64.urlsafe_b64encode(payload).decode().rstrip("=") + ".sig"
+
+
+def multipart_parts(body: bytes) -> dict[str, bytes]:
+    """Split a multipart/form-data body into {field name: content}."""
+    boundary = body.split(b"\r\n", 1)[0]
+    parts = {}
+    for raw in body.split(boundary)[1:-1]:
+        headers, content = raw[2:].split(b"\r\n\r\n", 1)
+        name = headers.split(b'name="', 1)[1].split(b'"', 1)[0].decode()
+        parts[name] = content[:-2]
+    return parts
+
+
+class FakeBackend(requests.Session):
+    """
+    requests.Session answering from handlers registered per (method, path).
+
+    A handler is a response, an exception to raise, a callable receiving the
+    request keyword arguments, or a list of those consumed one per request
+    (the last one repeats). Every request is recorded in ``calls``.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.routes: dict[tuple[str, str], Handler] = {}
+        self.calls: list[tuple[str, str, dict]] = []
+
+    def route(self, method: str, path: str, handler: Handler) -> None:
+        self.routes[(method, path)] = handler
+
+    def paths(self, method: Optional[str] = None) -> list[str]:
+        """Paths requested so far, optionally only for one method."""
+        return [path for call_method, path, _ in self.calls if method in (None, call_method)]
+
+    def request(self, method, url, **kwargs):
+        path = urlparse(url).path
+        self.calls.append((method, path, kwargs))
+        handler = self.routes.get((method, path))
+        if handler is None:
+            return make_response(404, {"detail": "not found"})
+        if isinstance(handler, list):
+            handler = handler.pop(0) if len(handler) > 1 else handler[0]
+        if callable(handler) and not isinstance(handler, requests.Response):
+            handler = handler(**kwargs)
+        if isinstance(handler, BaseException):
+            raise handler
+        return handler
+
+
+@pytest.fixture
+def backend() -> FakeBackend:
+    """Fake backend that accepts any credentials."""
+    fake = FakeBackend()
+    fake.route("POST", "/v1/auth/token", lambda **kwargs: make_response(200, {"token": make_jwt()}))
+    fake.route("POST", "/v1/auth/validate-token", make_response(200, {"org_id": "org_1", "user_email": "a@b.c"}))
+    return fake
+
+
+@pytest.fixture
+def transport(backend) -> ZAPITransport:
+    """ZAPITransport sending through the fake backend, retrying without sleeping."""
+    transport = ZAPITransport(backoff_base_seconds=0.0)
+    transport.session = backend
+    return transport
+
+
+@pytest.fixture
+def make_zapi(transport):
+    """Build ZAPI clients on the fake backend (no disk caches); they are closed after the test."""
+    clients = []
+
+    def _make(**kwargs) -> ZAPI:
+        options = {
+            "client_id": "client",
+            "secret": "secret",
+            "llm_provider": "",
+            "llm_model_name": "",
+            "llm_api_key": "",
+            "transport": transport,
+            "token_cache": False,
+            "catalog_cache": False,
+            **kwargs,
+        }
+        client = ZAPI(**options)
+        clients.append(client)
+        return client
+
+    yield _make
+    for client in clients:
+        client.close()
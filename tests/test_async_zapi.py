@@ -0,0 +1,142 @@
+"""AsyncZAPI retries, listing prefetch and LLM key setup, on an httpx mock transport."""
+
+import asyncio
+import json
+import os
+
+import httpx
+import pytest
+from conftest import make_jwt
+
+from zapi import transport as transport_module
+from zapi.async_core import AsyncZAPI
+
+ANTHROPIC_KEY = "sk-ant-" + "x" * 30
+PAGE_SIZE = 10
+TOTAL = 95
+
+
+class MockBackend:
+    """httpx handler answering the auth and listing endpoints; ``statuses`` queues listing failures."""
+
+    def __init__(self, page_delay: float = 0.0):
+        self.page_delay = page_delay
+        self.statuses: list[tuple[int, dict]] = []
+        self.requests: list[str] = []
+        self.pages_in_flight = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request.url.path)
+        if request.url.path == "/v1/auth/token":
+            return httpx.Response(200, json={"token": make_jwt()})
+        if request.url.path == "/v1/auth/validate-token":
+            return httpx.Response(200, json={"org_id": "org_1", "user_email": "a@b.c"})
+        if self.statuses:
+            status, headers = self.statuses.pop(0)
+            return httpx.Response(status, headers=headers)
+
+        page = int(request.url.params["page"])
+        self.pages_in_flight += 1
+        try:
+            await asyncio.sleep(self.page_delay)
+        finally:
+            self.pages_in_flight -= 1
+        items = [{"id": index} for index in range((page - 1) * PAGE_SIZE, min(page * PAGE_SIZE, TOTAL))]
+        return httpx.Response(200, content=json.dumps({"items": items, "total": TOTAL}))
+
+
+def _client(backend: MockBackend, **kwargs) -> AsyncZAPI:
+    options = {
+        "client_id": "client",
+        "secret": "secret",
+        "llm_provider": "",
+        "llm_model_name": "",
+        "llm_api_key": "",
+        "client": httpx.AsyncClient(transport=httpx.MockTransport(backend)),
+        "token_cache": False,
+        "backoff_base_seconds": 0.0,
+        **kwargs,
+    }
+    return AsyncZAPI(**options)
+
+
+def test_retryable_statuses_are_retried():
+    backend = MockBackend()
+    backend.statuses = [(503, {}), (429, {"Retry-After": "0"})]
+
+    async def main():
+        return await _client(backend).get_documented_apis(page=1, page_size=PAGE_SIZE)
+
+    assert len(asyncio.run(main())["items"]) == PAGE_SIZE
+    assert backend.requests.count("/v1/tools/apis") == 3
+
+
+def test_retry_delay_is_shared_with_the_sync_transport(monkeypatch):
+    backend = MockBackend()
+    backend.statuses = [(429, {"Retry-After": "4"})]
+    delays = []
+    real_delay = transport_module.retry_delay
+
+    def _recording_delay(*args, **kwargs):
+        delays.append(real_delay(*args, **kwargs))
+        return 0.0
+
+    monkeypatch.setattr("zapi.async_core.retry_delay", _recording_delay)
+
+    async def main():
+        await _client(backend, backoff_max_seconds=3.0).get_documented_apis()
+
+    asyncio.run(main())
+    assert delays == [3.0]
+
+
+def test_listing_is_complete_and_in_order():
+    backend = MockBackend()
+
+    async def main():
+        return await _client(backend).get_all_documented_apis(page_size=PAGE_SIZE, concurrency=3)
+
+    assert [api["id"] for api in asyncio.run(main())] == list(range(TOTAL))
+
+
+def test_prefetched_pages_are_awaited_when_iteration_stops_early():
+    backend = MockBackend(page_delay=0.05)
+
+    async def main():
+        pages = _client(backend).iter_documented_apis(page_size=PAGE_SIZE, concurrency=4)
+        async for api in pages:
+            if api["id"] == PAGE_SIZE:
+                break
+        await pages.aclose()
+        # Nothing but this coroutine is left running
+        return backend.pages_in_flight, [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+    in_flight, leftover_tasks = asyncio.run(main())
+    assert in_flight == 0
+    assert leftover_tasks == []
+
+
+def test_llm_key_is_exported_for_langchain(monkeypatch):
+    monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+    backend = MockBackend()
+
+    async def main():
+        client = _client(backend, llm_provider="anthropic", llm_api_key=ANTHROPIC_KEY, llm_model_name="m")
+        assert "ANTHROPIC_API_KEY" not in os.environ
+        await client.authenticate()
+
+    asyncio.run(main())
+    assert os.environ["ANTHROPIC_API_KEY"] == ANTHROPIC_KEY
+
+
+@pytest.mark.parametrize("status", [400, 404])
+def test_client_errors_are_not_retried(status):
+    backend = MockBackend()
+    backend.statuses = [(status, {})]
+
+    async def main():
+        await _client(backend).get_documented_apis()
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(main())
+    assert backend.requests.count("/v1/tools/apis") == 1
@@ -0,0 +1,212 @@
+"""Catalog cache: conditional revalidation, TTL and stale-while-revalidate."""
+
+import hashlib
+import json
+
+import pytest
+from conftest import make_response
+
+from zapi.catalog import CATALOG_PAGE_SIZE, CatalogCache
+
+LISTING = "/v1/tools/apis"
+
+
+class CatalogServer:
+    """Listing endpoint serving ``apis`` in pages, with an ETag per page."""
+
+    def __init__(self, count: int):
+        self.apis = [{"id": f"api_{index}", "path": f"/things/{index}"} for index in range(count)]
+        self.sent = []
+
+    def __call__(self, params=None, headers=None, **kwargs):
+        page, page_size = params["page"], params["page_size"]
+        items = self.apis[(page - 1) * page_size : page * page_size]
+        etag = '"' + hashlib.sha256(json.dumps(items).encode()).hexdigest()[:16] + '"'
+        if headers.get("If-None-Match") == etag:
+            self.sent.append((page, 304))
+            return make_response(304)
+        self.sent.append((page, 200))
+        return make_response(200, {"items": items, "total": len(self.apis)}, headers={"ETag": etag})
+
+
+@pytest.fixture
+def server(backend) -> CatalogServer:
+    catalog = CatalogServer(count=CATALOG_PAGE_SIZE * 2 + 5)
+    backend.route("GET", LISTING, catalog)
+    return catalog
+
+
+def test_defaults_skip_the_server_within_the_ttl(make_zapi, server, tmp_path):
+    cache = CatalogCache(cache_dir=tmp_path)
+    assert (cache.ttl_seconds, cache.stale_while_revalidate_seconds) == (3600.0, 86400.0)
+    zapi = make_zapi(catalog_cache=cache)
+
+    assert zapi.get_catalog() == server.apis
+    assert server.sent == [(1, 200), (2, 200), (3, 200)]
+
+    server.sent.clear()
+    assert zapi.get_catalog() == server.apis
+    # A second client on the same cache directory starts from the disk copy
+    assert make_zapi(catalog_cache=CatalogCache(cache_dir=tmp_path)).get_catalog() == server.apis
+    assert server.sent == []
+
+
+def test_unchanged_pages_are_revalidated_with_etags(make_zapi, server, tmp_path):
+    zapi = make_zapi(catalog_cache=CatalogCache(cache_dir=tmp_path, ttl_seconds=0, stale_while_revalidate_seconds=0))
+    zapi.get_catalog()
+    server.sent.clear()
+
+    server.apis[CATALOG_PAGE_SIZE]["path"] = "/renamed"
+
+    assert zapi.get_catalog() == server.apis
+    assert sorted(server.sent) == [(1, 304), (2, 200), (3, 304)]
+
+
+def test_refresh_revalidates_a_fresh_snapshot(make_zapi, server, tmp_path):
+    zapi = make_zapi(catalog_cache=CatalogCache(cache_dir=tmp_path))
+    zapi.get_catalog()
+    server.sent.clear()
+
+    assert zapi.get_catalog(refresh=True) == server.apis
+    assert sorted(server.sent) == [(1, 304), (2, 304), (3, 304)]
+
+
+def test_stale_snapshot_is_served_while_it_is_refreshed(make_zapi, server, tmp_path):
+    cache = CatalogCache(cache_dir=tmp_path, ttl_seconds=0, stale_while_revalidate_seconds=3600)
+    zapi = make_zapi(catalog_cache=cache)
+    before = [dict(api) for api in zapi.get_catalog()]
+    server.apis.append({"id": "api_new", "path": "/new"})
+
+    assert zapi.get_catalog() == before
+    zapi._catalog_thread.join(10)
+
+    assert cache.load(zapi._catalog_key()).apis == server.apis
+    assert zapi.get_catalog() == server.apis
+
+
+def test_snapshot_past_the_stale_window_is_synced_first(make_zapi, server, tmp_path):
+    zapi = make_zapi(catalog_cache=CatalogCache(cache_dir=tmp_path, ttl_seconds=0, stale_while_revalidate_seconds=0))
+    zapi.get_catalog()
+    server.apis.pop()
+
+    assert zapi.get_catalog() == server.apis
+    assert zapi._catalog_thread is None
+
+
+def test_disabled_cache_always_downloads(make_zapi, server):
+    zapi = make_zapi()
+
+    zapi.get_catalog()
+    zapi.get_catalog()
+
+    assert [status for _, status in server.sent] == [200] * 6
+
+
+class SyncingCatalogServer(CatalogServer):
+    """
+    CatalogServer that also answers delta listings.
+
+    Each change bumps ``version``; with ``updated_since`` only the APIs changed
+    after that version are listed, with the removed ones in ``deleted_ids``.
+    ``cursor_key`` names the field the version is reported under.
+    """
+
+    def __init__(self, count: int, cursor_key: str = "sync_cursor"):
+        super().__init__(count)
+        self.cursor_key = cursor_key
+        self.version = 1
+        self.changed_at = {api["id"]: 1 for api in self.apis}
+        self.deleted_at = {}
+        self.params = []
+
+    def upsert(self, api: dict) -> None:
+        self.version += 1
+        self.changed_at[api["id"]] = self.version
+        for index, existing in enumerate(self.apis):
+            if existing["id"] == api["id"]:
+                self.apis[index] = api
+                return
+        self.apis.append(api)
+
+    def delete(self, api_id: str) -> None:
+        self.version += 1
+        self.apis = [api for api in self.apis if api["id"] != api_id]
+        self.deleted_at[api_id] = self.version
+
+    def __call__(self, params=None, headers=None, **kwargs):
+        self.params.append(dict(params))
+        if "updated_since" not in params:
+            response = super().__call__(params=params, headers=headers)
+            if response.status_code == 200:
+                body = {**response.json(), self.cursor_key: str(self.version)}
+                response = make_response(200, body, headers=dict(response.headers))
+            return response
+
+        since = int(params["updated_since"])
+        items = [api for api in self.apis if self.changed_at[api["id"]] > since]
+        deleted = [api_id for api_id, version in self.deleted_at.items() if version > since]
+        body = {"items": items, "deleted_ids": deleted, "total": len(items), self.cursor_key: str(self.version)}
+        return make_response(200, body)
+
+
+def test_sync_cursor_merges_updates_additions_and_deletions(backend, make_zapi, tmp_path):
+    server = SyncingCatalogServer(count=CATALOG_PAGE_SIZE + 5)
+    backend.route("GET", LISTING, server)
+    zapi = make_zapi(catalog_cache=CatalogCache(cache_dir=tmp_path))
+    assert len(zapi.sync_catalog().added) == CATALOG_PAGE_SIZE + 5
+
+    server.upsert({"id": "api_3", "path": "/renamed"})
+    server.upsert({"id": "api_new", "path": "/new"})
+    server.delete("api_7")
+    server.params.clear()
+
+    delta = zapi.sync_catalog()
+
+    assert [api["id"] for api in delta.updated] == ["api_3"]
+    assert [api["id"] for api in delta.added] == ["api_new"]
+    assert [api["id"] for api in delta.removed] == ["api_7"]
+    assert server.params == [{"page": 1, "page_size": CATALOG_PAGE_SIZE, "updated_since": "1"}]
+    assert zapi.get_catalog() == server.apis
+
+    # The cursor moved on: nothing changed since
+    server.params.clear()
+    assert not zapi.sync_catalog().changed
+    assert server.params[0]["updated_since"] == str(server.version)
+
+
+def test_rejected_cursor_falls_back_to_revalidation(backend, make_zapi, tmp_path):
+    server = SyncingCatalogServer(count=5)
+    zapi = make_zapi(catalog_cache=CatalogCache(cache_dir=tmp_path))
+    backend.route("GET", LISTING, server)
+    zapi.sync_catalog()
+    server.delete("api_2")
+
+    def _reject_cursor(params=None, **kwargs):
+        if "updated_since" in params:
+            return make_response(410, {"detail": "cursor expired"})
+        return server(params=params, **kwargs)
+
+    backend.route("GET", LISTING, _reject_cursor)
+
+    delta = zapi.sync_catalog()
+
+    assert [api["id"] for api in delta.removed] == ["api_2"]
+    assert zapi.get_catalog() == server.apis
+
+
+def test_pagination_cursor_is_not_used_for_deltas(backend, make_zapi, tmp_path):
+    server = SyncingCatalogServer(count=5, cursor_key="next_cursor")
+    backend.route("GET", LISTING, server)
+    cache = CatalogCache(cache_dir=tmp_path)
+    zapi = make_zapi(catalog_cache=cache)
+    zapi.sync_catalog()
+    assert cache.load(zapi._catalog_key()).cursor is None
+
+    server.upsert({"id": "api_1", "path": "/renamed"})
+    server.delete("api_4")
+    delta = zapi.sync_catalog()
+
+    # Full revalidation compared by content hash, so the deletion is not lost
+    assert [api["id"] for api in delta.updated] == ["api_1"]
+    assert [api["id"] for api in delta.removed] == ["api_4"]
+    assert all("updated_since" not in params for params in server.params)
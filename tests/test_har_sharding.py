@@ -0,0 +1,243 @@
+"""Round trips of iter_har_shards() and sharded uploads: every entry lands in exactly one valid, self-contained shard."""
+
+import functools
+import gzip
+import json
+
+import pytest
+from conftest import make_response, multipart_parts
+
+from zapi import ZAPIValidationError
+from zapi.har_processing import HarProcessingError
+from zapi.har_sharding import HarStreamReader, iter_har_shards
+from zapi.upload import CompressingReader
+
+
+def _entry(index: int, pageref=None) -> dict:
+    entry = {
+        "startedDateTime": "2024-01-01T00:00:00Z",
+        "request": {"method": "GET", "url": f"https://example.com/api/items/{index}"},
+        "response": {"status": 200, "content": {"text": "x" * 200 + " é"}},
+    }
+    if pageref:
+        entry["pageref"] = pageref
+    return entry
+
+
+def _write_har(path, log: dict):
+    path.write_text(json.dumps({"log": log}, ensure_ascii=False, indent=2), encoding="utf-8")
+    return path
+
+
+def _shards(har_path, tmp_path, max_shard_bytes=2000) -> list[dict]:
+    output_dir = tmp_path / "shards"
+    output_dir.mkdir()
+    paths = list(iter_har_shards(har_path, max_shard_bytes, output_dir))
+    return [json.loads(path.read_text(encoding="utf-8"))["log"] for path in paths]
+
+
+def _pages():
+    return [{"id": f"page_{n}", "title": f"Page {n}", "startedDateTime": "2024-01-01T00:00:00Z"} for n in range(3)]
+
+
+def _entries():
+    return [_entry(index, pageref=f"page_{index // 10}") for index in range(30)]
+
+
+@pytest.mark.parametrize("pages_first", [True, False])
+def test_shards_preserve_entries_and_carry_their_pages(tmp_path, pages_first):
+    pages, entries = _pages(), _entries()
+    fields = [("version", "1.2"), ("creator", {"name": "test", "version": "1"})]
+    fields += [("pages", pages), ("entries", entries)] if pages_first else [("entries", entries), ("pages", pages)]
+    har_path = _write_har(tmp_path / "session.har", dict(fields))
+
+    shards = _shards(har_path, tmp_path)
+
+    assert len(shards) > 1
+    assert [entry for shard in shards for entry in shard["entries"]] == entries
+    for shard in shards:
+        assert shard["version"] == "1.2"
+        assert shard["creator"] == {"name": "test", "version": "1"}
+        assert [page["id"] for page in shard["pages"]] == sorted({entry["pageref"] for entry in shard["entries"]})
+        assert all(page in pages for page in shard["pages"])
+
+
+def test_shards_respect_size_budget(tmp_path):
+    har_path = _write_har(tmp_path / "session.har", {"version": "1.2", "pages": _pages(), "entries": _entries()})
+    output_dir = tmp_path / "shards"
+    output_dir.mkdir()
+
+    paths = list(iter_har_shards(har_path, 2000, output_dir))
+
+    assert all(path.stat().st_size <= 2000 for path in paths)
+
+
+def test_oversized_entry_gets_its_own_shard(tmp_path):
+    entries = [_entry(0), {**_entry(1), "comment": "y" * 5000}, _entry(2)]
+    har_path = _write_har(tmp_path / "session.har", {"version": "1.2", "entries": entries})
+
+    shards = _shards(har_path, tmp_path)
+
+    assert [len(shard["entries"]) for shard in shards] == [1, 1, 1]
+    assert shards[1]["entries"][0] == entries[1]
+
+
+def test_fields_after_entries_are_kept(tmp_path):
+    entries = [_entry(index) for index in range(20)]
+    har_path = _write_har(tmp_path / "session.har", {"version": "1.2", "entries": entries, "comment": "recorded"})
+
+    shards = _shards(har_path, tmp_path)
+
+    assert len(shards) > 1
+    assert all(shard["comment"] == "recorded" and shard["version"] == "1.2" for shard in shards)
+    assert [entry for shard in shards for entry in shard["entries"]] == entries
+
+
+def test_minimal_har_without_pages(tmp_path):
+    entries = [_entry(index) for index in range(20)]
+    har_path = _write_har(tmp_path / "session.har", {"entries": entries})
+
+    shards = _shards(har_path, tmp_path)
+
+    assert [entry for shard in shards for entry in shard["entries"]] == entries
+    assert all(shard["pages"] == [] for shard in shards)
+
+
+def test_stream_reader_matches_json_load(tmp_path):
+    log = {"version": "1.2", "pages": _pages(), "entries": _entries(), "comment": "c"}
+    har_path = _write_har(tmp_path / "session.har", log)
+
+    reader = HarStreamReader(har_path)
+    entries = list(reader.iter_entries())
+
+    assert entries == log["entries"]
+    assert reader.header == {"version": "1.2", "pages": log["pages"], "comment": "c"}
+
+
+def test_invalid_har_raises(tmp_path):
+    har_path = tmp_path / "broken.har"
+    har_path.write_text('{"log": {"entries": [{"request": ', encoding="utf-8")
+    output_dir = tmp_path / "shards"
+    output_dir.mkdir()
+
+    with pytest.raises(HarProcessingError):
+        list(iter_har_shards(har_path, 2000, output_dir))
+
+
+def test_rescan_reaches_the_open_shard(tmp_path):
+    # Entries without a page come first, so the pages after the entries are only found mid-stream
+    entries = [_entry(index) for index in range(3)] + [_entry(index, pageref="page_0") for index in range(3, 20)]
+    pages = [{"id": "page_0", "title": "p" * 5000, "startedDateTime": "2024-01-01T00:00:00Z"}]
+    har_path = _write_har(
+        tmp_path / "session.har", {"version": "1.2", "entries": entries, "comment": "c", "pages": pages}
+    )
+
+    shards = _shards(har_path, tmp_path, max_shard_bytes=8000)
+
+    assert len(shards) > 1
+    assert [entry for shard in shards for entry in shard["entries"]] == entries
+    for shard in shards:
+        assert shard["version"] == "1.2"
+        assert shard["comment"] == "c"
+        assert shard["pages"] == pages
+
+
+def test_fields_between_entries_and_pages_are_kept(tmp_path):
+    entries = [_entry(index) for index in range(20)]
+    har_path = _write_har(tmp_path / "session.har", {"entries": entries, "comment": "c", "pages": _pages()})
+
+    shards = _shards(har_path, tmp_path)
+
+    assert len(shards) > 1
+    assert all(shard["comment"] == "c" for shard in shards)
+
+
+def test_entry_filter_drops_entries_and_their_pages(tmp_path):
+    entries = _entries()
+    har_path = _write_har(tmp_path / "session.har", {"version": "1.2", "pages": _pages(), "entries": entries})
+
+    output_dir = tmp_path / "filtered"
+    output_dir.mkdir()
+    paths = list(iter_har_shards(har_path, 100_000, output_dir, lambda entry: entry["pageref"] != "page_1"))
+    filtered = json.loads(paths[0].read_text(encoding="utf-8"))["log"]
+
+    assert len(paths) == 1
+    assert filtered["entries"] == [entry for entry in entries if entry["pageref"] != "page_1"]
+    assert [page["id"] for page in filtered["pages"]] == ["page_0", "page_2"]
+    assert list(iter_har_shards(har_path, 100_000, output_dir, lambda entry: False)) == []
+
+
+def test_gzip_shards_round_trip(tmp_path):
+    har_path = _write_har(tmp_path / "session.har", {"version": "1.2", "pages": _pages(), "entries": _entries()})
+    output_dir = tmp_path / "shards"
+    output_dir.mkdir()
+
+    entries = []
+    for shard_path in iter_har_shards(har_path, 2000, output_dir):
+        with open(shard_path, "rb") as f:
+            reader = CompressingReader(f, "gzip")
+            compressed = b"".join(iter(functools.partial(reader.read, 4096), b""))
+        shard = json.loads(gzip.decompress(compressed))
+        assert shard["log"]["version"] == "1.2"
+        entries.extend(shard["log"]["entries"])
+
+    assert entries == _entries()
+
+
+def _upload_recorder(backend) -> list[dict]:
+    """Record the HAR of every upload-file request; the response echoes its entry count."""
+    uploads = []
+
+    def _upload(data=None, **kwargs):
+        parts = multipart_parts(b"".join(data))
+        uploads.append({"metadata": json.loads(parts["metadata"]), "har": json.loads(parts["file"])})
+        return make_response(200, {"entries": len(uploads[-1]["har"]["log"]["entries"])})
+
+    backend.route("POST", "/v1/api-discovery/upload-file", _upload)
+    return uploads
+
+
+def test_upload_har_uploads_every_shard(backend, make_zapi, tmp_path):
+    uploads = _upload_recorder(backend)
+    har_path = _write_har(tmp_path / "session.har", {"version": "1.2", "pages": _pages(), "entries": _entries()})
+    progress = []
+
+    results = make_zapi().upload_har(
+        str(har_path), max_shard_bytes=2000, progress_callback=lambda sent, total: progress.append((sent, total))
+    )
+
+    assert len(results) == len(uploads) > 1
+    assert sorted(entry["request"]["url"] for upload in uploads for entry in upload["har"]["log"]["entries"]) == sorted(
+        entry["request"]["url"] for entry in _entries()
+    )
+    assert all(sent <= total for sent, total in progress)
+    assert progress[-1][0] == progress[-1][1]
+
+
+def test_upload_har_filtered_skips_static_assets(backend, make_zapi, tmp_path):
+    uploads = _upload_recorder(backend)
+    api_entries = _entries()
+    static = [
+        {**_entry(0), "request": {"method": "GET", "url": "https://example.com/app.js"}},
+        {**_entry(0), "response": {"status": 200, "content": {"mimeType": "image/png"}}},
+    ]
+    har_path = _write_har(tmp_path / "session.har", {"version": "1.2", "entries": static + api_entries})
+
+    result = make_zapi().upload_har(str(har_path), filtered=True)
+
+    assert result == {"entries": len(api_entries)}
+    assert uploads[0]["har"]["log"]["entries"] == api_entries
+
+    sharded = make_zapi().upload_har(str(har_path), filtered=True, max_shard_bytes=2000)
+    assert sum(result["entries"] for result in sharded) == len(api_entries)
+
+
+def test_upload_har_filtered_without_api_entries(backend, make_zapi, tmp_path):
+    _upload_recorder(backend)
+    har_path = _write_har(
+        tmp_path / "session.har",
+        {"entries": [{**_entry(0), "request": {"method": "GET", "url": "https://e.com/a.css"}}]},
+    )
+
+    with pytest.raises(ZAPIValidationError):
+        make_zapi().upload_har(str(har_path), filtered=True)
@@ -0,0 +1,91 @@
+"""Lazy background authentication in ZAPI."""
+
+import threading
+
+import pytest
+from conftest import make_jwt, make_response
+
+from zapi import ZAPIAuthenticationError, ZAPIValidationError
+
+ANTHROPIC_KEY = "sk-ant-" + "x" * 30
+OPENAI_KEY = "sk-" + "y" * 30
+
+
+@pytest.fixture
+def auth_gate(backend) -> threading.Event:
+    """Holds the token request until set."""
+    gate = threading.Event()
+
+    def _token(**kwargs):
+        assert gate.wait(10)
+        return make_response(200, {"token": make_jwt()})
+
+    backend.route("POST", "/v1/auth/token", _token)
+    return gate
+
+
+def test_constructor_does_not_wait_for_authentication(backend, make_zapi, auth_gate):
+    zapi = make_zapi(lazy_auth=True)
+
+    assert not zapi._auth_future.done()
+    auth_gate.set()
+    assert zapi.org_id == "org_1"
+    assert zapi.email == "a@b.c"
+    assert backend.paths() == ["/v1/auth/token", "/v1/auth/validate-token"]
+
+
+def test_auth_errors_surface_on_first_use(backend, make_zapi):
+    backend.route("POST", "/v1/auth/token", make_response(401))
+
+    zapi = make_zapi(lazy_auth=True)
+
+    with pytest.raises(ZAPIAuthenticationError):
+        _ = zapi.auth_token
+    with pytest.raises(ZAPIAuthenticationError):
+        zapi.has_llm_key()
+
+
+def test_invalid_llm_key_is_rejected_up_front(make_zapi, auth_gate):
+    with pytest.raises(ZAPIValidationError):
+        make_zapi(lazy_auth=True, llm_provider="anthropic", llm_api_key="not-a-key", llm_model_name="m")
+    auth_gate.set()
+
+
+def test_llm_key_is_ready_with_the_token(make_zapi, auth_gate):
+    zapi = make_zapi(lazy_auth=True, llm_provider="anthropic", llm_api_key=ANTHROPIC_KEY, llm_model_name="m")
+    barrier = threading.Barrier(8)
+    seen = []
+
+    def _reader():
+        barrier.wait()
+        _ = zapi.auth_token
+        seen.append((zapi.has_llm_key(), zapi.get_llm_provider(), zapi.get_decrypted_llm_key()))
+
+    threads = [threading.Thread(target=_reader) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    auth_gate.set()
+    for thread in threads:
+        thread.join(10)
+
+    assert seen == [(True, "anthropic", ANTHROPIC_KEY)] * 8
+
+
+def test_explicit_llm_key_replaces_the_pending_one(make_zapi, auth_gate):
+    zapi = make_zapi(lazy_auth=True, llm_provider="anthropic", llm_api_key=ANTHROPIC_KEY, llm_model_name="m")
+    auth_gate.set()
+
+    zapi.set_llm_key("openai", OPENAI_KEY, "gpt")
+
+    assert zapi.get_llm_provider() == "openai"
+    assert zapi.get_decrypted_llm_key() == OPENAI_KEY
+
+
+def test_eager_and_lazy_clients_agree(make_zapi, auth_gate):
+    auth_gate.set()
+    eager = make_zapi(llm_provider="anthropic", llm_api_key=ANTHROPIC_KEY, llm_model_name="m")
+    lazy = make_zapi(lazy_auth=True, llm_provider="anthropic", llm_api_key=ANTHROPIC_KEY, llm_model_name="m")
+
+    assert lazy.org_id == eager.org_id
+    assert lazy.has_llm_key() and eager.has_llm_key()
+    assert lazy.get_decrypted_llm_key() == eager.get_decrypted_llm_key() == ANTHROPIC_KEY
@@ -0,0 +1,100 @@
+"""ResumableUploader against the local upload server in examples/."""
+
+import importlib.util
+import json
+import os
+import threading
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+import requests
+
+from zapi.upload import ResumableUploader
+
+PART_SIZE = 1024
+PART_COUNT = 10
+
+
+def _load_server_module():
+    path = Path(__file__).resolve().parent.parent / "examples" / "local_upload_server.py"
+    spec = importlib.util.spec_from_file_location("local_upload_server", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+local_upload_server = _load_server_module()
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Upload store of a local server; ``store.base_url`` is where it listens."""
+    store = local_upload_server.UploadStore(tmp_path / "server")
+    handler = type("Handler", (local_upload_server.UploadHandler,), {"store": store})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    store.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield store
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def har_file(tmp_path):
+    path = tmp_path / "session.har"
+    path.write_bytes(os.urandom(PART_SIZE * PART_COUNT - 100))
+    return path
+
+
+def _uploader(store, **kwargs) -> ResumableUploader:
+    return ResumableUploader(store.base_url, auth_token="local", part_size=PART_SIZE, concurrency=1, **kwargs)
+
+
+def _interrupted_upload(store, har_file) -> dict:
+    """Upload until the server drops a part request; return the resume state left behind."""
+    store.fail_every = 4
+    with pytest.raises(requests.exceptions.RequestException):
+        _uploader(store, max_retries=1).upload(har_file)
+    store.fail_every = 0
+    return json.loads(ResumableUploader.state_path(har_file).read_text())
+
+
+def test_resume_sends_only_unacknowledged_parts(store, har_file):
+    state = _interrupted_upload(store, har_file)
+    acknowledged = len(state["parts"])
+    assert 3 <= acknowledged < PART_COUNT
+
+    progress = []
+    requests_before = store.part_requests
+    result = _uploader(store, progress_callback=lambda sent, total: progress.append((sent, total))).upload(har_file)
+
+    assert result["upload_id"] == state["upload_id"]
+    assert store.part_requests - requests_before == PART_COUNT - acknowledged
+    assert progress[0] == (acknowledged * PART_SIZE, har_file.stat().st_size)
+    assert progress[-1] == (har_file.stat().st_size, har_file.stat().st_size)
+    assert (store.root / f"{result['upload_id']}.har").read_bytes() == har_file.read_bytes()
+    assert not ResumableUploader.state_path(har_file).exists()
+
+
+def test_resume_restarts_upload_expired_on_server(store, har_file):
+    state = _interrupted_upload(store, har_file)
+    # The server forgets the upload, as when it expires
+    store.uploads.clear()
+
+    result = _uploader(store).upload(har_file)
+
+    assert result["upload_id"] != state["upload_id"]
+    assert (store.root / f"{result['upload_id']}.har").read_bytes() == har_file.read_bytes()
+    assert not ResumableUploader.state_path(har_file).exists()
+
+
+def test_changed_file_is_not_resumed(store, har_file):
+    state = _interrupted_upload(store, har_file)
+    har_file.write_bytes(os.urandom(PART_SIZE * 2))
+
+    result = _uploader(store).upload(har_file)
+
+    assert result["upload_id"] != state["upload_id"]
+    assert (store.root / f"{result['upload_id']}.har").read_bytes() == har_file.read_bytes()
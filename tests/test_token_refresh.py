@@ -0,0 +1,128 @@
+"""Proactive token refresh and the transparent retry on 401."""
+
+import threading
+import time
+
+import pytest
+import requests
+from conftest import make_jwt, make_response
+
+from zapi import core
+
+LISTING = "/v1/tools/apis"
+
+
+def _long_lived_token(**kwargs):
+    return make_response(200, {"token": make_jwt()})
+
+
+def _token_fetches(backend) -> int:
+    return backend.paths().count("/v1/auth/token")
+
+
+def _wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.02)
+    return True
+
+
+def test_rejected_token_is_refreshed_and_request_resent(backend, make_zapi):
+    zapi = make_zapi()
+    first_token = zapi.auth_token
+
+    def _listing(headers=None, **kwargs):
+        if headers["Authorization"] == f"Bearer {first_token}":
+            return make_response(401)
+        return make_response(200, {"items": [], "total": 0})
+
+    backend.route("GET", LISTING, _listing)
+
+    assert zapi.get_documented_apis() == {"items": [], "total": 0}
+    assert zapi.auth_token != first_token
+    assert _token_fetches(backend) == 2
+    assert backend.paths("GET") == [LISTING, LISTING]
+
+
+def test_second_401_is_not_retried_again(backend, make_zapi):
+    zapi = make_zapi()
+    backend.route("GET", LISTING, make_response(401))
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        zapi.get_documented_apis()
+    assert _token_fetches(backend) == 2
+    assert backend.paths("GET") == [LISTING, LISTING]
+
+
+def test_concurrent_refreshes_of_the_same_token_share_one_fetch(backend, make_zapi):
+    zapi = make_zapi()
+    stale = zapi.auth_token
+    barrier = threading.Barrier(8)
+    tokens = []
+
+    def _refresh():
+        barrier.wait()
+        tokens.append(zapi.refresh_auth_token(stale_token=stale))
+
+    threads = [threading.Thread(target=_refresh) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert len(set(tokens)) == 1 and tokens[0] != stale
+    assert _token_fetches(backend) == 2
+
+
+class _Session:
+    """Stands in for a live BrowserSession receiving refreshed tokens."""
+
+    def __init__(self):
+        self.tokens = []
+
+    def update_auth_token(self, token: str) -> None:
+        self.tokens.append(token)
+
+
+def test_token_is_refreshed_before_it_expires(backend, make_zapi):
+    backend.route(
+        "POST", "/v1/auth/token", [make_response(200, {"token": make_jwt(expires_in=1.0)}), _long_lived_token]
+    )
+    zapi = make_zapi()
+    short_lived = zapi.auth_token
+    session = _Session()
+    zapi._sessions.add(session)
+
+    # Short-lived tokens are refreshed halfway through their life
+    assert _wait_for(lambda: session.tokens, timeout=3.0)
+    assert session.tokens == [zapi.auth_token]
+    assert zapi.auth_token != short_lived
+    assert _token_fetches(backend) == 2
+
+
+def test_failed_refresh_is_retried(backend, make_zapi, monkeypatch):
+    monkeypatch.setattr(core, "TOKEN_REFRESH_RETRY_SECONDS", 0.05)
+    backend.route(
+        "POST",
+        "/v1/auth/token",
+        [make_response(200, {"token": make_jwt(expires_in=1.0)})] + [make_response(500)] * 4 + [_long_lived_token],
+    )
+    zapi = make_zapi()
+    short_lived = zapi.auth_token
+
+    assert _wait_for(lambda: zapi.auth_token != short_lived, timeout=3.0)
+    assert _token_fetches(backend) == 6
+
+
+def test_close_cancels_the_refresh(backend, make_zapi):
+    backend.route(
+        "POST", "/v1/auth/token", [make_response(200, {"token": make_jwt(expires_in=0.6)}), _long_lived_token]
+    )
+    zapi = make_zapi()
+
+    zapi.close()
+    time.sleep(0.6)
+
+    assert _token_fetches(backend) == 1
@@ -0,0 +1,72 @@
+"""ToolIndex tokenization and BM25 ranking."""
+
+from zapi import ToolIndex
+from zapi.tool_index import tokenize
+
+APIS = [
+    {"id": "invoices", "title": "List invoices", "path": "/v1/invoices", "api_type": "GET", "description": "Billing"},
+    {
+        "id": "refund",
+        "title": "Create refund",
+        "path": "/v1/payments/{payment_id}/refunds",
+        "api_type": "POST",
+        "description": "Refund a payment, fully or in part",
+    },
+    {
+        "id": "accounts",
+        "title": "Get user account",
+        "path": "/v1/userAccounts/{account_id}",
+        "api_type": "GET",
+        "description": "Profile and settings of a user, including invoices sent to them",
+    },
+    {"id": "health", "title": "Health check", "path": "/health", "api_type": "GET", "description": "Liveness"},
+]
+
+
+def _ids(index: ToolIndex, query: str, k: int = 5) -> list[str]:
+    return [match.api["id"] for match in index.search(query, k=k)]
+
+
+def test_tokenize_splits_identifiers_and_drops_stopwords():
+    assert tokenize("/v1/userAccounts/{account_id}") == ["v1", "user", "accounts", "account", "id"]
+    assert tokenize("Get the list of APIs for an HTTPEndpoint") == ["get", "list", "httpendpoint"]
+    assert tokenize("the and of api") == []
+
+
+def test_title_match_outranks_description_match():
+    # "invoices" is in the title of one API and in the description of another
+    assert _ids(ToolIndex(APIS), "invoices") == ["invoices", "accounts"]
+
+
+def test_camel_case_path_terms_are_searchable():
+    assert _ids(ToolIndex(APIS), "user accounts", k=1) == ["accounts"]
+
+
+def test_query_stopwords_do_not_match():
+    index = ToolIndex(APIS)
+
+    assert index.search("the of and an api endpoint") == []
+    assert _ids(index, "refund the payment", k=1) == ["refund"]
+
+
+def test_results_are_limited_to_k_best_first():
+    index = ToolIndex(APIS)
+
+    matches = index.search("get invoices user refund health", k=2)
+
+    assert len(matches) == 2
+    assert matches[0].score >= matches[1].score
+    assert len(index.search("get invoices user refund health", k=10)) == len(APIS)
+
+
+def test_no_match_returns_empty():
+    assert ToolIndex(APIS).search("kubernetes") == []
+    assert ToolIndex([]).search("invoices") == []
+    assert len(ToolIndex(APIS)) == len(APIS)
+
+
+def test_field_weights_change_the_ranking():
+    # Counting only descriptions, the accounts API is the one mentioning invoices
+    index = ToolIndex(APIS, field_weights={"description": 1})
+
+    assert _ids(index, "invoices") == ["accounts"]
@@ -0,0 +1,123 @@
+"""ZAPITransport retries, backoff and Retry-After handling."""
+
+import time
+from email.utils import formatdate
+
+import pytest
+import requests
+from conftest import make_response
+
+from zapi import transport as transport_module
+from zapi.transport import ZAPITransport, retry_after_seconds
+
+URL = "https://backend.test/v1/thing"
+
+
+@pytest.fixture
+def sleeps(monkeypatch) -> list[float]:
+    """Delays the transport slept for, without sleeping."""
+    delays = []
+    monkeypatch.setattr(transport_module.time, "sleep", delays.append)
+    return delays
+
+
+@pytest.mark.parametrize("status", [429, 500, 502, 503, 504])
+def test_retryable_status_is_retried(backend, transport, sleeps, status):
+    backend.route("GET", "/v1/thing", [make_response(status), make_response(200, {"ok": True})])
+
+    response = transport.get(URL)
+
+    assert response.json() == {"ok": True}
+    assert len(backend.calls) == 2
+    assert len(sleeps) == 1
+
+
+@pytest.mark.parametrize("status", [400, 401, 404, 409])
+def test_client_errors_are_not_retried(backend, transport, sleeps, status):
+    backend.route("GET", "/v1/thing", make_response(status))
+
+    assert transport.get(URL).status_code == status
+    assert len(backend.calls) == 1
+    assert sleeps == []
+
+
+def test_last_response_returned_when_retries_run_out(backend, transport, sleeps):
+    backend.route("GET", "/v1/thing", make_response(503))
+
+    assert transport.get(URL).status_code == 503
+    assert len(backend.calls) == transport.max_retries + 1
+
+
+def test_connection_errors_are_retried(backend, transport, sleeps):
+    backend.route("GET", "/v1/thing", [requests.exceptions.ConnectionError("reset"), make_response(200, {"ok": True})])
+
+    assert transport.get(URL).status_code == 200
+    assert len(backend.calls) == 2
+
+
+def test_connection_error_raised_when_retries_run_out(backend, transport, sleeps):
+    backend.route("GET", "/v1/thing", requests.exceptions.ConnectionError("refused"))
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        transport.get(URL)
+    assert len(backend.calls) == transport.max_retries + 1
+
+
+def test_read_timeouts_are_not_retried(backend, transport, sleeps):
+    backend.route("POST", "/v1/thing", requests.exceptions.ReadTimeout("slow"))
+
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        transport.post(URL, json={})
+    assert len(backend.calls) == 1
+
+
+def test_retry_false_sends_once(backend, transport, sleeps):
+    backend.route("POST", "/v1/thing", make_response(503))
+
+    assert transport.post(URL, data=b"body", retry=False).status_code == 503
+    assert len(backend.calls) == 1
+
+
+def test_retry_after_overrides_backoff(backend, transport, sleeps):
+    backend.route("GET", "/v1/thing", [make_response(429, headers={"Retry-After": "7"}), make_response(200)])
+
+    transport.get(URL)
+
+    assert sleeps == [7.0]
+
+
+def test_retry_after_is_capped(backend, sleeps):
+    transport = ZAPITransport(backoff_max_seconds=5.0)
+    transport.session = backend
+    backend.route("GET", "/v1/thing", [make_response(503, headers={"Retry-After": "600"}), make_response(200)])
+
+    transport.get(URL)
+
+    assert sleeps == [5.0]
+
+
+def test_backoff_doubles_with_jitter_up_to_the_cap():
+    transport = ZAPITransport(backoff_base_seconds=1.0, backoff_max_seconds=6.0)
+
+    for attempt, full in [(1, 1.0), (2, 2.0), (3, 4.0), (4, 6.0), (10, 6.0)]:
+        delays = [transport.retry_delay(attempt) for _ in range(50)]
+        assert all(full / 2 <= delay <= full for delay in delays)
+
+
+def test_default_timeout_is_applied(backend, transport):
+    backend.route("GET", "/v1/thing", make_response(200))
+
+    transport.get(URL)
+    transport.get(URL, timeout=3)
+
+    assert [call[2]["timeout"] for call in backend.calls] == [transport.timeout, 3]
+
+
+def test_retry_after_parsing():
+    assert retry_after_seconds(make_response(429, headers={"Retry-After": "2.5"})) == 2.5
+    assert retry_after_seconds(make_response(429, headers={"Retry-After": "-1"})) == 0.0
+    assert retry_after_seconds(make_response(429)) is None
+    assert retry_after_seconds(make_response(429, headers={"Retry-After": "soon"})) is None
+
+    delay = retry_after_seconds(make_response(503, headers={"Retry-After": formatdate(time.time() + 30, usegmt=True)}))
+    assert 25 <= delay <= 30
@@ -0,0 +1,99 @@
+"""Round trips of compressed multipart upload bodies."""
+
+import gzip
+import io
+import json
+
+import pytest
+
+from zapi.upload import (
+    MIN_COMPRESS_BYTES,
+    CompressingReader,
+    StreamingMultipartEncoder,
+    resolve_compression,
+)
+
+
+def _har_bytes(entries: int = 400) -> bytes:
+    log = {
+        "version": "1.2",
+        "entries": [
+            {"request": {"method": "GET", "url": f"https://example.com/api/items/{index}"}, "response": {"status": 200}}
+            for index in range(entries)
+        ],
+    }
+    return json.dumps({"log": log}).encode()
+
+
+def _parts(encoder: StreamingMultipartEncoder, body: bytes) -> dict[str, tuple[bytes, bytes]]:
+    """Split a multipart body into {field name: (part headers, content)}."""
+    parts = {}
+    for raw in body.split(f"--{encoder.boundary}".encode())[1:-1]:
+        headers, content = raw[2:].split(b"\r\n\r\n", 1)
+        name = headers.split(b'name="', 1)[1].split(b'"', 1)[0].decode()
+        parts[name] = (headers, content[:-2])
+    return parts
+
+
+def test_compressing_reader_gzip_round_trip():
+    data = _har_bytes()
+    reader = CompressingReader(io.BytesIO(data), "gzip", total_bytes=len(data))
+
+    compressed = b"".join(iter(lambda: reader.read(4096), b""))
+
+    assert gzip.decompress(compressed) == data
+    assert reader.raw_bytes == len(data)
+    assert len(compressed) < len(data)
+
+
+def test_zstd_round_trip():
+    zstandard = pytest.importorskip("zstandard")
+    data = _har_bytes()
+    reader = CompressingReader(io.BytesIO(data), "zstd")
+
+    compressed = b"".join(iter(lambda: reader.read(4096), b""))
+
+    assert zstandard.ZstdDecompressor().decompressobj().decompress(compressed) == data
+
+
+def test_uncompressed_body_matches_its_length(tmp_path):
+    path = tmp_path / "session.har"
+    path.write_bytes(_har_bytes())
+
+    with StreamingMultipartEncoder.from_path(path, {"metadata": "{}"}) as encoder:
+        body = b"".join(encoder)
+
+    assert len(body) == len(encoder)
+    assert _parts(encoder, body)["file"][1] == path.read_bytes()
+    assert _parts(encoder, body)["metadata"][1] == b"{}"
+
+
+def test_gzip_body_round_trip(tmp_path):
+    path = tmp_path / "session.har"
+    path.write_bytes(_har_bytes())
+    progress = []
+
+    with StreamingMultipartEncoder.from_path(
+        path,
+        {"metadata": "{}"},
+        progress_callback=lambda sent, total: progress.append((sent, total)),
+        compression="gzip",
+    ) as encoder:
+        body = b"".join(encoder)
+
+    headers, content = _parts(encoder, body)["file"]
+    assert gzip.decompress(content) == path.read_bytes()
+    assert b"Content-Type: application/gzip" in headers
+    assert f'filename="{path}.gz"'.encode() in headers
+    assert progress[-1] == (path.stat().st_size, path.stat().st_size)
+    with pytest.raises(TypeError):
+        len(encoder)
+
+
+def test_resolve_compression():
+    assert resolve_compression(None, 10 * MIN_COMPRESS_BYTES) is None
+    assert resolve_compression("gzip", MIN_COMPRESS_BYTES - 1) is None
+    assert resolve_compression("gzip", MIN_COMPRESS_BYTES) == "gzip"
+    assert resolve_compression("auto", MIN_COMPRESS_BYTES) in ("gzip", "zstd")
+    with pytest.raises(ValueError):
+        resolve_compression("brotli", MIN_COMPRESS_BYTES)
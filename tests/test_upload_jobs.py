@@ -0,0 +1,186 @@
+"""Background upload jobs: state transitions, discovery status polling and close()."""
+
+import json
+import threading
+
+import pytest
+from conftest import make_response
+
+from zapi import ZAPIError
+from zapi import core as core_module
+from zapi.upload_jobs import (
+    STATUS_POLL_BASE_SECONDS,
+    STATUS_POLL_MAX_SECONDS,
+    UPLOAD_COMPLETED,
+    UPLOAD_FAILED,
+    UPLOAD_JOB_WORKERS,
+    UPLOAD_PROCESSING,
+    UPLOAD_QUEUED,
+    UPLOAD_UPLOADING,
+    discovery_job_id,
+    discovery_state,
+    status_poll_delay,
+)
+
+UPLOAD = "/v1/api-discovery/upload-file"
+STATUS = "/v1/api-discovery/status/job_1"
+
+
+@pytest.fixture(autouse=True)
+def no_poll_delay(monkeypatch):
+    """Poll discovery status without waiting."""
+    monkeypatch.setattr(core_module, "status_poll_delay", lambda attempt: 0.0)
+
+
+@pytest.fixture
+def har_file(tmp_path) -> str:
+    path = tmp_path / "session.har"
+    path.write_text(json.dumps({"log": {"version": "1.2", "entries": []}}))
+    return str(path)
+
+
+class Gate:
+    """Route handler that holds each request until released, counting the ones waiting."""
+
+    def __init__(self, response):
+        self.response = response
+        self.released = threading.Event()
+        self._entered = threading.Semaphore(0)
+
+    def __call__(self, **kwargs):
+        self._entered.release()
+        assert self.released.wait(10)
+        return self.response
+
+    def wait_entered(self, count: int = 1) -> None:
+        for _ in range(count):
+            assert self._entered.acquire(timeout=10)
+
+
+def test_job_moves_through_upload_and_processing(backend, make_zapi, har_file):
+    upload = Gate(make_response(200, {"job_id": "job_1"}))
+    status = Gate(make_response(200, {"status": "completed", "apis": 3}))
+    backend.route("POST", UPLOAD, upload)
+    backend.route("GET", STATUS, [make_response(200, {"status": "running"}), status])
+    finished = []
+    zapi = make_zapi()
+
+    job = zapi.upload_har_async(har_file, callback=finished.append)
+    assert job.status in (UPLOAD_QUEUED, UPLOAD_UPLOADING)
+
+    upload.wait_entered()
+    assert job.status == UPLOAD_UPLOADING
+    upload.released.set()
+
+    status.wait_entered()
+    assert job.status == UPLOAD_PROCESSING
+    assert job.processing_status == {"status": "running"}
+    assert not job.done()
+    status.released.set()
+
+    assert job.result(10) == {"status": "completed", "apis": 3}
+    assert job.status == UPLOAD_COMPLETED
+    assert job.job_id == "job_1"
+    assert finished == [job]
+    assert backend.paths("GET") == [STATUS, STATUS]
+
+
+def test_failed_processing_fails_the_job(backend, make_zapi, har_file):
+    backend.route("POST", UPLOAD, make_response(200, {"job_id": "job_1"}))
+    backend.route("GET", STATUS, make_response(200, {"status": "failed", "error": "no API traffic"}))
+    finished = []
+    zapi = make_zapi()
+
+    job = zapi.upload_har_async(har_file, callback=finished.append)
+
+    with pytest.raises(ZAPIError, match="no API traffic"):
+        job.result(10)
+    assert job.status == UPLOAD_FAILED
+    assert isinstance(job.error, ZAPIError)
+    assert finished == [job]
+
+
+def test_failed_upload_fails_the_job(backend, make_zapi, har_file):
+    backend.route("POST", UPLOAD, make_response(500, {"detail": "boom"}))
+    zapi = make_zapi()
+
+    job = zapi.upload_har_async(har_file)
+
+    with pytest.raises(ZAPIError):
+        job.result(10)
+    assert job.status == UPLOAD_FAILED
+    assert backend.paths("GET") == []
+
+
+@pytest.mark.parametrize(
+    "upload_response, options",
+    [({"message": "ok"}, {}), ({"job_id": "job_1"}, {"wait_for_processing": False})],
+    ids=["no job id", "not waiting"],
+)
+def test_untracked_processing_completes_after_upload(backend, make_zapi, har_file, upload_response, options):
+    backend.route("POST", UPLOAD, make_response(200, upload_response))
+    zapi = make_zapi()
+
+    job = zapi.upload_har_async(har_file, **options)
+
+    assert job.result(10) == upload_response
+    assert job.status == UPLOAD_COMPLETED
+    assert backend.paths("GET") == []
+
+
+def test_status_endpoint_404_completes_with_the_upload_response(backend, make_zapi, har_file):
+    backend.route("POST", UPLOAD, make_response(200, {"job_id": "job_1"}))
+    backend.route("GET", STATUS, make_response(404))
+    zapi = make_zapi()
+
+    assert zapi.upload_har_async(har_file).result(10) == {"job_id": "job_1"}
+
+
+def test_close_fails_queued_and_processing_jobs(backend, make_zapi, har_file):
+    upload = Gate(make_response(200, {"job_id": "job_1"}))
+    backend.route("POST", UPLOAD, upload)
+    backend.route("GET", STATUS, make_response(200, {"status": "running"}))
+    zapi = make_zapi()
+
+    jobs = zapi.upload_many([har_file] * (UPLOAD_JOB_WORKERS + 1))
+    upload.wait_entered(UPLOAD_JOB_WORKERS)
+    queued = jobs[-1]
+    assert queued.status == UPLOAD_QUEUED
+
+    closer = threading.Thread(target=zapi.close)
+    closer.start()
+    with pytest.raises(ZAPIError, match="closed before"):
+        queued.result(10)
+    # Uploads already being sent finish, then stop at processing
+    upload.released.set()
+    closer.join(10)
+
+    assert all(job.status == UPLOAD_FAILED for job in jobs)
+    assert backend.paths("POST").count(UPLOAD) == UPLOAD_JOB_WORKERS
+    with pytest.raises(ZAPIError, match="closed"):
+        zapi.upload_har_async(har_file)
+
+
+def test_discovery_job_id():
+    assert discovery_job_id({"job_id": "a", "id": "b"}) == "a"
+    assert discovery_job_id({"id": 42}) == "42"
+    assert discovery_job_id({"job_id": "", "upload_id": "u"}) == "u"
+    assert discovery_job_id({"id": True}) is None
+    assert discovery_job_id({"message": "ok"}) is None
+    assert discovery_job_id(["job_1"]) is None
+
+
+def test_discovery_state():
+    assert discovery_state({"status": "Completed"}) == UPLOAD_COMPLETED
+    assert discovery_state({"state": "succeeded"}) == UPLOAD_COMPLETED
+    assert discovery_state({"status": "ERROR"}) == UPLOAD_FAILED
+    assert discovery_state({"status": "cancelled"}) == UPLOAD_FAILED
+    assert discovery_state({"status": "running"}) is None
+    assert discovery_state({}) is None
+
+
+def test_status_poll_delay_backs_off_with_jitter_up_to_the_cap():
+    for attempt in (1, 2, 3, 6, 20):
+        full = min(STATUS_POLL_MAX_SECONDS, STATUS_POLL_BASE_SECONDS * 2 ** (attempt - 1))
+        delays = [status_poll_delay(attempt) for _ in range(50)]
+        assert all(full / 2 <= delay <= full for delay in delays)
@@ -5,19 +5,32 @@ An open-source library that automatically discovers, understands,
 and prepares APIs for LLM and agent workflows.
 """
 
+from .async_core import AsyncZAPI
 from .auth import AuthMode
+from .catalog import CatalogCache, CatalogDelta
 from .constants import BASE_URL
 from .core import ZAPI
+from .crawler import CrawlResult, SameOriginCrawler, template_url
 from .encryption import LLMKeyEncryption
 from .exceptions import ZAPIAuthenticationError, ZAPIError, ZAPINetworkError, ZAPIValidationError
+from .farm import CaptureFarm, CaptureFarmError, CaptureJob, CaptureJobQueue, FarmResult
+from .flows import CaptureFlow, FlowError, FlowReplayResult, FlowStep, areplay_flows, replay_flows
 from .har_processing import (
     HarProcessingError,
     HarProcessor,
     HarStats,
     analyze_har_file,
 )
+from .har_replay import HarReplayIndex, HarReplayServer
+from .metrics import CaptureMetrics
 from .providers import LLMProvider
 from .session import BrowserInitializationError, BrowserNavigationError, BrowserSession, BrowserSessionError
+from .storage_state import StorageStateCache
+from .token_cache import TokenCache
+from .tool_index import ToolIndex
+from .transport import ZAPITransport
+from .upload import ResumableUploader, ResumableUploadError, UploadStats
+from .upload_jobs import UploadJob
 from .utils import (
     interactive_chat,
     load_llm_credentials,
@@ -26,15 +39,46 @@ from .utils import (
 __version__ = "0.1.0"
 __all__ = [
     "ZAPI",
+    "AsyncZAPI",
     "BrowserSession",
     "AuthMode",
     "LLMProvider",
     "LLMKeyEncryption",
+    "ZAPITransport",
+    "TokenCache",
+    "CatalogCache",
+    "CatalogDelta",
+    "ToolIndex",
     "load_llm_credentials",
     # HAR processing
     "HarProcessor",
     "HarStats",
     "analyze_har_file",
+    "HarReplayServer",
+    "HarReplayIndex",
+    # Capture flows
+    "CaptureFlow",
+    "FlowStep",
+    "FlowReplayResult",
+    "replay_flows",
+    "areplay_flows",
+    # Uploads
+    "UploadStats",
+    "UploadJob",
+    "ResumableUploader",
+    # Capture farm
+    "CaptureFarm",
+    "CaptureJobQueue",
+    "CaptureJob",
+    "FarmResult",
+    # Crawling
+    "SameOriginCrawler",
+    "CrawlResult",
+    "template_url",
+    # Capture metrics
+    "CaptureMetrics",
+    # Login reuse
+    "StorageStateCache",
     "interactive_chat",
     # Exception classes
     "ZAPIError",
@@ -45,5 +89,8 @@ __all__ = [
     "BrowserNavigationError",
     "BrowserInitializationError",
     "HarProcessingError",
+    "FlowError",
+    "CaptureFarmError",
+    "ResumableUploadError",
     "BASE_URL",
 ]
@@ -0,0 +1,552 @@
+"""Asyncio counterpart of the ZAPI client, built on one shared httpx.AsyncClient."""
+
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from typing import Callable, Optional, Union
+
+import httpx
+
+from .catalog import CATALOG_CONCURRENCY, CATALOG_PAGE_SIZE, total_pages
+from .constants import BASE_URL
+from .encryption import LLMKeyEncryption
+from .exceptions import AuthError, LLMKeyError, NetworkError, ZAPIError, ZAPIValidationError
+from .providers import validate_llm_keys
+from .token_cache import DEFAULT_TOKEN_REFRESH_MARGIN_SECONDS, TokenCache, token_expiry
+from .transport import DEFAULT_TIMEOUT, is_retryable_status, retry_delay
+from .upload import (
+    UPLOAD_CHUNK_SIZE,
+    ProgressCallback,
+    StreamingMultipartEncoder,
+    UploadCompression,
+    UploadStats,
+    resolve_compression,
+    upload_timeout,
+)
+from .utils import load_zapi_credentials, set_llm_api_key_env
+
+
+class AsyncZAPI:
+    """
+    Asyncio ZAPI client for services running on an event loop.
+
+    Every backend call goes through one ``httpx.AsyncClient`` connection pool,
+    so a single loop can run hundreds of concurrent uploads and listings
+    without a thread per request. Authentication happens on first use (or on
+    ``async with``), is shared by concurrent callers, and is refreshed when
+    the token nears expiry or a request is rejected with 401.
+
+    Example:
+        >>> async with AsyncZAPI() as z:
+        ...     await z.upload_har("session.har")
+        ...     apis = await z.get_documented_apis(page_size=50)
+    """
+
+    def __init__(
+        self,
+        client_id: Optional[str] = None,
+        secret: Optional[str] = None,
+        llm_provider: Optional[str] = None,
+        llm_model_name: Optional[str] = None,
+        llm_api_key: Optional[str] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        max_connections: int = 100,
+        max_retries: int = 3,
+        backoff_base_seconds: float = 0.5,
+        backoff_max_seconds: float = 30.0,
+        token_cache: Union[TokenCache, bool] = True,
+    ):
+        """
+        Initialize the client. No network I/O happens until the first call.
+
+        Args:
+            client_id: Client ID for authentication. If None, loads from ADOPT_CLIENT_ID env var.
+            secret: Secret key for authentication. If None, loads from ADOPT_SECRET_KEY env var.
+            llm_provider: LLM provider name (e.g., "anthropic"). If None, loads from LLM_PROVIDER env var.
+            llm_model_name: LLM model name. If None, loads from LLM_MODEL_NAME env var.
+            llm_api_key: LLM API key for the specified provider. If None, loads from LLM_API_KEY env var.
+            client: httpx.AsyncClient to send requests with (left open by aclose()).
+                    Defaults to a client owned by this instance.
+            max_connections: Connection pool size of the default client
+            max_retries: Retries of 429/5xx responses and connection errors (0 disables retrying)
+            backoff_base_seconds: Delay before the first retry, doubled on every retry
+            backoff_max_seconds: Upper bound on a single retry delay, including Retry-After
+            token_cache: Reuse validated auth tokens across instances and processes (see ZAPI)
+
+        Raises:
+            ZAPIValidationError: If client_id or secret is empty, or the LLM key format is invalid
+        """
+        if client_id is None or secret is None or llm_provider is None or llm_model_name is None or llm_api_key is None:
+            env_client_id, env_secret, env_llm_provider, env_llm_model_name, env_llm_api_key = load_zapi_credentials()
+
+            client_id = client_id or env_client_id
+            secret = secret or env_secret
+            llm_provider = llm_provider or env_llm_provider
+            llm_model_name = llm_model_name or env_llm_model_name
+            llm_api_key = llm_api_key or env_llm_api_key
+
+        if not client_id or not client_id.strip():
+            raise ZAPIValidationError("client_id cannot be empty")
+        if not secret or not secret.strip():
+            raise ZAPIValidationError("secret cannot be empty")
+
+        self.client_id = client_id
+        self.secret = secret
+        self.max_retries = max_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+
+        self._owns_client = client is None
+        self._client = client or httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=httpx.Timeout(DEFAULT_TIMEOUT[1], connect=DEFAULT_TIMEOUT[0]),
+        )
+        self._token_cache: Optional[TokenCache] = TokenCache() if token_cache is True else token_cache or None
+
+        # (token, org_id, email) once authenticated
+        self._auth: Optional[tuple[str, str, str]] = None
+        self._auth_lock: Optional[asyncio.Lock] = None
+
+        # The key format is checked now; encrypting it needs the org_id from authentication
+        self._llm_provider: Optional[str] = None
+        self._llm_model_name: Optional[str] = None
+        self._llm_api_key: Optional[str] = None
+        self._encrypted_llm_key: Optional[str] = None
+        if llm_provider and llm_api_key:
+            try:
+                validated_keys = validate_llm_keys({llm_provider: llm_api_key})
+            except LLMKeyError as e:
+                raise LLMKeyError(f"LLM key validation failed: {e}")
+            self._llm_provider, self._llm_api_key = next(iter(validated_keys.items()))
+            self._llm_model_name = llm_model_name
+
+        # Byte counts of the most recent upload_har() call
+        self.last_upload_stats: Optional[UploadStats] = None
+
+        # LangChain tool provider reused across get_zapi_tools() calls
+        self._tool_creator = None
+
+    async def __aenter__(self) -> "AsyncZAPI":
+        await self.authenticate()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+        return False
+
+    async def aclose(self) -> None:
+        """Close the connection pool (unless the client was passed in)."""
+        if self._owns_client:
+            await self._client.aclose()
+
+    @property
+    def auth_token(self) -> Optional[str]:
+        """Current auth token, None before the first authentication."""
+        return self._auth[0] if self._auth else None
+
+    @property
+    def org_id(self) -> Optional[str]:
+        """Organization ID, None before the first authentication."""
+        return self._auth[1] if self._auth else None
+
+    @property
+    def email(self) -> Optional[str]:
+        """User email, None before the first authentication."""
+        return self._auth[2] if self._auth else None
+
+    def get_llm_provider(self) -> Optional[str]:
+        """Configured LLM provider, None if no key was given."""
+        return self._llm_provider
+
+    def get_llm_model_name(self) -> Optional[str]:
+        """Configured LLM model name, None if no key was given."""
+        return self._llm_model_name
+
+    def has_llm_key(self) -> bool:
+        """True if an LLM key was given."""
+        return self._llm_api_key is not None
+
+    async def _send(self, method: str, url: str, retry: bool = True, **kwargs) -> httpx.Response:
+        """Send a request, retrying 429/5xx responses and connection errors (same policy as ZAPITransport)."""
+        retries = self.max_retries if retry else 0
+        attempt = 0
+        while True:
+            try:
+                response = await self._client.request(method, url, **kwargs)
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError):
+                # Refused, timed out or reset before a response
+                if attempt >= retries:
+                    raise
+                attempt += 1
+                await asyncio.sleep(retry_delay(attempt, self.backoff_base_seconds, self.backoff_max_seconds))
+                continue
+
+            if not is_retryable_status(response.status_code) or attempt >= retries:
+                return response
+            await response.aclose()
+            attempt += 1
+            await asyncio.sleep(retry_delay(attempt, self.backoff_base_seconds, self.backoff_max_seconds, response))
+
+    async def authenticate(self) -> str:
+        """
+        Authenticate if needed and return the auth token.
+
+        Concurrent callers share one token exchange. A token close to expiry
+        is replaced.
+
+        Raises:
+            ZAPIAuthenticationError: If the credentials are rejected
+            ZAPINetworkError: If the auth service cannot be reached
+        """
+        if self._auth is not None and not self._expiring(self._auth[0]):
+            return self._auth[0]
+        return await self.refresh_auth_token(stale_token=self.auth_token, use_cache=self._auth is None)
+
+    def _expiring(self, token: str) -> bool:
+        expires_at = token_expiry(token)
+        return expires_at is not None and expires_at - time.time() <= DEFAULT_TOKEN_REFRESH_MARGIN_SECONDS
+
+    async def refresh_auth_token(self, stale_token: Optional[str] = None, use_cache: bool = False) -> str:
+        """
+        Fetch a new auth token.
+
+        Args:
+            stale_token: Token the caller saw rejected or expiring. If another
+                         caller has already replaced it, the current token is
+                         returned without a new fetch.
+            use_cache: Try the token cache before the network
+
+        Returns:
+            The current auth token
+        """
+        if self._auth_lock is None:
+            self._auth_lock = asyncio.Lock()
+
+        async with self._auth_lock:
+            if self._auth is not None and self._auth[0] != stale_token:
+                return self._auth[0]
+
+            cache_key = TokenCache.key_for(BASE_URL, self.client_id)
+            cached = None
+            if self._token_cache is not None and use_cache:
+                # Checking the secret verifier (scrypt) is CPU bound: keep it off the event loop
+                cached = await asyncio.to_thread(self._token_cache.load, cache_key, self.secret)
+            if cached is not None:
+                auth = (cached.token, cached.org_id, cached.email)
+            else:
+                auth = await self._fetch_auth_token()
+                if self._token_cache is not None:
+                    try:
+                        await asyncio.to_thread(self._token_cache.save, cache_key, self.secret, *auth)
+                    except OSError as e:
+                        print(f"⚠️  Could not cache auth token: {e}")
+
+            if self._llm_api_key and self._encrypted_llm_key is None:
+                # PBKDF2 key derivation is CPU bound: keep it off the event loop
+                encryptor = LLMKeyEncryption(auth[1])
+                try:
+                    self._encrypted_llm_key = await asyncio.to_thread(encryptor.encrypt_key, self._llm_api_key)
+                except Exception as e:
+                    raise ZAPIError(f"Failed to encrypt LLM key: {e}")
+
+                # Same LangChain key export as ZAPI, once the key is configured
+                try:
+                    set_llm_api_key_env(self._llm_provider, self._llm_api_key)
+                except Exception:
+                    # Silently fail if LangChain integration is not available
+                    pass
+
+            self._auth = auth
+            return auth[0]
+
+    async def _fetch_auth_token(self) -> tuple[str, str, str]:
+        """Exchange the client credentials for a token and validate it."""
+        try:
+            response = await self._send(
+                "POST",
+                f"{BASE_URL}/v1/auth/token",
+                json={"clientId": self.client_id, "secret": self.secret},
+                headers={"accept": "application/json"},
+            )
+            if response.status_code == 401:
+                raise AuthError(
+                    "Authentication Error: Invalid credentials. "
+                    "Check ADOPT_CLIENT_ID and ADOPT_SECRET_KEY (see https://docs.zapi.ai/authentication)."
+                )
+            elif response.status_code == 403:
+                raise AuthError("Access forbidden. Please check your account permissions.")
+            elif response.status_code >= 400:
+                raise AuthError(f"Authentication failed: HTTP {response.status_code}")
+
+            data = response.json()
+            token = data.get("token") or data.get("access_token")
+            if not token:
+                raise ZAPIError(f"Unexpected response format: {data}")
+
+            response = await self._send(
+                "POST",
+                f"{BASE_URL}/v1/auth/validate-token",
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            if response.status_code in (401, 403):
+                raise AuthError(f"Token validation failed: HTTP {response.status_code}")
+            elif response.status_code >= 400:
+                raise NetworkError(f"Backend token validation failed: HTTP {response.status_code}")
+
+            validation_result = response.json()
+        except httpx.TimeoutException:
+            raise NetworkError("Authentication request timed out. Please check your internet connection.")
+        except httpx.RequestError as e:
+            raise NetworkError(f"Failed to fetch authentication token: {e}")
+        except ValueError:
+            raise ZAPIError("Invalid response format from authentication service")
+
+        org_id = validation_result.get("org_id")
+        if not org_id or not isinstance(org_id, str):
+            raise ZAPIError("Token validation error: Invalid org_id in validation response")
+        return token, org_id, validation_result.get("user_email", "")
+
+    async def _authorized(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request with the Bearer token, refreshing the token and resending once on 401."""
+        headers = dict(kwargs.pop("headers", None) or {})
+        token = await self.authenticate()
+        headers["Authorization"] = f"Bearer {token}"
+        response = await self._send(method, url, headers=headers, **kwargs)
+        if response.status_code == 401:
+            headers["Authorization"] = f"Bearer {await self.refresh_auth_token(stale_token=token)}"
+            response = await self._send(method, url, headers=headers, **kwargs)
+        return response
+
+    def _upload_metadata(self) -> dict:
+        """Build the upload metadata, including the encrypted LLM key if one is configured."""
+        metadata = {"byok_enabled": False, "is_trial_user": True}
+        if self._encrypted_llm_key:
+            metadata = {
+                "byok_encrypted_llm_key": self._encrypted_llm_key,
+                "byok_llm_provider": self._llm_provider,  # Provider sent in plaintext
+                "byok_llm_model": self._llm_model_name,
+                "byok_enabled": True,
+                "is_trial_user": True,
+            }
+        if self.email:
+            metadata["user_email"] = self.email
+        return metadata
+
+    async def _post_har(
+        self,
+        har_file: str,
+        progress_callback: Optional[ProgressCallback],
+        compression: Optional[UploadCompression],
+    ) -> tuple[dict, UploadStats]:
+        token = await self.authenticate()
+        metadata = self._upload_metadata()
+
+        try:
+            raw_size = os.path.getsize(har_file)
+            codec = resolve_compression(compression, raw_size)
+            if codec:
+                metadata["content_encoding"] = codec
+                metadata["original_size"] = raw_size
+
+            started = time.monotonic()
+            with StreamingMultipartEncoder.from_path(
+                har_file, {"metadata": json.dumps(metadata)}, progress_callback=progress_callback, compression=codec
+            ) as body:
+                headers = {"Authorization": f"Bearer {token}", "Content-Type": body.content_type}
+                if body.length is not None:
+                    headers["Content-Length"] = str(body.length)
+
+                async def _chunks() -> AsyncIterator[bytes]:
+                    # Disk reads (and compression) run in a worker thread, not on the loop
+                    while True:
+                        chunk = await asyncio.to_thread(body.read, UPLOAD_CHUNK_SIZE)
+                        if not chunk:
+                            return
+                        yield chunk
+
+                connect_timeout, read_timeout = upload_timeout(raw_size)
+                # A streamed body cannot be replayed, so this call is never retried
+                response = await self._send(
+                    "POST",
+                    f"{BASE_URL}/v1/api-discovery/upload-file",
+                    retry=False,
+                    content=_chunks(),
+                    headers=headers,
+                    timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                )
+
+            stats = UploadStats(
+                raw_bytes=raw_size,
+                sent_bytes=body.bytes_read,
+                content_encoding=codec,
+                elapsed_seconds=time.monotonic() - started,
+            )
+        except FileNotFoundError:
+            raise ZAPIValidationError(f"HAR file not found: '{har_file}'")
+        except PermissionError:
+            raise ZAPIValidationError(f"Permission denied reading HAR file: '{har_file}'")
+        except httpx.TimeoutException:
+            raise NetworkError("Upload request timed out. Please try again.")
+        except httpx.RequestError as e:
+            raise NetworkError(f"Upload request failed: {e}")
+        except ValueError as e:
+            # Unknown or unavailable compression codec
+            raise ZAPIValidationError(str(e))
+
+        if response.status_code == 401:
+            raise AuthError("Upload failed: Invalid or expired authentication token")
+        elif response.status_code == 413:
+            raise ZAPIValidationError("HAR file is too large. Please try with a smaller session.")
+        elif response.status_code == 400:
+            raise ZAPIValidationError("Invalid HAR file format. Please ensure the file was generated correctly.")
+        elif response.status_code >= 400:
+            raise NetworkError(f"Upload failed: HTTP {response.status_code}")
+        try:
+            return response.json(), stats
+        except ValueError:
+            raise ZAPIError("Invalid response format from upload service")
+
+    async def upload_har(
+        self,
+        har_file: str,
+        progress_callback: Optional[ProgressCallback] = None,
+        compression: Optional[UploadCompression] = None,
+    ) -> dict:
+        """
+        Upload a HAR file, streamed from disk (async).
+
+        Args:
+            har_file: Path to the HAR file to upload
+            progress_callback: Optional callable receiving (bytes_sent, total_bytes)
+            compression: "gzip", "zstd" or "auto" to compress on the fly (see ZAPI.upload_har)
+
+        Returns:
+            Response JSON from the API
+
+        Raises:
+            ZAPIValidationError: If file validation fails
+            ZAPINetworkError: If upload fails due to network issues
+            ZAPIAuthenticationError: If authentication fails
+        """
+        token = await self.authenticate()
+        try:
+            result, stats = await self._post_har(har_file, progress_callback, compression)
+        except AuthError:
+            # The body was consumed: refresh the token and stream the file again
+            await self.refresh_auth_token(stale_token=token)
+            result, stats = await self._post_har(har_file, progress_callback, compression)
+        self.last_upload_stats = stats
+        return result
+
+    async def get_documented_apis(self, page: int = 1, page_size: int = 10) -> dict:
+        """
+        Fetch one page of documented APIs (async).
+
+        Args:
+            page: Page number to fetch (default: 1)
+            page_size: Number of items per page (default: 10)
+
+        Returns:
+            Response JSON containing the list of documented APIs
+
+        Raises:
+            httpx.HTTPStatusError: If the request fails
+        """
+        response = await self._authorized(
+            "GET", f"{BASE_URL}/v1/tools/apis", params={"page": page, "page_size": page_size}
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def iter_documented_apis(
+        self, page_size: int = CATALOG_PAGE_SIZE, concurrency: int = CATALOG_CONCURRENCY
+    ) -> AsyncIterator[dict]:
+        """
+        Iterate over every documented API, in catalog order (async).
+
+        Pages after the first are fetched ``concurrency`` at a time, a few
+        pages ahead of the consumer (see ZAPI.iter_documented_apis).
+
+        Args:
+            page_size: Items per request (default: 100)
+            concurrency: Pages fetched in parallel (default: 4)
+
+        Yields:
+            API descriptions, as returned in the listing's ``items``
+        """
+        first = await self.get_documented_apis(page=1, page_size=page_size)
+        items = first.get("items", [])
+        for item in items:
+            yield item
+
+        pages = total_pages(first, page_size)
+        if pages is None:
+            page = 1
+            while len(items) >= page_size:
+                page += 1
+                items = (await self.get_documented_apis(page=page, page_size=page_size)).get("items", [])
+                for item in items:
+                    yield item
+            return
+
+        pending: deque[asyncio.Task] = deque()
+        next_page = 2
+        try:
+            while next_page <= pages or pending:
+                # Keep the prefetch window full, then hand out the oldest page
+                while next_page <= pages and len(pending) < max(1, concurrency):
+                    pending.append(asyncio.ensure_future(self.get_documented_apis(next_page, page_size)))
+                    next_page += 1
+                for item in (await pending.popleft()).get("items", []):
+                    yield item
+        finally:
+            for task in pending:
+                task.cancel()
+            # Wait for the cancelled prefetches so none is left running or with an unretrieved error
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def get_all_documented_apis(
+        self, page_size: int = CATALOG_PAGE_SIZE, concurrency: int = CATALOG_CONCURRENCY
+    ) -> list[dict]:
+        """
+        Fetch the whole documented API catalog (async, see iter_documented_apis).
+
+        Returns:
+            List of API descriptions in catalog order
+        """
+        return [api async for api in self.iter_documented_apis(page_size=page_size, concurrency=concurrency)]
+
+    async def get_zapi_tools(self) -> list[Callable]:
+        """
+        Get LangChain tools for the documented APIs (async).
+
+        Tools are kept between calls and only rebuilt for APIs whose
+        definition changed.
+
+        Returns:
+            List of LangChain tool functions
+        """
+        return await self._langchain_tools().acreate_tools()
+
+    async def select_tools(self, query: str, k: int = 5) -> list[Callable]:
+        """
+        Get the LangChain tools most relevant to a query (async, see ZAPI.select_tools).
+
+        Returns:
+            Up to k LangChain tool functions, most relevant first
+        """
+        return await self._langchain_tools().aselect_tools(query, k)
+
+    def _langchain_tools(self):
+        """LangChain tool provider of this client, created on first use."""
+        try:
+            from .integrations.langchain.tool import ZAPILangchainTool
+        except ImportError:
+            raise ImportError("LangChain integration not available. Install langchain to use this feature.")
+
+        if self._tool_creator is None:
+            self._tool_creator = ZAPILangchainTool(self)
+        return self._tool_creator
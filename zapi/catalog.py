@@ -0,0 +1,277 @@
+"""Reading and caching the documented API catalog."""
+
+import hashlib
+import json
+import math
+import time
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from .storage_state import default_cache_dir, write_private_json
+
+# Page size used when walking the whole catalog
+CATALOG_PAGE_SIZE = 100
+
+# Pages fetched in parallel while walking the catalog
+CATALOG_CONCURRENCY = 4
+
+# Default CatalogCache freshness: the catalog changes rarely, so a snapshot is
+# used without contacting the server for an hour, then served stale for a day
+# while it is revalidated in the background
+CATALOG_TTL_SECONDS = 3600.0
+CATALOG_STALE_WHILE_REVALIDATE_SECONDS = 86400.0
+
+# Keys the listing endpoint may report the catalog size under
+_TOTAL_KEYS = ("total", "total_count", "count", "total_items")
+_PAGE_COUNT_KEYS = ("total_pages", "pages", "page_count")
+
+# Keys the listing endpoint reports an updated-since sync cursor under. Only
+# explicit sync cursors count: a bare timestamp does not mean the server
+# honours updated_since, and next_cursor is usually a pagination token. A full
+# page merged as a delta would lose deletions, so anything else falls back to
+# hash comparison.
+_CURSOR_KEYS = ("sync_cursor",)
+
+
+def total_pages(first_page: dict[str, Any], page_size: int) -> Optional[int]:
+    """
+    Number of pages in the catalog, read from the response to page 1.
+
+    Args:
+        first_page: Response JSON of get_documented_apis(page=1, page_size=page_size)
+        page_size: Page size the response was requested with
+
+    Returns:
+        Page count, or None if the response does not report the catalog size
+    """
+    for key in _PAGE_COUNT_KEYS:
+        value = first_page.get(key)
+        if isinstance(value, int) and not isinstance(value, bool):
+            return max(value, 1)
+    for key in _TOTAL_KEYS:
+        value = first_page.get(key)
+        if isinstance(value, int) and not isinstance(value, bool):
+            return max(math.ceil(value / page_size), 1)
+    return None
+
+
+def catalog_cursor(first_page: dict[str, Any]) -> Optional[str]:
+    """
+    Sync cursor reported by a listing response, to pass as ``updated_since`` next time.
+
+    Returns:
+        The cursor, or None if the server does not support delta listings
+    """
+    for key in _CURSOR_KEYS:
+        value = first_page.get(key)
+        if value is not None and not isinstance(value, bool):
+            return str(value)
+    return None
+
+
+def api_key(api: dict[str, Any]) -> str:
+    """Stable identity of an API in the catalog: its ID, or its method and path."""
+    if api.get("id") not in (None, ""):
+        return str(api["id"])
+    return f"{api.get('api_type', 'GET')} {api.get('path', '/')}"
+
+
+def api_hash(api: dict[str, Any]) -> str:
+    """Content hash of an API description, independent of key order."""
+    return hashlib.sha256(json.dumps(api, sort_keys=True, default=str).encode()).hexdigest()
+
+
+@dataclass
+class CatalogDelta:
+    """Changes between two versions of the documented API catalog."""
+
+    added: list[dict[str, Any]] = field(default_factory=list)
+    updated: list[dict[str, Any]] = field(default_factory=list)
+    removed: list[dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        """True if any API was added, updated or removed."""
+        return bool(self.added or self.updated or self.removed)
+
+    def __str__(self) -> str:
+        return f"{len(self.added)} added, {len(self.updated)} updated, {len(self.removed)} removed"
+
+
+def diff_catalog(old: list[dict[str, Any]], new: list[dict[str, Any]]) -> CatalogDelta:
+    """
+    Compare two full catalogs item by item, using content hashes.
+
+    Args:
+        old: Previous catalog
+        new: Current catalog
+
+    Returns:
+        The APIs added, updated and removed between ``old`` and ``new``
+    """
+    old_by_key = {api_key(api): api for api in old}
+    delta = CatalogDelta()
+    for api in new:
+        previous = old_by_key.pop(api_key(api), None)
+        if previous is None:
+            delta.added.append(api)
+        elif api_hash(previous) != api_hash(api):
+            delta.updated.append(api)
+    delta.removed = list(old_by_key.values())
+    return delta
+
+
+def merge_catalog(
+    old: list[dict[str, Any]], changed: list[dict[str, Any]], deleted_keys: Iterable[str] = ()
+) -> tuple[list[dict[str, Any]], CatalogDelta]:
+    """
+    Apply a delta listing to a catalog.
+
+    Args:
+        old: Current local catalog
+        changed: APIs the server reports as changed since the last sync; items
+                 flagged ``deleted`` are removed
+        deleted_keys: Keys (see api_key) of APIs the server reports as deleted
+
+    Returns:
+        (catalog, delta): the merged catalog, with updated APIs kept in place
+        and new ones appended, and what actually changed
+    """
+    merged = {api_key(api): api for api in old}
+    deleted = set(deleted_keys)
+    delta = CatalogDelta()
+    for api in changed:
+        key = api_key(api)
+        if api.get("deleted") is True:
+            deleted.add(key)
+            continue
+        previous = merged.get(key)
+        if previous is None:
+            delta.added.append(api)
+        elif api_hash(previous) != api_hash(api):
+            delta.updated.append(api)
+        else:
+            continue
+        merged[key] = api
+    for key in deleted:
+        if key in merged:
+            delta.removed.append(merged.pop(key))
+    return list(merged.values()), delta
+
+
+@dataclass
+class CatalogSnapshot:
+    """
+    A locally stored copy of the documented API catalog.
+
+    ``pages`` keeps every listing page with the validators (ETag,
+    Last-Modified) it was served with, so each page can be revalidated with
+    a conditional request that transfers no body when it is unchanged.
+    ``cursor`` is the server's sync cursor, when it supports delta listings.
+    """
+
+    saved_at: float
+    page_size: int
+    pages: list[dict[str, Any]] = field(default_factory=list)
+    cursor: Optional[str] = None
+
+    @property
+    def apis(self) -> list[dict[str, Any]]:
+        """Every API in the snapshot, in catalog order."""
+        return [api for page in self.pages for api in page.get("items", [])]
+
+    @property
+    def age_seconds(self) -> float:
+        """Seconds since the snapshot was fetched or last revalidated."""
+        return time.time() - self.saved_at
+
+
+class CatalogCache:
+    """
+    On-disk cache of the documented API catalog, one file per client.
+
+    A snapshot younger than ``ttl_seconds`` is used as is. Past that, it is
+    revalidated page by page with If-None-Match / If-Modified-Since, and
+    unchanged pages (304) are reused without transferring their body. With
+    ``stale_while_revalidate_seconds``, a snapshot that is too old but within
+    that extra window is returned immediately while the revalidation runs in
+    the background, so agent processes start instantly.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Union[str, Path]] = None,
+        ttl_seconds: float = CATALOG_TTL_SECONDS,
+        stale_while_revalidate_seconds: float = CATALOG_STALE_WHILE_REVALIDATE_SECONDS,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding cached catalogs (default: ~/.cache/zapi/catalog)
+            ttl_seconds: How long a snapshot is used without asking the server
+                         (default: 1 hour; 0 revalidates on every call, which is cheap
+                         when nothing changed but still costs a round trip)
+            stale_while_revalidate_seconds: Extra window after the TTL during which the
+                                            stale snapshot is served while it is refreshed
+                                            in the background (default: 1 day; 0 disables it)
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir("catalog")
+        self.ttl_seconds = ttl_seconds
+        self.stale_while_revalidate_seconds = stale_while_revalidate_seconds
+
+    @staticmethod
+    def key_for(base_url: str, client_id: str) -> str:
+        """Return the cache key for a client's catalog."""
+        return hashlib.sha256(f"{base_url}\n{client_id}".encode()).hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        """Return the file used to store ``key``."""
+        return self.cache_dir / f"{key[:32]}.json"
+
+    def is_fresh(self, snapshot: CatalogSnapshot) -> bool:
+        """True if the snapshot can be used without revalidation."""
+        return snapshot.age_seconds <= self.ttl_seconds
+
+    def can_serve_stale(self, snapshot: CatalogSnapshot) -> bool:
+        """True if the snapshot can be served while it is revalidated in the background."""
+        return snapshot.age_seconds <= self.ttl_seconds + self.stale_while_revalidate_seconds
+
+    def load(self, key: str) -> Optional[CatalogSnapshot]:
+        """
+        Return the cached snapshot for ``key``, whatever its age.
+
+        Unreadable entries are removed and reported as missing.
+        """
+        path = self.path_for(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+            if entry.pop("key") != key:
+                return None
+            return CatalogSnapshot(**entry)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError):
+            self.invalidate(key)
+            return None
+
+    def save(self, key: str, snapshot: CatalogSnapshot) -> Path:
+        """Store a snapshot for ``key``."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+        return write_private_json(self.path_for(key), {"key": key, **asdict(snapshot)})
+
+    def invalidate(self, key: str) -> bool:
+        """
+        Remove the cached snapshot for ``key``.
+
+        Returns:
+            True if an entry was removed
+        """
+        try:
+            self.path_for(key).unlink()
+            return True
+        except FileNotFoundError:
+            return False
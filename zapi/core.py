@@ -1,12 +1,32 @@
 """Core ZAPI class implementation."""
 
-import asyncio
 import json
-from typing import Callable, Optional
+import os
+import re
+import tempfile
+import threading
+import time
+import weakref
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
 
-import httpx
 import requests
 
+from .catalog import (
+    CATALOG_CONCURRENCY,
+    CATALOG_PAGE_SIZE,
+    CatalogCache,
+    CatalogDelta,
+    CatalogSnapshot,
+    catalog_cursor,
+    diff_catalog,
+    merge_catalog,
+    total_pages,
+)
 from .constants import BASE_URL
 from .encryption import LLMKeyEncryption
 from .exceptions import (
@@ -17,10 +37,68 @@ from .exceptions import (
     ZAPINetworkError,
     ZAPIValidationError,
 )
+from .farm import CaptureFarm
+from .flows import CaptureFlow, FlowReplayResult, areplay_flows, replay_flows
+from .har_processing import HarProcessingError, HarProcessor
+from .har_sharding import iter_har_shards
 from .providers import validate_llm_keys
-from .session import BrowserSession
+from .session import BrowserSession, HarContentPolicy, _run_async
+from .storage_state import StorageStateCache
+from .token_cache import DEFAULT_TOKEN_REFRESH_MARGIN_SECONDS, TokenCache, token_expiry
+from .transport import ZAPITransport
+from .upload import (
+    UPLOAD_PART_SIZE,
+    ProgressCallback,
+    ResumableUploader,
+    ResumableUploadError,
+    StreamingMultipartEncoder,
+    UploadCompression,
+    UploadStats,
+    resolve_compression,
+    upload_timeout,
+)
+from .upload_jobs import (
+    UPLOAD_COMPLETED,
+    UPLOAD_FAILED,
+    UPLOAD_JOB_WORKERS,
+    UPLOAD_PROCESSING,
+    UPLOAD_UPLOADING,
+    UploadJob,
+    UploadJobCallback,
+    discovery_state,
+    status_poll_delay,
+)
 from .utils import load_zapi_credentials, set_llm_api_key_env
 
+# Delay before retrying a failed background token refresh
+TOKEN_REFRESH_RETRY_SECONDS = 30.0
+
+
+# Error raised for upload jobs interrupted by ZAPI.close()
+_CLOSED_BEFORE_PROCESSING = "ZAPI instance closed before the upload of '{har_file}' finished"
+
+
+def _fail_cancelled_job(task: Future, job: UploadJob) -> None:
+    """Pool callback failing an upload job whose task close() cancelled before it ran."""
+    if task.cancelled():
+        job._fail(ZAPIError(_CLOSED_BEFORE_PROCESSING.format(har_file=job.har_file)))
+
+
+def _refresh_in_background(zapi_ref: "weakref.ReferenceType[ZAPI]", token: str) -> None:
+    """Timer callback refreshing a ZAPI instance's token, unless the instance is gone."""
+    zapi = zapi_ref()
+    if zapi is None:
+        return
+    try:
+        zapi.refresh_auth_token(stale_token=token)
+    except ZAPIError as e:
+        expires_at = token_expiry(token)
+        if expires_at is not None and expires_at > time.time():
+            print(f"⚠️  Auth token refresh failed, retrying in {TOKEN_REFRESH_RETRY_SECONDS:.0f}s: {e}")
+            zapi._schedule_refresh(token, delay=TOKEN_REFRESH_RETRY_SECONDS)
+        else:
+            print(f"⚠️  Auth token refresh failed: {e}")
+
 
 class ZAPI:
     """
@@ -37,6 +115,10 @@ class ZAPI:
         llm_provider: Optional[str] = None,
         llm_model_name: Optional[str] = None,
         llm_api_key: Optional[str] = None,
+        transport: Optional[ZAPITransport] = None,
+        token_cache: Union[TokenCache, bool] = True,
+        lazy_auth: bool = False,
+        catalog_cache: Union[CatalogCache, bool] = True,
     ):
         """
         Initialize ZAPI instance.
@@ -47,6 +129,22 @@ class ZAPI:
             llm_provider: LLM provider name (e.g., "anthropic"). If None, loads from LLM_PROVIDER env var.
             llm_model_name: LLM model name (e.g., "claude-3-5-sonnet-20241022"). If None, loads from LLM_MODEL_NAME env var.
             llm_api_key: LLM API key for the specified provider. If None, loads from LLM_API_KEY env var.
+            transport: HTTP transport for backend calls (connection pool, retries, timeouts).
+                       Defaults to a ZAPITransport with default limits.
+            token_cache: Reuse validated auth tokens across ZAPI instances and processes until
+                         shortly before they expire. True (default) uses a TokenCache under
+                         ~/.cache/zapi/tokens, False always authenticates over the network.
+            lazy_auth: Authenticate on a background thread instead of blocking here. Only the
+                       operations that need the token (auth_token/org_id/email, uploads, API
+                       listing, header injection in browser sessions) wait for it, so a browser
+                       launch overlaps with authentication. Auth errors surface on first use.
+            catalog_cache: Keep the documented API catalog on disk for get_catalog() and
+                           get_zapi_tools(). True (default) uses a CatalogCache under
+                           ~/.cache/zapi/catalog, used as is for an hour and then served stale
+                           for up to a day while it is revalidated in the background with
+                           conditional requests. Pass a CatalogCache to change those windows
+                           (ttl_seconds=0 revalidates on every call), or False to always
+                           download the catalog.
 
         Raises:
             ValueError: If client_id or secret is empty, or LLM key format is invalid
@@ -71,27 +169,285 @@ class ZAPI:
         self.client_id = client_id
         self.secret = secret
 
-        # Fetch auth token and extract org_id
-        self.auth_token, self.org_id, self.email = self._fetch_auth_token()
+        # One keep-alive connection pool for every backend call of this instance
+        self._transport = transport or ZAPITransport()
+        self._owns_transport = transport is None
+
+        # Byte counts of the most recent upload_har() call
+        self.last_upload_stats: Optional[UploadStats] = None
 
-        # Initialize encryption handler
-        self._key_encryptor = LLMKeyEncryption(self.org_id)
+        self._token_cache: Optional[TokenCache] = TokenCache() if token_cache is True else token_cache or None
 
-        # Validate and encrypt LLM key if provided
+        # Encryption handler, created once the org_id is known
+        self._key_encryptor: Optional[LLMKeyEncryption] = None
         self._encrypted_llm_key: str = ""
         self._llm_provider: str = llm_provider
         self._llm_model_name: str = llm_model_name
-        self.set_llm_key(llm_provider, llm_api_key, llm_model_name)
+        # LLM key waiting for background authentication before it can be encrypted
+        self._pending_llm_key: Optional[tuple[str, str, str]] = None
+        # Held while the deferred LLM key is set up; readers wait on it until _llm_key_ready
+        self._llm_key_lock = threading.Lock()
+        self._llm_key_ready = False
+        self._auth_lock = threading.Lock()
+
+        # Token refresh: one refresh at a time, scheduled ahead of expiry, pushed to live sessions
+        self._refresh_lock = threading.Lock()
+        self._refresh_timer: Optional[threading.Timer] = None
+        self._sessions: weakref.WeakSet[BrowserSession] = weakref.WeakSet()
+
+        # Documented API catalog cache, revalidated by at most one background thread
+        self._catalog_cache: Optional[CatalogCache] = CatalogCache() if catalog_cache is True else catalog_cache or None
+        self._catalog_lock = threading.Lock()
+        self._catalog_sync_lock = threading.Lock()
+        self._catalog_thread: Optional[threading.Thread] = None
+        # LangChain tool provider reused across get_zapi_tools() calls
+        self._tool_creator = None
+
+        # Background upload jobs: bounded upload pool, separate pool for status polling
+        self._upload_pool_lock = threading.Lock()
+        self._upload_pool: Optional[ThreadPoolExecutor] = None
+        self._status_pool: Optional[ThreadPoolExecutor] = None
+        # Set by close(): stops status polling and token refresh
+        self._closed = threading.Event()
+
+        if lazy_auth:
+            # Check the key format now; encrypting it needs the org_id from authentication
+            if llm_provider and llm_api_key:
+                try:
+                    validate_llm_keys({llm_provider: llm_api_key})
+                except LLMKeyError as e:
+                    raise LLMKeyError(f"LLM key validation failed: {e}")
+            self._pending_llm_key = (llm_provider, llm_api_key, llm_model_name)
+            self._auth_future = self._start_background_auth()
+        else:
+            # Fetch auth token and extract org_id (from the token cache when warm)
+            self._auth_future: Future = Future()
+            self._auth_future.set_result(self._authenticate())
+            self._configure_llm_key(llm_provider, llm_api_key, llm_model_name)
+
+    @property
+    def auth_token(self) -> str:
+        """Bearer token for the ZAPI backend (waits for background authentication)."""
+        return self._resolve_auth()[0]
+
+    @property
+    def org_id(self) -> str:
+        """Organization ID of the authenticated client (waits for background authentication)."""
+        return self._resolve_auth()[1]
+
+    @property
+    def email(self) -> str:
+        """User email of the authenticated client (waits for background authentication)."""
+        return self._resolve_auth()[2]
+
+    @property
+    def token_expires_at(self) -> Optional[float]:
+        """Expiry of the current token as a Unix timestamp (None if the token has no exp claim)."""
+        return token_expiry(self.auth_token)
+
+    def close(self) -> None:
+        """
+        Stop the instance's background work and release its connections.
+
+        Uploads already being sent are allowed to finish. Upload jobs still
+        queued or waiting for discovery processing fail with ZAPIError, and
+        the token refresh timer is cancelled. The instance cannot start new
+        upload jobs afterwards.
+        """
+        with self._auth_lock:
+            self._closed.set()
+            if self._refresh_timer is not None:
+                self._refresh_timer.cancel()
+                self._refresh_timer = None
+        with self._upload_pool_lock:
+            pools = [pool for pool in (self._upload_pool, self._status_pool) if pool is not None]
+        # Upload pool first: its running jobs may still hand over to the status pool
+        for pool in pools:
+            pool.shutdown(wait=True, cancel_futures=True)
+        if self._owns_transport:
+            self._transport.close()
+
+    def __enter__(self) -> "ZAPI":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def refresh_auth_token(self, stale_token: Optional[str] = None) -> str:
+        """
+        Fetch a new auth token and push it into live browser sessions.
+
+        Tokens are refreshed automatically shortly before they expire and when
+        a request is rejected with 401, so calling this is rarely needed.
+        Concurrent callers share one refresh.
+
+        Args:
+            stale_token: Token the caller saw rejected. If another caller has
+                         already replaced it, the current token is returned
+                         without fetching a new one.
+
+        Returns:
+            The current auth token
+
+        Raises:
+            ZAPIAuthenticationError: If the credentials are rejected
+            ZAPINetworkError: If the auth service cannot be reached
+        """
+        with self._refresh_lock:
+            current = None
+            if self._auth_future.done() and self._auth_future.exception() is None:
+                current = self._auth_future.result()
+            if current is not None and stale_token is not None and current[0] != stale_token:
+                return current[0]
+
+            token, org_id, email = self._fetch_auth_token()
+            self._store_cached_token(token, org_id, email)
+            auth_future: Future = Future()
+            auth_future.set_result((token, org_id, email))
+            self._auth_future = auth_future
+
+        self._schedule_refresh(token)
+        for session in list(self._sessions):
+            try:
+                session.update_auth_token(token)
+            except Exception as e:
+                print(f"⚠️  Could not update the auth header of a browser session: {e}")
+        return token
+
+    def _schedule_refresh(self, token: str, delay: Optional[float] = None) -> None:
+        """Arm a timer that refreshes ``token`` shortly before its exp claim."""
+        if delay is None:
+            expires_at = token_expiry(token)
+            if expires_at is None:
+                return
+            remaining = expires_at - time.time()
+            # Short-lived tokens are refreshed halfway through their life
+            delay = max(0.0, remaining - min(DEFAULT_TOKEN_REFRESH_MARGIN_SECONDS, remaining / 2))
+
+        timer = threading.Timer(delay, _refresh_in_background, args=(weakref.ref(self), token))
+        timer.daemon = True
+        with self._auth_lock:
+            if self._closed.is_set():
+                return
+            if self._refresh_timer is not None:
+                self._refresh_timer.cancel()
+            self._refresh_timer = timer
+        timer.start()
+
+    def _retry_on_unauthorized(self, call: Callable[[], Any]) -> Any:
+        """Run ``call``; if it fails with an auth error, refresh the token once and retry."""
+        token = self.auth_token
+        try:
+            return call()
+        except AuthError:
+            self.refresh_auth_token(stale_token=token)
+            return call()
+
+    def _authorized_request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request with the Bearer token, refreshing the token and resending once on 401."""
+        headers = dict(kwargs.pop("headers", None) or {})
+        token = self.auth_token
+        headers["Authorization"] = f"Bearer {token}"
+        response = self._transport.request(method, url, headers=headers, **kwargs)
+        if response.status_code == 401:
+            headers["Authorization"] = f"Bearer {self.refresh_auth_token(stale_token=token)}"
+            response = self._transport.request(method, url, headers=headers, **kwargs)
+        return response
+
+    def _start_background_auth(self) -> Future:
+        """Run _authenticate() on a short-lived worker thread."""
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="zapi-auth")
+        future = executor.submit(self._authenticate)
+        # The worker thread exits once authentication finishes
+        executor.shutdown(wait=False)
+        return future
+
+    def _resolve_auth(self) -> tuple[str, str, str]:
+        """
+        Wait for authentication and finish the LLM key setup deferred until then.
+
+        Returns:
+            Tuple of (auth_token, org_id, email)
+
+        Raises:
+            AuthError / NetworkError: If authentication failed
+        """
+        state = self._auth_future.result()
+        if not self._llm_key_ready:
+            # The key is configured under the lock, so no caller sees the token
+            # before the LLM key that goes with it
+            with self._llm_key_lock:
+                if self._key_encryptor is None:
+                    self._key_encryptor = LLMKeyEncryption(state[1])
+                pending, self._pending_llm_key = self._pending_llm_key, None
+                if pending is not None:
+                    self._configure_llm_key(*pending)
+                self._llm_key_ready = True
+        return state
+
+    def _auth_token_for_session(self) -> Union[str, Future]:
+        """
+        Token to hand to a BrowserSession.
+
+        While background authentication is still running this is a future, so
+        the session can launch its browser and only wait before injecting the
+        Authorization header.
+        """
+        if self._auth_future.done():
+            return self.auth_token
+
+        token_future: Future = Future()
+
+        def _forward(auth_future: Future) -> None:
+            try:
+                token_future.set_result(auth_future.result()[0])
+            except BaseException as e:
+                token_future.set_exception(e)
+
+        self._auth_future.add_done_callback(_forward)
+        return token_future
+
+    def _configure_llm_key(self, provider: str, api_key: str, model_name: str) -> None:
+        """Encrypt the LLM key and expose it to LangChain."""
+        self.set_llm_key(provider, api_key, model_name)
 
         # Automatically set LLM API key in environment for LangChain compatibility
         if self._llm_provider and self._encrypted_llm_key:
             try:
-                set_llm_api_key_env(self._llm_provider, self.get_decrypted_llm_key())
+                set_llm_api_key_env(self._llm_provider, self._key_encryptor.decrypt_key(self._encrypted_llm_key))
             except Exception:
                 # Silently fail if LangChain integration is not available
                 pass
 
-    def _fetch_auth_token(self) -> tuple[str, str]:
+    def _authenticate(self) -> tuple[str, str, str]:
+        """
+        Return a validated (token, org_id, email), from the token cache when possible.
+
+        Cache read and write failures are ignored: the cache only saves round trips.
+        """
+        cache_key = TokenCache.key_for(BASE_URL, self.client_id)
+        if self._token_cache is not None:
+            cached = self._token_cache.load(cache_key, self.secret)
+            if cached is not None:
+                print(f"Org ID: {cached.org_id}")
+                print(f"Email: {cached.email}")
+                self._schedule_refresh(cached.token)
+                return cached.token, cached.org_id, cached.email
+
+        token, org_id, email = self._fetch_auth_token()
+        self._store_cached_token(token, org_id, email)
+        self._schedule_refresh(token)
+        return token, org_id, email
+
+    def _store_cached_token(self, token: str, org_id: str, email: str) -> None:
+        if self._token_cache is None:
+            return
+        try:
+            self._token_cache.save(TokenCache.key_for(BASE_URL, self.client_id), self.secret, token, org_id, email)
+        except OSError as e:
+            print(f"⚠️  Could not cache auth token: {e}")
+
+    def _fetch_auth_token(self) -> tuple[str, str, str]:
         """
         Fetch authentication token from adopt.ai API and extract org_id.
 
@@ -106,7 +462,7 @@ class ZAPI:
         headers = {"accept": "application/json", "Content-Type": "application/json"}
 
         try:
-            response = requests.post(url, json=payload, headers=headers)
+            response = self._transport.post(url, json=payload, headers=headers)
             response.raise_for_status()
             data = response.json()
 
@@ -119,13 +475,7 @@ class ZAPI:
                 raise RuntimeError(f"Unexpected response format: {data}")
 
             # Validate token and extract org_id via backend API
-            try:
-                loop = asyncio.get_event_loop()
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-
-            org_id, email = loop.run_until_complete(self._validate_token_and_extract_org_id(token))
+            org_id, email = self._validate_token_and_extract_org_id(token)
 
             return token, org_id, email
 
@@ -154,7 +504,7 @@ class ZAPI:
         except requests.exceptions.RequestException as e:
             raise NetworkError(f"Failed to fetch authentication token: {e}")
 
-    async def _validate_token_and_extract_org_id(self, token: str) -> str:
+    def _validate_token_and_extract_org_id(self, token: str) -> tuple[str, str]:
         """
         Validate JWT token via backend API and extract org_id.
 
@@ -162,46 +512,45 @@ class ZAPI:
             token: JWT token string
 
         Returns:
-            Organization ID extracted from validated token
+            Tuple of (org_id, email) from the validated token
 
         Raises:
             RuntimeError: If token validation fails or org_id extraction fails
         """
         # Use adopt.ai backend API for token validation
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    f"{BASE_URL}/v1/auth/validate-token",
-                    headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
-                )
-                response.raise_for_status()
-
-                validation_result = response.json()
-
-                # API returns org_id and user_email directly on success
-                org_id = validation_result.get("org_id")
-                email = validation_result.get("user_email", "")
-                if not org_id or not isinstance(org_id, str):
-                    raise RuntimeError("Invalid org_id in validation response")
-
-                print(f"Org ID: {org_id}")
-                print(f"Email: {email}")
-
-                return org_id, email
-
-            except httpx.HTTPStatusError as e:
-                if e.response.status_code == 401:
-                    raise AuthError("Token validation failed: Invalid or expired token")
-                elif e.response.status_code == 403:
-                    raise AuthError("Token validation failed: Access forbidden")
-                else:
-                    raise NetworkError(f"Backend token validation failed: HTTP {e.response.status_code}")
-            except httpx.ConnectTimeout:
-                raise NetworkError("Token validation timed out. Please check your internet connection.")
-            except httpx.RequestError as e:
-                raise NetworkError(f"Token validation request failed: {e}")
-            except Exception as e:
-                raise ZAPIError(f"Token validation error: {e}")
+        try:
+            response = self._transport.post(
+                f"{BASE_URL}/v1/auth/validate-token",
+                headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
+            )
+            response.raise_for_status()
+
+            validation_result = response.json()
+
+            # API returns org_id and user_email directly on success
+            org_id = validation_result.get("org_id")
+            email = validation_result.get("user_email", "")
+            if not org_id or not isinstance(org_id, str):
+                raise RuntimeError("Invalid org_id in validation response")
+
+            print(f"Org ID: {org_id}")
+            print(f"Email: {email}")
+
+            return org_id, email
+
+        except requests.exceptions.HTTPError as e:
+            if e.response.status_code == 401:
+                raise AuthError("Token validation failed: Invalid or expired token")
+            elif e.response.status_code == 403:
+                raise AuthError("Token validation failed: Access forbidden")
+            else:
+                raise NetworkError(f"Backend token validation failed: HTTP {e.response.status_code}")
+        except requests.exceptions.ConnectTimeout:
+            raise NetworkError("Token validation timed out. Please check your internet connection.")
+        except requests.exceptions.RequestException as e:
+            raise NetworkError(f"Token validation request failed: {e}")
+        except Exception as e:
+            raise ZAPIError(f"Token validation error: {e}")
 
     def set_llm_key(self, provider: str, api_key: str, model_name: str) -> None:
         """
@@ -215,6 +564,9 @@ class ZAPI:
             ValueError: If provider or api_key format is invalid
             RuntimeError: If encryption fails
         """
+        # An explicit key replaces one still waiting for background authentication
+        self._pending_llm_key = None
+
         if not provider or not api_key:
             self._encrypted_llm_key = None
             self._llm_provider = None
@@ -230,6 +582,8 @@ class ZAPI:
             raise LLMKeyError(f"LLM key validation failed: {e}")
 
         # Encrypt only the API key using org_id (provider stored separately)
+        if self._key_encryptor is None:
+            self._resolve_auth()
         try:
             self._encrypted_llm_key = self._key_encryptor.encrypt_key(validated_key)
             self._llm_provider = validated_provider
@@ -262,6 +616,8 @@ class ZAPI:
         Returns:
             Encrypted API key if configured, None otherwise
         """
+        if not self._llm_key_ready:
+            self._resolve_auth()
         return self._encrypted_llm_key
 
     def get_decrypted_llm_key(self) -> Optional[str]:
@@ -271,6 +627,8 @@ class ZAPI:
         Returns:
             Decrypted API key if configured, None otherwise
         """
+        if not self._llm_key_ready:
+            self._resolve_auth()
         try:
             if not self._encrypted_llm_key:
                 return None
@@ -286,25 +644,68 @@ class ZAPI:
         Returns:
             True if LLM key is set, False otherwise
         """
+        if not self._llm_key_ready:
+            self._resolve_auth()
         return self._encrypted_llm_key is not None
 
-    def get_zapi_tools(self) -> list[Callable]:
+    def get_zapi_tools(self, refresh: bool = False) -> list[Callable]:
         """
         Get LangChain tools from ZAPI (created on-demand).
 
+        Tools are kept between calls and only rebuilt for APIs whose
+        definition changed in the catalog.
+
+        Args:
+            refresh: Sync the catalog first, even if the cached copy is fresh
+
         Returns:
             List of LangChain tool functions
         """
         try:
             from .integrations.langchain.tool import ZAPILangchainTool
 
-            tool_creator = ZAPILangchainTool(self)
-            return tool_creator.create_tools()
+            if self._tool_creator is None:
+                self._tool_creator = ZAPILangchainTool(self)
+            return self._tool_creator.refresh_tools() if refresh else self._tool_creator.create_tools()
+        except ImportError:
+            raise ImportError("LangChain integration not available. Install langchain to use this feature.")
+
+    def select_tools(self, query: str, k: int = 5) -> list[Callable]:
+        """
+        Get the LangChain tools most relevant to a query (see get_zapi_tools).
+
+        Tools are ranked with a local BM25 index over the catalog, so an agent
+        can bind only the top k on each turn instead of every documented API.
+
+        Args:
+            query: Free text, typically the user's message
+            k: Maximum number of tools (default: 5)
+
+        Returns:
+            Up to k LangChain tool functions, most relevant first
+        """
+        try:
+            from .integrations.langchain.tool import ZAPILangchainTool
+
+            if self._tool_creator is None:
+                self._tool_creator = ZAPILangchainTool(self)
+            return self._tool_creator.select_tools(query, k)
         except ImportError:
             raise ImportError("LangChain integration not available. Install langchain to use this feature.")
 
     def launch_browser(
-        self, url: str, headless: bool = True, wait_until: str = "load", **playwright_options
+        self,
+        url: str,
+        headless: bool = True,
+        wait_until: str = "load",
+        record_flow: bool = False,
+        record_har_content: HarContentPolicy = "embed",
+        record_har_url_filter: Optional[Union[str, re.Pattern]] = None,
+        api_only: bool = False,
+        storage_state: Optional[Union[str, Path, dict]] = None,
+        storage_state_cache: Optional[StorageStateCache] = None,
+        login_url_pattern: Optional[Union[str, re.Pattern]] = None,
+        **playwright_options,
     ) -> BrowserSession:
         """
         Launch a browser session with network logging.
@@ -314,6 +715,14 @@ class ZAPI:
             headless: Whether to run browser in headless mode (default: True)
             wait_until: When to consider navigation complete (default: "load")
                        Options: "load", "domcontentloaded", "networkidle"
+            record_flow: Record the session's actions for replay (see BrowserSession.save_flow)
+            record_har_content: Response body policy: "embed" (default), "omit" (headers only)
+                                or "attach" (bodies stored in a .zip archive)
+            record_har_url_filter: Glob string or regex; only matching requests are recorded
+            api_only: Only record likely API requests (skips static assets at capture time)
+            storage_state: Saved cookies/localStorage (file or dict) to start the session logged in
+            storage_state_cache: StorageStateCache reused across runs, keyed by the URL's origin
+            login_url_pattern: Regex for the login page; landing there drops the cached state
             **playwright_options: Additional Playwright browser launch options.
                                  Use `args=["--disable-web-security"]` to disable
                                  web security (for testing only).
@@ -337,17 +746,25 @@ class ZAPI:
             ...     args=["--disable-web-security"]
             ... )
         """
-        session = BrowserSession(auth_token=self.auth_token, headless=headless, **playwright_options)
+        session = BrowserSession(
+            auth_token=self._auth_token_for_session(),
+            headless=headless,
+            record_flow=record_flow,
+            record_har_content=record_har_content,
+            record_har_url_filter=record_har_url_filter,
+            api_only=api_only,
+            storage_state=storage_state,
+            storage_state_cache=storage_state_cache,
+            login_url_pattern=login_url_pattern,
+            **playwright_options,
+        )
+
+        # Refreshed tokens are pushed into the session's Authorization header
+        self._sessions.add(session)
 
         # Initialize the session synchronously with enhanced error handling
         try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-        try:
-            loop.run_until_complete(session._initialize(initial_url=url, wait_until=wait_until))
+            _run_async(session.start(url, wait_until=wait_until))
         except Exception as e:
             # Close session if initialization failed
             try:
@@ -355,54 +772,201 @@ class ZAPI:
             except Exception:
                 # Ignore cleanup errors, focus on the original error
                 pass
+            raise self._launch_error(url, e)
+
+        return session
 
-            error_message = str(e)
+    async def alaunch_browser(
+        self,
+        url: str,
+        headless: bool = True,
+        wait_until: str = "load",
+        record_flow: bool = False,
+        record_har_content: HarContentPolicy = "embed",
+        record_har_url_filter: Optional[Union[str, re.Pattern]] = None,
+        api_only: bool = False,
+        storage_state: Optional[Union[str, Path, dict]] = None,
+        storage_state_cache: Optional[StorageStateCache] = None,
+        login_url_pattern: Optional[Union[str, re.Pattern]] = None,
+        **playwright_options,
+    ) -> BrowserSession:
+        """
+        Launch a browser session with network logging (async).
 
-            # Provide specific error messages for common browser issues
-            if "Cannot navigate to invalid URL" in error_message:
-                raise ZAPIValidationError(
-                    f"Browser cannot navigate to URL: '{url}'. Please check the URL format and ensure it's accessible."
-                )
-            elif "net::ERR_NAME_NOT_RESOLVED" in error_message:
-                raise NetworkError(
-                    f"Domain name could not be resolved: '{url}'. "
-                    "Please check the URL spelling and your internet connection."
-                )
-            elif "net::ERR_CONNECTION_REFUSED" in error_message:
-                raise NetworkError(
-                    f"Connection refused to: '{url}'. The server may be down or the URL may be incorrect."
-                )
-            elif "Timeout" in error_message:
-                raise NetworkError(
-                    f"Timeout while loading: '{url}'. "
-                    "The website took too long to respond. Please try again or use a different URL."
-                )
-            else:
-                raise ZAPIError(f"Failed to launch browser session: {error_message}")
+        Safe to call from any running event loop (FastAPI handlers, Jupyter, ...).
+        Use the async session methods (``anavigate``, ``aclick``, ``afill``,
+        ``await_for_selector``, ``await_api_idle``, ``adump_logs``, ``aclose``) on the returned session.
+
+        Args:
+            url: Initial URL to navigate to
+            headless: Whether to run browser in headless mode (default: True)
+            wait_until: When to consider navigation complete (default: "load")
+                       Options: "load", "domcontentloaded", "networkidle"
+            record_flow: Record the session's actions for replay (see BrowserSession.save_flow)
+            record_har_content: Response body policy: "embed" (default), "omit" (headers only)
+                                or "attach" (bodies stored in a .zip archive)
+            record_har_url_filter: Glob string or regex; only matching requests are recorded
+            api_only: Only record likely API requests (skips static assets at capture time)
+            storage_state: Saved cookies/localStorage (file or dict) to start the session logged in
+            storage_state_cache: StorageStateCache reused across runs, keyed by the URL's origin
+            login_url_pattern: Regex for the login page; landing there drops the cached state
+            **playwright_options: Additional Playwright browser launch options.
+
+        Returns:
+            BrowserSession instance ready for navigation and interaction
+
+        Raises:
+            ZAPIValidationError: If URL format is invalid
+            ZAPIError: If browser launch fails
+
+        Example:
+            >>> session = await z.alaunch_browser(url="https://app.example.com")
+            >>> await session.anavigate("https://app.example.com/settings")
+            >>> await session.adump_logs("session.har")
+            >>> await session.aclose()
+        """
+        session = BrowserSession(
+            auth_token=self._auth_token_for_session(),
+            headless=headless,
+            record_flow=record_flow,
+            record_har_content=record_har_content,
+            record_har_url_filter=record_har_url_filter,
+            api_only=api_only,
+            storage_state=storage_state,
+            storage_state_cache=storage_state_cache,
+            login_url_pattern=login_url_pattern,
+            **playwright_options,
+        )
+
+        # Refreshed tokens are pushed into the session's Authorization header
+        self._sessions.add(session)
+
+        try:
+            await session.start(url, wait_until=wait_until)
+        except Exception as e:
+            try:
+                await session._close_async()
+            except Exception:
+                # Ignore cleanup errors, focus on the original error
+                pass
+            raise self._launch_error(url, e)
 
         return session
 
-    def upload_har(self, har_file: str):
+    def replay_flows(
+        self,
+        flows: list[Union[CaptureFlow, str, Path]],
+        output_dir: Union[str, Path],
+        concurrency: int = 4,
+        pace_ms: float = 0,
+        **playwright_options,
+    ) -> list[FlowReplayResult]:
         """
-        Upload a HAR file to the ZAPI API with optional encrypted LLM keys.
+        Replay recorded capture flows headless and in parallel.
 
         Args:
-            har_file: Path to the HAR file to upload
+            flows: CaptureFlow instances or paths to flow files saved with BrowserSession.save_flow()
+            output_dir: Directory receiving one HAR file per flow
+            concurrency: Maximum number of browsers running at once (default: 4)
+            pace_ms: Delay between replayed steps in milliseconds
+            **playwright_options: Additional options (headless, jitter_ms, Playwright launch options)
 
         Returns:
-            Response JSON from the API
+            List of FlowReplayResult, in the same order as ``flows``
 
-        Raises:
-            ZAPIValidationError: If file validation fails
-            ZAPINetworkError: If upload fails due to network issues
-            ZAPIAuthenticationError: If authentication fails
+        Example:
+            >>> session = z.launch_browser(url="https://app.example.com", headless=False, record_flow=True)
+            >>> session.save_flow("flows/dashboard.json")
+            >>> results = z.replay_flows(["flows/dashboard.json"], output_dir="hars/")
         """
-        url = f"{BASE_URL}/v1/api-discovery/upload-file"
+        return replay_flows(
+            flows, self.auth_token, output_dir, concurrency=concurrency, pace_ms=pace_ms, **playwright_options
+        )
 
-        headers = {"Authorization": f"Bearer {self.auth_token}"}
+    async def areplay_flows(
+        self,
+        flows: list[Union[CaptureFlow, str, Path]],
+        output_dir: Union[str, Path],
+        concurrency: int = 4,
+        pace_ms: float = 0,
+        **playwright_options,
+    ) -> list[FlowReplayResult]:
+        """
+        Replay recorded capture flows headless and in parallel (async).
+
+        See ``replay_flows`` for the argument reference.
+        """
+        return await areplay_flows(
+            flows, self.auth_token, output_dir, concurrency=concurrency, pace_ms=pace_ms, **playwright_options
+        )
+
+    def capture_farm(
+        self,
+        db_path: Union[str, Path],
+        results_dir: Union[str, Path],
+        workers: Optional[int] = None,
+        **farm_options,
+    ) -> CaptureFarm:
+        """
+        Create a multi-process capture farm authenticated with this client's token.
+
+        Args:
+            db_path: SQLite job queue database (created if missing, reusable across runs)
+            results_dir: Directory receiving one HAR per completed job
+            workers: Number of worker processes (default: number of CPU cores)
+            **farm_options: Additional CaptureFarm options (settle_ms, session_options, ...)
+
+        Returns:
+            CaptureFarm to queue jobs on and run
+
+        Example:
+            >>> farm = z.capture_farm("captures.db", "hars/", workers=8)
+            >>> farm.add_url("https://app.example.com/dashboard")
+            >>> farm.add_flow("flows/checkout.json")
+            >>> result = farm.run()
+        """
+        return CaptureFarm(self.auth_token, db_path, results_dir, workers=workers, **farm_options)
+
+    @staticmethod
+    def _launch_error(url: str, error: Exception) -> ZAPIError:
+        """
+        Translate a browser initialization failure into a ZAPI exception.
+
+        Args:
+            url: URL the session was launched with
+            error: Original exception raised during initialization
+
+        Returns:
+            ZAPI exception to raise in place of the original error
+        """
+        # Background authentication failures keep their own type
+        if isinstance(error, (AuthError, NetworkError)):
+            return error
+
+        error_message = str(error)
 
-        # Prepare metadata if LLM key is configured
-        metadata = {}
+        # Provide specific error messages for common browser issues
+        if "Cannot navigate to invalid URL" in error_message:
+            return ZAPIValidationError(
+                f"Browser cannot navigate to URL: '{url}'. Please check the URL format and ensure it's accessible."
+            )
+        elif "net::ERR_NAME_NOT_RESOLVED" in error_message:
+            return NetworkError(
+                f"Domain name could not be resolved: '{url}'. "
+                "Please check the URL spelling and your internet connection."
+            )
+        elif "net::ERR_CONNECTION_REFUSED" in error_message:
+            return NetworkError(f"Connection refused to: '{url}'. The server may be down or the URL may be incorrect.")
+        elif "Timeout" in error_message:
+            return NetworkError(
+                f"Timeout while loading: '{url}'. "
+                "The website took too long to respond. Please try again or use a different URL."
+            )
+        else:
+            return ZAPIError(f"Failed to launch browser session: {error_message}")
+
+    def _upload_metadata(self) -> dict:
+        """Build the upload metadata, including the encrypted LLM key if one is configured."""
         if self.has_llm_key():
             metadata = {
                 "byok_encrypted_llm_key": self._encrypted_llm_key,
@@ -423,15 +987,124 @@ class ZAPI:
             if self.email:
                 metadata["user_email"] = self.email
 
-        # Prepare multipart form data with enhanced error handling
-        try:
-            with open(har_file, "rb") as f:
-                files = {"file": (har_file, f, "application/json")}
+        return metadata
+
+    def upload_har(
+        self,
+        har_file: str,
+        progress_callback: Optional[ProgressCallback] = None,
+        compression: Optional[UploadCompression] = None,
+        max_shard_bytes: Optional[int] = None,
+        shard_concurrency: int = 3,
+        filtered: bool = False,
+    ):
+        """
+        Upload a HAR file to the ZAPI API with optional encrypted LLM keys.
 
-                # Add metadata as form data
-                data = {"metadata": json.dumps(metadata)}
+        The file is streamed from disk, so memory use does not grow with the
+        HAR size, and the read timeout scales with the file size. Byte counts
+        of the upload are kept in ``last_upload_stats``.
 
-                response = requests.post(url, headers=headers, files=files, data=data, timeout=60)
+        Args:
+            har_file: Path to the HAR file to upload
+            progress_callback: Optional callable receiving (bytes_sent, total_bytes)
+            compression: Compress the file on the fly: "gzip", "zstd" (requires the
+                         zstandard package) or "auto" (zstd when installed, else gzip).
+                         Files under 64 KB are always sent uncompressed. The codec is
+                         reported in the metadata as ``content_encoding``.
+            max_shard_bytes: Split HAR files larger than this into self-contained HAR
+                             shards of at most this size and upload them in parallel.
+                             Each shard keeps the pages its entries reference.
+            shard_concurrency: Shards uploaded in parallel (default: 3). The next shard
+                               is written while the previous ones upload.
+            filtered: Upload only API-relevant entries (the HarProcessor filter rules).
+                      Entries are filtered as the upload is written, so the next shard
+                      is filtered while the previous ones upload.
+
+        Returns:
+            Response JSON from the API, or a list with the response JSON of every
+            shard when the file was split
+
+        Raises:
+            ZAPIValidationError: If file validation fails
+            ZAPINetworkError: If upload fails due to network issues
+            ZAPIAuthenticationError: If authentication fails
+        """
+        if max_shard_bytes is not None or filtered:
+            if (max_shard_bytes is not None and max_shard_bytes <= 0) or shard_concurrency < 1:
+                raise ZAPIValidationError("max_shard_bytes and shard_concurrency must be positive")
+            try:
+                size = os.path.getsize(har_file)
+            except FileNotFoundError:
+                raise ZAPIValidationError(f"HAR file not found: '{har_file}'")
+            needs_split = max_shard_bytes is not None and size > max_shard_bytes
+            if needs_split or filtered:
+                # Without a split, the filtered entries fit in one shard of the file's size
+                results = self._upload_har_shards(
+                    har_file,
+                    max_shard_bytes if needs_split else max(size, 1),
+                    shard_concurrency,
+                    progress_callback,
+                    compression,
+                    filtered,
+                )
+                return results if needs_split else results[0]
+
+        result, self.last_upload_stats = self._retry_on_unauthorized(
+            lambda: self._upload_har_file(har_file, progress_callback, compression)
+        )
+        print("file uploaded successfully")
+        self._print_upload_summary()
+        return result
+
+    def _print_upload_summary(self) -> None:
+        stats = self.last_upload_stats
+        if stats.content_encoding:
+            print(
+                f"Sent {stats.sent_bytes / 1024 / 1024:.1f} MB for {stats.raw_bytes / 1024 / 1024:.1f} MB of HAR "
+                f"({stats.content_encoding}, {stats.compression_ratio:.1f}x smaller)"
+            )
+        if self.has_llm_key():
+            print(f"Included encrypted key for provider: {self.get_llm_provider()}")
+
+    def _upload_har_file(
+        self,
+        har_file: Union[str, Path],
+        progress_callback: Optional[ProgressCallback],
+        compression: Optional[UploadCompression],
+    ) -> tuple[dict, UploadStats]:
+        """Stream one HAR file to the upload endpoint and return its response JSON and byte counts."""
+        url = f"{BASE_URL}/v1/api-discovery/upload-file"
+
+        headers = {"Authorization": f"Bearer {self.auth_token}"}
+        metadata = self._upload_metadata()
+
+        # Stream multipart form data (metadata field + file) with enhanced error handling
+        try:
+            raw_size = os.path.getsize(har_file)
+            codec = resolve_compression(compression, raw_size)
+            if codec:
+                metadata["content_encoding"] = codec
+                metadata["original_size"] = raw_size
+
+            started = time.monotonic()
+            with StreamingMultipartEncoder.from_path(
+                har_file, {"metadata": json.dumps(metadata)}, progress_callback=progress_callback, compression=codec
+            ) as body:
+                headers["Content-Type"] = body.content_type
+                # Compressed bodies have no length up front and go out with chunked encoding
+                data = body if body.length is not None else iter(body)
+                # A streamed body cannot be replayed, so this call is never retried
+                response = self._transport.post(
+                    url, headers=headers, data=data, timeout=upload_timeout(raw_size), retry=False
+                )
+
+            stats = UploadStats(
+                raw_bytes=raw_size,
+                sent_bytes=body.bytes_read,
+                content_encoding=codec,
+                elapsed_seconds=time.monotonic() - started,
+            )
 
         except FileNotFoundError:
             raise ZAPIValidationError(f"HAR file not found: '{har_file}'")
@@ -452,26 +1125,367 @@ class ZAPI:
                 raise NetworkError(f"Upload failed: HTTP {e.response.status_code}")
         except requests.exceptions.RequestException as e:
             raise NetworkError(f"Upload request failed: {e}")
+        except ValueError as e:
+            # Unknown or unavailable compression codec
+            raise ZAPIValidationError(str(e))
 
         try:
             response.raise_for_status()
-            print("file uploaded successfully")
-            if self.has_llm_key():
-                print(f"Included encrypted key for provider: {self.get_llm_provider()}")
-            return response.json()
+            return response.json(), stats
         except requests.exceptions.HTTPError:
+            if response.status_code == 401:
+                raise AuthError("Upload failed: Invalid or expired authentication token")
+            elif response.status_code == 413:
+                raise ZAPIValidationError(
+                    "HAR file is too large. Pass max_shard_bytes to upload_har() to split it into shards."
+                )
             # This should be caught above, but just in case
             raise ZAPINetworkError(f"Upload failed with status code: {response.status_code}")
         except json.JSONDecodeError:
             raise ZAPIError("Invalid response format from upload service")
 
-    def get_documented_apis(self, page: int = 1, page_size: int = 10):
+    def _upload_har_shards(
+        self,
+        har_file: str,
+        max_shard_bytes: int,
+        shard_concurrency: int,
+        progress_callback: Optional[ProgressCallback],
+        compression: Optional[UploadCompression],
+        filtered: bool = False,
+    ) -> list[dict]:
+        """
+        Split a HAR into shards and upload them on a bounded pool.
+
+        Shards are produced (and, when ``filtered``, filtered) on the calling
+        thread while earlier shards upload, and at most
+        ``shard_concurrency + 1`` shard files exist on disk at once.
+        Progress is reported in shard file bytes, against the size of the
+        shards written so far, which is final once the last shard is queued.
+        """
+        progress_lock = threading.Lock()
+        # Shard file sizes and the bytes of each shard reported sent, scaled to its file size
+        shard_sizes: dict[int, int] = {}
+        shard_sent: dict[int, float] = {}
+        # Caps finished-but-not-yet-uploaded shards so a slow link does not fill the disk
+        slots = threading.BoundedSemaphore(shard_concurrency + 1)
+
+        def _report_progress() -> None:
+            # Caller holds progress_lock; the total grows as shards are written
+            total = sum(shard_sizes.values())
+            progress_callback(min(int(sum(shard_sent.values())), total), total)
+
+        def _shard_progress(index: int) -> Optional[ProgressCallback]:
+            if progress_callback is None:
+                return None
+
+            def _report(sent: int, total: Optional[int]) -> None:
+                # Compressed and multipart bodies count different bytes; use the fraction sent
+                fraction = min(sent / total, 1.0) if total else 0.0
+                with progress_lock:
+                    shard_sent[index] = fraction * shard_sizes[index]
+                    _report_progress()
+
+            return _report
+
+        def _upload_shard(index: int, shard_path: Path) -> tuple[dict, UploadStats]:
+            try:
+                return self._retry_on_unauthorized(
+                    lambda: self._upload_har_file(shard_path, _shard_progress(index), compression)
+                )
+            finally:
+                shard_path.unlink(missing_ok=True)
+                slots.release()
+
+        # Entries seen and skipped by the API filter
+        entry_counts = {"total": 0, "skipped": 0}
+
+        def _keep_entry(entry: dict) -> bool:
+            entry_counts["total"] += 1
+            if HarProcessor.skip_reason(entry):
+                entry_counts["skipped"] += 1
+                return False
+            return True
+
+        started = time.monotonic()
+        futures = []
+        with ExitStack() as stack:
+            shard_dir = stack.enter_context(tempfile.TemporaryDirectory(prefix="zapi-shards-"))
+            pool = stack.enter_context(ThreadPoolExecutor(shard_concurrency))
+            try:
+                shards = iter_har_shards(har_file, max_shard_bytes, shard_dir, _keep_entry if filtered else None)
+                for index, shard_path in enumerate(shards):
+                    with progress_lock:
+                        shard_sizes[index] = shard_path.stat().st_size
+                    slots.acquire()
+                    if any(future.done() and future.exception() for future in futures):
+                        slots.release()
+                        break
+                    futures.append(pool.submit(_upload_shard, index, shard_path))
+            except HarProcessingError as e:
+                for future in futures:
+                    future.cancel()
+                raise ZAPIValidationError(f"Cannot split HAR file: {e}")
+            except OSError as e:
+                for future in futures:
+                    future.cancel()
+                raise ZAPIValidationError(f"Cannot write HAR shards: {e}")
+
+            # Surface the first failure in shard order; later shards are not retried
+            results = [future.result() for future in futures]
+
+        if filtered:
+            print(
+                f"ℹ️  Skipped {entry_counts['skipped']:,} of {entry_counts['total']:,} entries (static assets, non-API)"
+            )
+            if not results:
+                raise ZAPIValidationError(f"No API-relevant entries found in HAR file: '{har_file}'")
+
+        self.last_upload_stats = UploadStats(
+            raw_bytes=sum(stats.raw_bytes for _, stats in results),
+            sent_bytes=sum(stats.sent_bytes for _, stats in results),
+            content_encoding=results[0][1].content_encoding if results else None,
+            elapsed_seconds=time.monotonic() - started,
+        )
+        if progress_callback is not None:
+            with progress_lock:
+                shard_sent.update(shard_sizes)
+                _report_progress()
+        if len(results) == 1:
+            print("file uploaded successfully")
+        else:
+            print(
+                f"file uploaded successfully in {len(results)} shards of up to {max_shard_bytes / 1024 / 1024:.1f} MB"
+            )
+        self._print_upload_summary()
+        return [result for result, _ in results]
+
+    def upload_har_async(
+        self,
+        har_file: Union[str, Path],
+        callback: Optional[UploadJobCallback] = None,
+        compression: Optional[UploadCompression] = None,
+        wait_for_processing: bool = True,
+        processing_timeout: float = 600.0,
+    ) -> UploadJob:
+        """
+        Upload a HAR file in the background and return at once.
+
+        Uploads run on a pool of UPLOAD_JOB_WORKERS threads shared by the
+        instance, so capturing can go on while earlier HARs are uploaded. When
+        the upload response carries a discovery job ID, the job then polls
+        get_upload_status() with exponential backoff until discovery
+        processing completes or fails.
+
+        Args:
+            har_file: Path to the HAR file to upload
+            callback: Called with the job once it completes or fails, on a worker thread
+            compression: Compress the file on the fly (see upload_har)
+            wait_for_processing: Poll discovery status before completing the job
+                                 (default: True); False completes it once uploaded
+            processing_timeout: Seconds to wait for discovery processing (default: 600)
+
+        Returns:
+            An UploadJob; its result() is the final discovery status, or the
+            upload response when processing is not tracked
+        """
+        job = UploadJob(har_file)
+        if callback is not None:
+            job.add_done_callback(callback)
+        future = self._upload_executor().submit(
+            self._run_upload_job, job, compression, wait_for_processing, processing_timeout
+        )
+        future.add_done_callback(lambda task: _fail_cancelled_job(task, job))
+        return job
+
+    def upload_many(
+        self,
+        har_files: Iterable[Union[str, Path]],
+        callback: Optional[UploadJobCallback] = None,
+        **kwargs,
+    ) -> list[UploadJob]:
+        """
+        Start background uploads of several HAR files (see upload_har_async).
+
+        At most UPLOAD_JOB_WORKERS files are uploaded at a time; the others wait
+        in the pool's queue.
+
+        Args:
+            har_files: Paths to the HAR files to upload
+            callback: Called with each job once it completes or fails
+            **kwargs: Passed to upload_har_async
+
+        Returns:
+            One UploadJob per file, in order
+        """
+        return [self.upload_har_async(har_file, callback=callback, **kwargs) for har_file in har_files]
+
+    def get_upload_status(self, job_id: str) -> dict:
+        """
+        Fetch the discovery processing status of an uploaded HAR file.
+
+        Args:
+            job_id: Discovery job ID from the upload response (UploadJob.job_id)
+
+        Returns:
+            Response JSON with the job's ``status``
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails
+        """
+        url = f"{BASE_URL}/v1/api-discovery/status/{job_id}"
+        response = self._authorized_request("GET", url)
+        response.raise_for_status()
+        return response.json()
+
+    def _upload_executor(self) -> ThreadPoolExecutor:
+        """Upload pool of this instance, created on first use."""
+        with self._upload_pool_lock:
+            if self._closed.is_set():
+                raise ZAPIError("This ZAPI instance is closed")
+            if self._upload_pool is None:
+                self._upload_pool = ThreadPoolExecutor(UPLOAD_JOB_WORKERS, thread_name_prefix="zapi-upload")
+                self._status_pool = ThreadPoolExecutor(UPLOAD_JOB_WORKERS, thread_name_prefix="zapi-upload-status")
+            return self._upload_pool
+
+    def _run_upload_job(
+        self,
+        job: UploadJob,
+        compression: Optional[UploadCompression],
+        wait_for_processing: bool,
+        processing_timeout: float,
+    ) -> None:
+        """Upload pool task: send the file, then hand the job over to status polling."""
+        job._set_status(UPLOAD_UPLOADING)
+        try:
+            job.response, job.stats = self._retry_on_unauthorized(
+                lambda: self._upload_har_file(job.har_file, None, compression)
+            )
+        except Exception as e:
+            job._fail(e)
+            return
+
+        if not wait_for_processing or job.job_id is None:
+            job._complete(job.response)
+            return
+        # Polling waits on the status pool, so the upload slot is free for the next file
+        job._set_status(UPLOAD_PROCESSING)
+        try:
+            future = self._status_pool.submit(self._poll_upload_job, job, time.monotonic() + processing_timeout)
+        except RuntimeError:
+            # The status pool was shut down by close()
+            job._fail(ZAPIError(_CLOSED_BEFORE_PROCESSING.format(har_file=job.har_file)))
+            return
+        future.add_done_callback(lambda task: _fail_cancelled_job(task, job))
+
+    def _poll_upload_job(self, job: UploadJob, deadline: float) -> None:
+        """Status pool task: poll discovery status with backoff until it is final or the deadline passes."""
+        attempt = 0
+        try:
+            while True:
+                attempt += 1
+                if self._closed.wait(min(status_poll_delay(attempt), max(0.0, deadline - time.monotonic()))):
+                    raise ZAPIError(_CLOSED_BEFORE_PROCESSING.format(har_file=job.har_file))
+                try:
+                    job.processing_status = self.get_upload_status(job.job_id)
+                except requests.exceptions.HTTPError as e:
+                    if e.response is not None and e.response.status_code == 404:
+                        # Processing of this upload is not tracked
+                        job._complete(job.response)
+                        return
+                    raise
+
+                state = discovery_state(job.processing_status)
+                if state == UPLOAD_COMPLETED:
+                    job._complete(job.processing_status)
+                    return
+                if state == UPLOAD_FAILED:
+                    detail = job.processing_status.get("error") or job.processing_status.get("message") or "no details"
+                    raise ZAPIError(f"Discovery processing of '{job.har_file}' failed: {detail}")
+                if time.monotonic() >= deadline:
+                    raise ZAPIError(
+                        f"Discovery processing of '{job.har_file}' did not finish in time (job {job.job_id})"
+                    )
+        except requests.exceptions.RequestException as e:
+            job._fail(NetworkError(f"Polling discovery status of '{job.har_file}' failed: {e}"))
+        except Exception as e:
+            job._fail(e)
+
+    def upload_har_resumable(
+        self,
+        har_file: str,
+        part_size: int = UPLOAD_PART_SIZE,
+        concurrency: int = 4,
+        progress_callback: Optional[ProgressCallback] = None,
+    ):
+        """
+        Upload a large HAR file in parts that survive dropped connections.
+
+        Parts are uploaded in parallel and every acknowledged part is recorded
+        in ``<har_file>.upload-state.json``. If the upload fails, calling this
+        again with the same file resumes from the parts already sent.
+
+        Args:
+            har_file: Path to the HAR file to upload
+            part_size: Bytes per part (default: 8 MB)
+            concurrency: Parts uploaded in parallel (default: 4)
+            progress_callback: Optional callable receiving (bytes_acknowledged, total_bytes)
+
+        Returns:
+            Response JSON from the API
+
+        Raises:
+            ZAPIValidationError: If file validation fails
+            ZAPINetworkError: If upload fails due to network issues (the upload can be resumed)
+            ZAPIAuthenticationError: If authentication fails
+        """
+
+        def _upload(token: str) -> dict:
+            uploader = ResumableUploader(
+                BASE_URL,
+                token,
+                part_size=part_size,
+                concurrency=concurrency,
+                progress_callback=progress_callback,
+                session=self._transport.session,
+            )
+            return uploader.upload(har_file, metadata=self._upload_metadata(), filename=har_file)
+
+        try:
+            token = self.auth_token
+            try:
+                result = _upload(token)
+            except ResumableUploadError as e:
+                if e.status_code != 401:
+                    raise
+                # Resumes from the parts already acknowledged
+                result = _upload(self.refresh_auth_token(stale_token=token))
+        except FileNotFoundError:
+            raise ZAPIValidationError(f"HAR file not found: '{har_file}'")
+        except PermissionError:
+            raise ZAPIValidationError(f"Permission denied reading HAR file: '{har_file}'")
+        except ResumableUploadError as e:
+            if e.status_code == 401:
+                raise AuthError("Upload failed: Invalid or expired authentication token")
+            elif e.status_code == 413:
+                raise ZAPIValidationError("Upload part is too large. Try a smaller part_size.")
+            elif e.status_code == 400:
+                raise ZAPIValidationError(f"Upload rejected: {e}")
+            raise NetworkError(f"Upload failed, run upload_har_resumable again to resume: {e}")
+        except requests.exceptions.RequestException as e:
+            raise NetworkError(f"Upload failed, run upload_har_resumable again to resume: {e}")
+
+        print("file uploaded successfully")
+        return result
+
+    def get_documented_apis(self, page: int = 1, page_size: int = 10, updated_since: Optional[str] = None):
         """
         Fetch the list of documented APIs with pagination support.
 
         Args:
             page: Page number to fetch (default: 1)
             page_size: Number of items per page (default: 10)
+            updated_since: Sync cursor from an earlier listing; only APIs changed
+                           since then are returned, deleted ones flagged ``deleted``
 
         Returns:
             Response JSON containing the list of documented APIs
@@ -480,9 +1494,286 @@ class ZAPI:
             requests.exceptions.RequestException: If the request fails
         """
         url = f"{BASE_URL}/v1/tools/apis"
-        headers = {"Authorization": f"Bearer {self.auth_token}"}
         params = {"page": page, "page_size": page_size}
+        if updated_since is not None:
+            params["updated_since"] = updated_since
 
-        response = requests.get(url, headers=headers, params=params)
+        response = self._authorized_request("GET", url, params=params)
         response.raise_for_status()
         return response.json()
+
+    def iter_documented_apis(
+        self, page_size: int = CATALOG_PAGE_SIZE, concurrency: int = CATALOG_CONCURRENCY
+    ) -> Iterator[dict]:
+        """
+        Iterate over every documented API, in catalog order.
+
+        The catalog size is read from the first page; the remaining pages are
+        then fetched ``concurrency`` at a time, a few pages ahead of the
+        consumer, while items are yielded as soon as their page arrives. If
+        the listing does not report its size, pages are read one by one until
+        a short page.
+
+        Args:
+            page_size: Items per request (default: 100)
+            concurrency: Pages fetched in parallel (default: 4)
+
+        Yields:
+            API descriptions, as returned in the listing's ``items``
+
+        Raises:
+            requests.exceptions.RequestException: If a page request fails
+        """
+        first = self.get_documented_apis(page=1, page_size=page_size)
+        items = first.get("items", [])
+        yield from items
+
+        pages = total_pages(first, page_size)
+        if pages is None:
+            page = 1
+            while len(items) >= page_size:
+                page += 1
+                items = self.get_documented_apis(page=page, page_size=page_size).get("items", [])
+                yield from items
+            return
+
+        pending: deque[Future] = deque()
+        next_page = 2
+        with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="zapi-catalog") as pool:
+            try:
+                while next_page <= pages or pending:
+                    # Keep the prefetch window full, then hand out the oldest page
+                    while next_page <= pages and len(pending) < max(1, concurrency):
+                        pending.append(pool.submit(self.get_documented_apis, next_page, page_size))
+                        next_page += 1
+                    yield from pending.popleft().result().get("items", [])
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def get_all_documented_apis(
+        self, page_size: int = CATALOG_PAGE_SIZE, concurrency: int = CATALOG_CONCURRENCY
+    ) -> list[dict]:
+        """
+        Fetch the whole documented API catalog (see iter_documented_apis).
+
+        Returns:
+            List of API descriptions in catalog order
+        """
+        return list(self.iter_documented_apis(page_size=page_size, concurrency=concurrency))
+
+    def get_catalog(self, refresh: bool = False) -> list[dict]:
+        """
+        Return the documented API catalog, served from the catalog cache.
+
+        A snapshot within the cache TTL is returned without contacting the
+        server. An older one is brought up to date with sync_catalog(). Within
+        the cache's stale-while-revalidate window, the stale snapshot is
+        returned at once and synced on a background thread.
+
+        Args:
+            refresh: Sync now, even if the snapshot is fresh
+
+        Returns:
+            List of API descriptions in catalog order
+
+        Raises:
+            requests.exceptions.RequestException: If a page request fails
+        """
+        if self._catalog_cache is None:
+            return self.get_all_documented_apis()
+
+        snapshot = self._catalog_cache.load(self._catalog_key())
+        if snapshot is not None and not refresh:
+            if self._catalog_cache.is_fresh(snapshot):
+                return snapshot.apis
+            if self._catalog_cache.can_serve_stale(snapshot):
+                self._sync_catalog_in_background()
+                return snapshot.apis
+        return self._sync_catalog()[0].apis
+
+    def sync_catalog(self) -> CatalogDelta:
+        """
+        Bring the cached API catalog up to date and report what changed.
+
+        If the server returned a sync cursor with the last listing, only the
+        APIs changed since then are requested (``updated_since``) and merged
+        into the local catalog, including deletions. Otherwise every page is
+        revalidated with conditional requests and the catalogs are compared
+        item by item with content hashes. Without a cached catalog, every API
+        is reported as added.
+
+        Returns:
+            The APIs added, updated and removed by this sync
+
+        Raises:
+            ZAPIValidationError: If the catalog cache is disabled
+            requests.exceptions.RequestException: If a page request fails
+        """
+        if self._catalog_cache is None:
+            raise ZAPIValidationError(
+                "sync_catalog() needs the catalog cache, which was disabled (catalog_cache=False)"
+            )
+        return self._sync_catalog()[1]
+
+    def _catalog_key(self) -> str:
+        """Catalog cache key of this client."""
+        return CatalogCache.key_for(BASE_URL, self.client_id)
+
+    def _fetch_catalog_page(self, page: int, page_size: int, cached: Optional[dict] = None) -> tuple[dict, bool]:
+        """
+        Fetch one listing page, conditionally if a cached copy is given.
+
+        Args:
+            page: Page number
+            page_size: Items per page
+            cached: Stored copy of the page, whose validators are sent with the request
+
+        Returns:
+            (page, modified): the page's items, size, sync cursor and validators,
+            and False when the server answered 304 and the cached copy was reused
+        """
+        headers = {}
+        if cached is not None:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        url = f"{BASE_URL}/v1/tools/apis"
+        params = {"page": page, "page_size": page_size}
+        response = self._authorized_request("GET", url, params=params, headers=headers)
+        if response.status_code == 304 and cached is not None:
+            return cached, False
+        response.raise_for_status()
+
+        body = response.json()
+        fetched = {
+            "items": body.get("items", []),
+            "total_pages": total_pages(body, page_size),
+            "cursor": catalog_cursor(body),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+        return fetched, True
+
+    def _sync_catalog(self) -> tuple[CatalogSnapshot, CatalogDelta]:
+        """
+        Sync the cached catalog (see sync_catalog) and store the result.
+
+        Syncs run one at a time; each starts from the latest stored snapshot.
+
+        Returns:
+            (snapshot, delta): the up-to-date snapshot and what changed
+        """
+        with self._catalog_sync_lock:
+            key = self._catalog_key()
+            snapshot = self._catalog_cache.load(key)
+
+            updated = None
+            if snapshot is not None and snapshot.cursor is not None:
+                try:
+                    updated, delta = self._apply_catalog_delta(snapshot)
+                except requests.exceptions.HTTPError as e:
+                    # Unknown or expired cursor: fall back to a full revalidation
+                    if e.response is None or e.response.status_code not in (400, 410, 422):
+                        raise
+                    print(f"ℹ️  Delta listing rejected ({e.response.status_code}), revalidating the whole API catalog")
+            if updated is None:
+                updated = self._revalidate_catalog(snapshot)
+                delta = diff_catalog(snapshot.apis if snapshot else [], updated.apis)
+
+            if snapshot is not None and delta.changed:
+                print(f"ℹ️  API catalog synced: {delta}")
+            try:
+                self._catalog_cache.save(key, updated)
+            except OSError as e:
+                print(f"⚠️  Could not write the API catalog cache: {e}")
+            return updated, delta
+
+    def _apply_catalog_delta(self, snapshot: CatalogSnapshot) -> tuple[CatalogSnapshot, CatalogDelta]:
+        """
+        Merge the APIs changed since the snapshot's cursor into it.
+
+        Returns:
+            (snapshot, delta): the merged snapshot and what changed
+
+        Raises:
+            requests.exceptions.HTTPError: If the server rejects the cursor
+        """
+        page_size = snapshot.page_size
+        changed: list[dict] = []
+        deleted_keys: list[str] = []
+        cursor = pages = None
+        page = 1
+        while True:
+            body = self.get_documented_apis(page=page, page_size=page_size, updated_since=snapshot.cursor)
+            if page == 1:
+                cursor = catalog_cursor(body)
+                pages = total_pages(body, page_size)
+            items = body.get("items", [])
+            changed.extend(items)
+            deleted_keys.extend(str(key) for key in body.get("deleted_ids") or [])
+            if (page >= pages) if pages is not None else len(items) < page_size:
+                break
+            page += 1
+
+        apis, delta = merge_catalog(snapshot.apis, changed, deleted_keys)
+        if delta.changed:
+            # Page boundaries and validators no longer match the server's; the cursor replaces them
+            chunks = [apis[i : i + page_size] for i in range(0, len(apis), page_size)] or [[]]
+            new_pages = [{"items": chunk} for chunk in chunks]
+        else:
+            new_pages = snapshot.pages
+        merged = CatalogSnapshot(
+            saved_at=time.time(), page_size=page_size, pages=new_pages, cursor=cursor or snapshot.cursor
+        )
+        return merged, delta
+
+    def _revalidate_catalog(self, snapshot: Optional[CatalogSnapshot]) -> CatalogSnapshot:
+        """
+        Revalidate every page of a cached catalog.
+
+        Page 1 tells how many pages the catalog has; the others are then
+        revalidated in parallel. Without a snapshot, every page is downloaded.
+
+        Returns:
+            The up-to-date snapshot
+        """
+        page_size = snapshot.page_size if snapshot else CATALOG_PAGE_SIZE
+        old_pages = snapshot.pages if snapshot else []
+
+        def fetch(page: int) -> dict:
+            cached = old_pages[page - 1] if page <= len(old_pages) else None
+            return self._fetch_catalog_page(page, page_size, cached)[0]
+
+        fetched = [fetch(1)]
+        pages = fetched[0].get("total_pages")
+        if pages is None:
+            # The listing does not report its size: read on until a short page
+            while len(fetched[-1]["items"]) >= page_size:
+                fetched.append(fetch(len(fetched) + 1))
+        elif pages > 1:
+            with ThreadPoolExecutor(max_workers=CATALOG_CONCURRENCY, thread_name_prefix="zapi-catalog") as pool:
+                fetched.extend(pool.map(fetch, range(2, pages + 1)))
+
+        return CatalogSnapshot(
+            saved_at=time.time(), page_size=page_size, pages=fetched, cursor=fetched[0].get("cursor")
+        )
+
+    def _sync_catalog_in_background(self) -> None:
+        """Sync the cached catalog on a daemon thread, unless one is already running."""
+        with self._catalog_lock:
+            if self._catalog_thread is not None and self._catalog_thread.is_alive():
+                return
+            self._catalog_thread = threading.Thread(
+                target=self._sync_catalog_quietly, name="zapi-catalog-refresh", daemon=True
+            )
+            self._catalog_thread.start()
+
+    def _sync_catalog_quietly(self) -> None:
+        """Background sync: failures keep the stale snapshot and are only reported."""
+        try:
+            self._sync_catalog()
+        except (ZAPIError, requests.exceptions.RequestException) as e:
+            print(f"⚠️  Background API catalog refresh failed: {e}")
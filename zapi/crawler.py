@@ -0,0 +1,450 @@
+"""Same-origin crawler that drives a BrowserSession to maximise API coverage."""
+
+import asyncio
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Optional, Union
+from urllib.parse import parse_qsl, urldefrag, urljoin, urlparse, urlunparse
+
+from playwright.async_api import Page, Request
+
+from .har_processing import HarProcessor
+from .session import API_RESOURCE_TYPES, BrowserSession, BrowserSessionError
+
+# Links that would end the authenticated session or trigger destructive actions
+DEFAULT_EXCLUDE_PATTERNS = [
+    re.compile(r"log[-_]?out|sign[-_]?out|log[-_]?off", re.IGNORECASE),
+    re.compile(r"/(delete|remove|destroy)(/|$|\?)", re.IGNORECASE),
+]
+
+# Labels of controls the click probe never presses: they end the session, change or
+# delete data, or spend money
+DEFAULT_CLICK_EXCLUDE_PATTERN = re.compile(
+    r"\b(log\s*(out|off)|sign\s*out|delete|remove|destroy|archive|cancel|reset|disable|deactivate|"
+    r"pay|purchase|buy|checkout|order|submit|send|confirm|save|apply|publish|invite)\b",
+    re.IGNORECASE,
+)
+
+# How long the click probe waits for one control to accept a click
+_PROBE_CLICK_TIMEOUT_MS = 2000
+
+# Path segments that identify a specific resource rather than a route
+_SEGMENT_TEMPLATES = [
+    (re.compile(r"^\d+$"), "{id}"),
+    (re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.IGNORECASE), "{uuid}"),
+    (re.compile(r"^[0-9a-f]{16,}$", re.IGNORECASE), "{hash}"),
+    (re.compile(r"^(?=.*\d)(?=.*[A-Za-z])[A-Za-z0-9_-]{20,}$"), "{token}"),
+]
+
+# Collects navigable targets: anchors plus common SPA router attributes
+_DISCOVER_LINKS_SCRIPT = """
+() => {
+  const urls = new Set();
+  const attrs = ["href", "data-href", "data-url", "data-link", "routerlink", "ng-reflect-router-link"];
+  const selector = attrs.map((attr) => `[${attr}]`).join(",");
+  for (const el of document.querySelectorAll(selector)) {
+    if (el.closest("[aria-disabled='true'], [disabled]")) continue;
+    for (const attr of attrs) {
+      const value = el.getAttribute(attr);
+      if (!value || value.startsWith("javascript:") || value.startsWith("mailto:") || value.startsWith("tel:")) continue;
+      try {
+        urls.add(new URL(value, document.baseURI).href);
+      } catch (e) {}
+    }
+  }
+  return Array.from(urls);
+}
+"""
+
+# Marks the clickable controls that are not links and returns their labels, in document
+# order. Controls inside forms are left out: pressing them submits data. Re-running it on
+# the same page gives the same IDs, so a probe can resume after the page was reloaded.
+_PROBE_TARGETS_SCRIPT = """
+() => {
+  const selector = "button, summary, [role='button'], [role='tab'], [role='menuitem'], [role='link'], [onclick]";
+  const targets = [];
+  for (const el of document.querySelectorAll(selector)) {
+    if (targets.length >= 200) break;
+    if (el.matches("a[href]") || el.closest("form, [aria-disabled='true'], [disabled]")) continue;
+    if (el.matches("[type='submit'], [type='reset']")) continue;
+    const rect = el.getBoundingClientRect();
+    if (!rect.width || !rect.height) continue;
+    const id = String(targets.length);
+    el.setAttribute("data-zapi-probe", id);
+    const label = (el.innerText || el.getAttribute("aria-label") || el.getAttribute("title") || "").trim();
+    targets.push({ id, label: label.slice(0, 100) });
+  }
+  return targets;
+}
+"""
+
+# Records the routes a single-page app navigates to through the History API or the hash
+_HISTORY_HOOK_SCRIPT = """
+() => {
+  if (window.__zapiRoutes) return;
+  window.__zapiRoutes = [];
+  for (const name of ["pushState", "replaceState"]) {
+    const original = history[name];
+    history[name] = function (state, title, url) {
+      if (url != null) {
+        try {
+          window.__zapiRoutes.push(new URL(url, document.baseURI).href);
+        } catch (e) {}
+      }
+      return original.apply(this, arguments);
+    };
+  }
+  window.addEventListener("hashchange", () => window.__zapiRoutes.push(location.href));
+}
+"""
+
+
+def template_url(url: str) -> str:
+    """
+    Reduce a URL to a route template used to deduplicate crawl targets and API endpoints.
+
+    Resource identifiers in the path become placeholders ("/users/42" -> "/users/{id}"),
+    query values are dropped (keys kept, sorted) and plain fragments are removed.
+    Hash-based SPA routes ("#/orders/7") are kept and templated like paths.
+
+    Args:
+        url: Absolute URL
+
+    Returns:
+        Templated URL string
+    """
+    parsed = urlparse(url)
+
+    def _template_path(path: str) -> str:
+        segments = []
+        for segment in path.split("/"):
+            for pattern, placeholder in _SEGMENT_TEMPLATES:
+                if pattern.match(segment):
+                    segment = placeholder
+                    break
+            segments.append(segment)
+        return "/".join(segments)
+
+    query_keys = sorted({key for key, _ in parse_qsl(parsed.query, keep_blank_values=True)})
+    query = "&".join(query_keys)
+
+    fragment = ""
+    if parsed.fragment.startswith(("/", "!/")):
+        fragment = _template_path(parsed.fragment)
+
+    return urlunparse(
+        (parsed.scheme.lower(), parsed.netloc.lower(), _template_path(parsed.path) or "/", "", query, fragment)
+    )
+
+
+@dataclass
+class CrawlResult:
+    """Summary of a crawl run."""
+
+    pages_visited: int
+    pages_failed: int
+    frontier_remaining: int
+    elapsed_seconds: float
+    api_endpoints: list[str] = field(default_factory=list)
+    failed_urls: dict[str, str] = field(default_factory=dict)
+    clicks_probed: int = 0
+
+    @property
+    def endpoints_per_minute(self) -> float:
+        """Distinct API endpoints captured per minute of browser time."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return len(self.api_endpoints) / (self.elapsed_seconds / 60)
+
+
+class SameOriginCrawler:
+    """
+    Breadth-first crawler that visits same-origin routes in concurrent tabs.
+
+    Pages are opened in the session's browser context, so every request they
+    make lands in the session HAR. The frontier is deduplicated by templated
+    URL, which keeps the crawler from visiting "/users/1", "/users/2", ... and
+    spends the page budget on routes likely to expose new API endpoints.
+
+    Links come from anchors and SPA router attributes. With ``probe_clicks``,
+    the crawler also clicks buttons, tabs, menu items and ``onclick``
+    elements that are not links. Their API calls are captured, and the
+    routes they open are added to the frontier: a changed URL, a History API
+    pushState/replaceState, a hash change or a popup. Probing is opt-in
+    because a click can change data. Controls inside forms and controls
+    whose label matches DEFAULT_CLICK_EXCLUDE_PATTERN or ``exclude_patterns``
+    are never pressed, confirm() dialogs are dismissed, and the session's
+    own page is never clicked.
+    """
+
+    def __init__(
+        self,
+        session: BrowserSession,
+        max_depth: int = 3,
+        max_pages: int = 50,
+        concurrency: int = 3,
+        max_seconds: Optional[float] = None,
+        allowed_origins: Optional[list[str]] = None,
+        exclude_patterns: Optional[list[Union[str, re.Pattern]]] = None,
+        settle_ms: float = 5000,
+        idle_ms: float = 500,
+        wait_until: str = "domcontentloaded",
+        page_timeout_ms: float = 30000,
+        probe_clicks: int = 0,
+    ):
+        """
+        Initialize the crawler.
+
+        Args:
+            session: Initialized BrowserSession to crawl with
+            max_depth: Maximum link depth from the start URL (default: 3)
+            max_pages: Maximum number of pages to visit (default: 50)
+            concurrency: Number of tabs crawling in parallel (default: 3)
+            max_seconds: Optional wall-clock budget for the whole crawl
+            allowed_origins: Extra origins (e.g. "https://app.example.com") treated as same-origin
+            exclude_patterns: Regexes for URLs that must never be visited. Defaults to
+                              logout/delete style links.
+            settle_ms: Maximum time to let a page's API calls finish after navigation
+            idle_ms: Quiet window after which a page's API traffic counts as finished
+            wait_until: Navigation completion event for each page (default: "domcontentloaded")
+            page_timeout_ms: Navigation timeout per page in milliseconds
+            probe_clicks: Maximum number of non-link controls clicked on each visited page
+                          to trigger their API calls and find routes they navigate to
+                          (default: 0, links only)
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if probe_clicks < 0:
+            raise ValueError("probe_clicks cannot be negative")
+
+        self.session = session
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.concurrency = concurrency
+        self.max_seconds = max_seconds
+        self.allowed_origins = {self._origin(origin) for origin in allowed_origins or []}
+        self.exclude_patterns = [
+            re.compile(pattern) if isinstance(pattern, str) else pattern
+            for pattern in (DEFAULT_EXCLUDE_PATTERNS if exclude_patterns is None else exclude_patterns)
+        ]
+        self.settle_ms = settle_ms
+        self.idle_ms = idle_ms
+        self.wait_until = wait_until
+        self.page_timeout_ms = page_timeout_ms
+        self.probe_clicks = probe_clicks
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        parsed = urlparse(url)
+        return f"{parsed.scheme.lower()}://{parsed.netloc.lower()}"
+
+    def _should_visit(self, url: str) -> bool:
+        """Check the same-origin, static asset and exclusion rules for a discovered URL."""
+        parsed = urlparse(url)
+        if parsed.scheme not in ("http", "https"):
+            return False
+        if self._origin(url) not in self.allowed_origins:
+            return False
+        if HarProcessor.DENY_EXTENSIONS.search(parsed.path) or parsed.path.lower().endswith(".pdf"):
+            return False
+        return not any(pattern.search(url) for pattern in self.exclude_patterns)
+
+    def _is_unsafe_click(self, label: str) -> bool:
+        """True if a control with this label may end the session or change data, and must not be clicked."""
+        return bool(DEFAULT_CLICK_EXCLUDE_PATTERN.search(label)) or any(
+            pattern.search(label) for pattern in self.exclude_patterns
+        )
+
+    @staticmethod
+    def _normalize(url: str, base: str) -> str:
+        """Resolve a link and drop plain fragments, keeping hash-based SPA routes."""
+        absolute = urljoin(base, url)
+        without_fragment, fragment = urldefrag(absolute)
+        if fragment.startswith(("/", "!/")):
+            return f"{without_fragment}#{fragment}"
+        return without_fragment
+
+    async def acrawl(self, start_url: Optional[str] = None) -> CrawlResult:
+        """
+        Crawl from ``start_url`` (default: the session's current page).
+
+        Args:
+            start_url: URL to start from
+
+        Returns:
+            CrawlResult with visit counts and the distinct API endpoints observed
+
+        Raises:
+            BrowserSessionError: If the session is not initialized
+        """
+        context = self.session._context
+        if not context:
+            raise BrowserSessionError("Browser session not initialized.")
+
+        start_url = start_url or (self.session._page.url if self.session._page else None)
+        if not start_url or not start_url.startswith(("http://", "https://")):
+            raise BrowserSessionError("Crawler needs an http(s) start URL or a session that has navigated to one.")
+
+        self.allowed_origins.add(self._origin(start_url))
+
+        started = time.monotonic()
+        deadline = started + self.max_seconds if self.max_seconds else None
+        frontier: asyncio.Queue = asyncio.Queue()
+        seen_routes: set[str] = set()
+        endpoints: dict[str, None] = {}
+        failed_urls: dict[str, str] = {}
+        visited = 0
+        over_budget = 0
+        clicks_probed = 0
+
+        def _on_request(request: Request) -> None:
+            if request.resource_type in API_RESOURCE_TYPES:
+                endpoints.setdefault(f"{request.method} {template_url(request.url)}", None)
+
+        def _enqueue(url: str, depth: int) -> None:
+            route = template_url(url)
+            if route in seen_routes:
+                return
+            seen_routes.add(route)
+            frontier.put_nowait((url, depth))
+
+        def _enqueue_links(links: list[str], base: str, depth: int) -> None:
+            if depth >= self.max_depth:
+                return
+            for link in links:
+                link = self._normalize(link, base)
+                if self._should_visit(link):
+                    _enqueue(link, depth + 1)
+
+        async def _discover(page: Page, depth: int) -> None:
+            if depth < self.max_depth:
+                _enqueue_links(await page.evaluate(_DISCOVER_LINKS_SCRIPT), page.url, depth)
+
+        async def _settle(page: Page) -> None:
+            if self.settle_ms:
+                # Move on as soon as this tab's API calls have gone quiet
+                await self.session._api_idle_async(
+                    idle_ms=min(self.idle_ms, self.settle_ms), max_ms=self.settle_ms, page=page
+                )
+
+        async def _probe(page: Page, depth: int) -> None:
+            nonlocal clicks_probed
+            page_url = page.url
+            targets = [
+                target
+                for target in await page.evaluate(_PROBE_TARGETS_SCRIPT)
+                if not self._is_unsafe_click(target["label"])
+            ][: self.probe_clicks]
+            popups: list[Page] = []
+            on_popup = popups.append
+            page.on("popup", on_popup)
+            try:
+                for target in targets:
+                    if deadline and time.monotonic() >= deadline:
+                        break
+                    if page.url != page_url:
+                        # The last click left the page: reload it and mark its controls again
+                        await page.goto(page_url, wait_until=self.wait_until, timeout=self.page_timeout_ms)
+                        await page.evaluate(_PROBE_TARGETS_SCRIPT)
+                    await page.evaluate(_HISTORY_HOOK_SCRIPT)
+                    try:
+                        await page.click(f'[data-zapi-probe="{target["id"]}"]', timeout=_PROBE_CLICK_TIMEOUT_MS)
+                    except Exception:
+                        # Covered, detached or re-rendered since it was marked
+                        continue
+                    clicks_probed += 1
+                    await _settle(page)
+                    routes = [page.url]
+                    try:
+                        routes.extend(await page.evaluate("() => window.__zapiRoutes || []"))
+                    except Exception:
+                        # The click started a full navigation that is still loading
+                        pass
+                    _enqueue_links([route for route in routes if route != page_url], page_url, depth)
+            finally:
+                page.remove_listener("popup", on_popup)
+                for popup in popups:
+                    _enqueue_links([popup.url], page_url, depth)
+                    try:
+                        await popup.close()
+                    except Exception:
+                        pass
+
+        async def _visit(page: Page, url: str, depth: int) -> None:
+            await page.goto(url, wait_until=self.wait_until, timeout=self.page_timeout_ms)
+            await _settle(page)
+            await _discover(page, depth)
+            if self.probe_clicks:
+                await _probe(page, depth)
+
+        async def _worker(page: Page) -> None:
+            nonlocal visited, over_budget
+            try:
+                while True:
+                    url, depth = await frontier.get()
+                    try:
+                        if visited >= self.max_pages or (deadline and time.monotonic() >= deadline):
+                            over_budget += 1
+                            continue
+                        visited += 1
+                        await _visit(page, url, depth)
+                    except Exception as e:
+                        failed_urls[url] = str(e)
+                    finally:
+                        frontier.task_done()
+            finally:
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+
+        context.on("request", _on_request)
+        current_page = self.session._page
+        if current_page is not None and current_page.url == start_url:
+            # Already loaded: harvest its links instead of visiting it again
+            seen_routes.add(template_url(self._normalize(start_url, start_url)))
+            visited += 1
+            try:
+                await _discover(current_page, 0)
+            except Exception as e:
+                failed_urls[start_url] = str(e)
+        else:
+            _enqueue(self._normalize(start_url, start_url), 0)
+
+        try:
+            tabs = [await self.session._new_page_async() for _ in range(self.concurrency)]
+        except Exception:
+            context.remove_listener("request", _on_request)
+            raise
+        workers = [asyncio.create_task(_worker(tab)) for tab in tabs]
+        try:
+            if not frontier.empty():
+                await frontier.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            context.remove_listener("request", _on_request)
+
+        return CrawlResult(
+            pages_visited=visited - len(failed_urls),
+            pages_failed=len(failed_urls),
+            frontier_remaining=over_budget,
+            elapsed_seconds=time.monotonic() - started,
+            api_endpoints=list(endpoints),
+            failed_urls=failed_urls,
+            clicks_probed=clicks_probed,
+        )
+
+    def crawl(self, start_url: Optional[str] = None) -> CrawlResult:
+        """
+        Crawl from ``start_url`` (synchronous wrapper around ``acrawl``).
+
+        Args:
+            start_url: URL to start from (default: the session's current page)
+
+        Returns:
+            CrawlResult with visit counts and the distinct API endpoints observed
+        """
+        return self.session._run_sync(self.acrawl(start_url))
@@ -0,0 +1,473 @@
+"""Multi-process capture farm backed by a durable SQLite job queue."""
+
+import asyncio
+import multiprocessing
+import os
+import random
+import socket
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from .flows import CaptureFlow, areplay_flow
+from .session import BrowserSession
+
+# Job lifecycle states stored in the queue
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS capture_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    target TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    lease_expires_at REAL,
+    worker TEXT,
+    har_path TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS capture_jobs_claim ON capture_jobs (status, available_at);
+"""
+
+
+class CaptureFarmError(Exception):
+    """Base exception for capture farm errors."""
+
+    pass
+
+
+@dataclass
+class CaptureJob:
+    """A capture job as stored in the queue."""
+
+    id: int
+    kind: str
+    target: str
+    status: str
+    attempts: int
+    max_attempts: int
+    har_path: Optional[str] = None
+    error: Optional[str] = None
+
+
+class CaptureJobQueue:
+    """
+    Durable queue of capture jobs in a SQLite database (WAL mode).
+
+    Workers claim jobs with a lease. A job whose lease expires (its worker
+    crashed or hung) goes back to the queue, so no job is lost with a worker.
+    Every claim counts as an attempt; failed attempts are retried with
+    exponential backoff and jitter until ``max_attempts`` is reached.
+    """
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        backoff_base_seconds: float = 5.0,
+        backoff_max_seconds: float = 300.0,
+    ):
+        """
+        Open (and create if needed) the queue database.
+
+        Args:
+            db_path: SQLite database file
+            backoff_base_seconds: Delay before the first retry; doubles on every attempt
+            backoff_max_seconds: Upper bound on the retry delay
+        """
+        self.db_path = Path(db_path)
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def _add(self, kind: str, target: str, max_attempts: int) -> int:
+        if max_attempts < 1:
+            raise CaptureFarmError("max_attempts must be at least 1")
+        now = time.time()
+        cursor = self._conn.execute(
+            "INSERT INTO capture_jobs (kind, target, max_attempts, available_at, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (kind, target, max_attempts, now, now, now),
+        )
+        return cursor.lastrowid
+
+    def add_url(self, url: str, max_attempts: int = 3) -> int:
+        """
+        Queue a capture of a single URL.
+
+        Returns:
+            Job id
+        """
+        if not url.startswith(("http://", "https://")):
+            raise CaptureFarmError(f"Invalid capture URL: '{url}'")
+        return self._add("url", url, max_attempts)
+
+    def add_flow(self, flow_path: Union[str, Path], max_attempts: int = 3) -> int:
+        """
+        Queue a replay of a flow file saved with BrowserSession.save_flow().
+
+        Returns:
+            Job id
+        """
+        flow_path = Path(flow_path)
+        if not flow_path.exists():
+            raise CaptureFarmError(f"Flow file not found: '{flow_path}'")
+        return self._add("flow", str(flow_path.resolve()), max_attempts)
+
+    @staticmethod
+    def _to_job(row: sqlite3.Row) -> CaptureJob:
+        return CaptureJob(
+            id=row["id"],
+            kind=row["kind"],
+            target=row["target"],
+            status=row["status"],
+            attempts=row["attempts"],
+            max_attempts=row["max_attempts"],
+            har_path=row["har_path"],
+            error=row["error"],
+        )
+
+    def claim(self, worker: str, lease_seconds: float) -> Optional[CaptureJob]:
+        """
+        Lease the next available job to ``worker``.
+
+        Expired leases are recovered first: their jobs become available again,
+        or fail once they have used up their attempts.
+
+        Returns:
+            The claimed job, or None when nothing is available right now
+        """
+        now = time.time()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute(
+                "UPDATE capture_jobs SET status = ?, error = ?, worker = NULL, updated_at = ? "
+                "WHERE status = ? AND lease_expires_at < ? AND attempts >= max_attempts",
+                (JOB_FAILED, "Lease expired: worker crashed or timed out", now, JOB_RUNNING, now),
+            )
+            self._conn.execute(
+                "UPDATE capture_jobs SET status = ?, available_at = ?, worker = NULL, updated_at = ? "
+                "WHERE status = ? AND lease_expires_at < ?",
+                (JOB_PENDING, now, now, JOB_RUNNING, now),
+            )
+            row = self._conn.execute(
+                "SELECT * FROM capture_jobs WHERE status = ? AND available_at <= ? ORDER BY available_at, id LIMIT 1",
+                (JOB_PENDING, now),
+            ).fetchone()
+            if row is None:
+                self._conn.execute("COMMIT")
+                return None
+
+            self._conn.execute(
+                "UPDATE capture_jobs SET status = ?, attempts = attempts + 1, worker = ?, "
+                "lease_expires_at = ?, updated_at = ? WHERE id = ?",
+                (JOB_RUNNING, worker, now + lease_seconds, now, row["id"]),
+            )
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+        job = self._to_job(row)
+        job.status = JOB_RUNNING
+        job.attempts += 1
+        return job
+
+    def complete(self, job_id: int, har_path: str) -> None:
+        """Mark a job as done."""
+        self._conn.execute(
+            "UPDATE capture_jobs SET status = ?, har_path = ?, error = NULL, lease_expires_at = NULL, "
+            "updated_at = ? WHERE id = ?",
+            (JOB_DONE, har_path, time.time(), job_id),
+        )
+
+    def retry_delay(self, attempts: int) -> float:
+        """Exponential backoff with jitter for the retry after ``attempts`` failed attempts."""
+        delay = min(self.backoff_max_seconds, self.backoff_base_seconds * 2 ** max(attempts - 1, 0))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def fail(self, job: CaptureJob, error: str) -> bool:
+        """
+        Record a failed attempt.
+
+        Returns:
+            True if the job will be retried, False if it has failed for good
+        """
+        now = time.time()
+        retry = job.attempts < job.max_attempts
+        self._conn.execute(
+            "UPDATE capture_jobs SET status = ?, available_at = ?, error = ?, worker = NULL, "
+            "lease_expires_at = NULL, updated_at = ? WHERE id = ?",
+            (JOB_PENDING if retry else JOB_FAILED, now + self.retry_delay(job.attempts), error, now, job.id),
+        )
+        return retry
+
+    def counts(self) -> dict[str, int]:
+        """Number of jobs per status."""
+        counts = dict.fromkeys((JOB_PENDING, JOB_RUNNING, JOB_DONE, JOB_FAILED), 0)
+        for row in self._conn.execute("SELECT status, COUNT(*) AS n FROM capture_jobs GROUP BY status"):
+            counts[row["status"]] = row["n"]
+        return counts
+
+    def has_unfinished(self) -> bool:
+        """Whether any job is still pending or running."""
+        row = self._conn.execute(
+            "SELECT 1 FROM capture_jobs WHERE status IN (?, ?) LIMIT 1", (JOB_PENDING, JOB_RUNNING)
+        ).fetchone()
+        return row is not None
+
+    def jobs(self, status: Optional[str] = None) -> list[CaptureJob]:
+        """List jobs, optionally only those with the given status."""
+        if status is None:
+            rows = self._conn.execute("SELECT * FROM capture_jobs ORDER BY id")
+        else:
+            rows = self._conn.execute("SELECT * FROM capture_jobs WHERE status = ? ORDER BY id", (status,))
+        return [self._to_job(row) for row in rows]
+
+
+@dataclass
+class FarmResult:
+    """Summary of a capture farm run."""
+
+    completed: int
+    failed: int
+    pending: int
+    elapsed_seconds: float
+    worker_restarts: int
+
+    @property
+    def captures_per_minute(self) -> float:
+        """Completed captures per minute of wall-clock time."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.completed / (self.elapsed_seconds / 60)
+
+
+async def _run_job(job: CaptureJob, browser, auth_token: str, results_dir: Path, config: dict[str, Any]) -> str:
+    """Capture one job into a HAR using a context of the worker's shared browser."""
+    session_options = config["session_options"]
+
+    if job.kind == "flow":
+        flow = CaptureFlow.load(job.target)
+        har_path = results_dir / f"job_{job.id}_{flow.name}.har"
+        result = await areplay_flow(
+            flow, auth_token, har_path, pace_ms=config["pace_ms"], browser=browser, **session_options
+        )
+        if not result.success:
+            raise CaptureFarmError(result.error or "Flow replay failed")
+        return str(har_path)
+
+    har_path = results_dir / f"job_{job.id}.har"
+    session = BrowserSession(auth_token=auth_token, browser=browser, **session_options)
+    try:
+        await session.start(job.target, wait_until=config["wait_until"])
+        if config["settle_ms"]:
+            await session._api_idle_async(max_ms=config["settle_ms"])
+        await session._dump_logs_async(har_path)
+    finally:
+        await session._close_async()
+    return str(har_path)
+
+
+async def _worker_loop(db_path: str, auth_token: str, results_dir: str, worker_id: str, config: dict[str, Any]) -> None:
+    from playwright.async_api import async_playwright
+
+    queue = CaptureJobQueue(db_path, config["backoff_base_seconds"], config["backoff_max_seconds"])
+    results_path = Path(results_dir)
+    lease_seconds = config["job_timeout_seconds"] + 60
+
+    async with async_playwright() as playwright:
+        browser = None
+        try:
+            while True:
+                job = queue.claim(worker_id, lease_seconds)
+                if job is None:
+                    if not queue.has_unfinished():
+                        return
+                    # Retries are backing off or other workers hold the remaining jobs
+                    await asyncio.sleep(config["poll_interval_seconds"])
+                    continue
+
+                try:
+                    if browser is None or not browser.is_connected():
+                        browser = await playwright.chromium.launch(
+                            headless=config["headless"], **config["launch_options"]
+                        )
+                    har_path = await asyncio.wait_for(
+                        _run_job(job, browser, auth_token, results_path, config), config["job_timeout_seconds"]
+                    )
+                    queue.complete(job.id, har_path)
+                except Exception as e:
+                    error = str(e) or type(e).__name__
+                    if queue.fail(job, error):
+                        print(f"[{worker_id}] job {job.id} attempt {job.attempts} failed, will retry: {error}")
+                    else:
+                        print(f"[{worker_id}] job {job.id} failed after {job.attempts} attempts: {error}")
+        finally:
+            if browser is not None:
+                try:
+                    await browser.close()
+                except Exception:
+                    pass
+            queue.close()
+
+
+def _worker_main(db_path: str, auth_token: str, results_dir: str, worker_id: str, config: dict[str, Any]) -> None:
+    """Entry point of a farm worker process."""
+    asyncio.run(_worker_loop(db_path, auth_token, results_dir, worker_id, config))
+
+
+class CaptureFarm:
+    """
+    Runs capture jobs from a CaptureJobQueue in N worker processes.
+
+    Each worker owns one Playwright browser and opens a fresh context per job,
+    so throughput scales with cores instead of being capped by the single
+    Python process that handles Playwright's events. Jobs are leased from the
+    SQLite queue, which means a crashed worker loses no work: the supervisor
+    starts a replacement and the job is retried once its lease expires.
+    """
+
+    def __init__(
+        self,
+        auth_token: str,
+        db_path: Union[str, Path],
+        results_dir: Union[str, Path],
+        workers: Optional[int] = None,
+        headless: bool = True,
+        wait_until: str = "load",
+        settle_ms: float = 5000,
+        pace_ms: float = 0,
+        job_timeout_seconds: float = 600,
+        backoff_base_seconds: float = 5.0,
+        backoff_max_seconds: float = 300.0,
+        poll_interval_seconds: float = 1.0,
+        session_options: Optional[dict[str, Any]] = None,
+        **playwright_options,
+    ):
+        """
+        Initialize the farm.
+
+        Args:
+            auth_token: Authentication token injected into every session
+            db_path: SQLite job queue database
+            results_dir: Directory receiving one HAR per completed job
+            workers: Number of worker processes (default: number of CPU cores)
+            headless: Whether to run browsers headless (default: True)
+            wait_until: Navigation completion event for URL jobs (default: "load")
+            settle_ms: Maximum wait for API traffic to go idle after loading a URL job
+            pace_ms: Delay between steps of flow jobs in milliseconds
+            job_timeout_seconds: Time limit for a single job
+            backoff_base_seconds: Delay before the first retry; doubles on every attempt
+            backoff_max_seconds: Upper bound on the retry delay
+            poll_interval_seconds: How often idle workers look for retryable jobs
+            session_options: Extra BrowserSession options for every job
+                             (e.g. ``{"api_only": True, "storage_state_cache": cache}``)
+            **playwright_options: Additional Playwright browser launch options
+        """
+        self.auth_token = auth_token
+        self.queue = CaptureJobQueue(db_path, backoff_base_seconds, backoff_max_seconds)
+        self.results_dir = Path(results_dir)
+        self.workers = workers or os.cpu_count() or 1
+        self._config = {
+            "headless": headless,
+            "wait_until": wait_until,
+            "settle_ms": settle_ms,
+            "pace_ms": pace_ms,
+            "job_timeout_seconds": job_timeout_seconds,
+            "backoff_base_seconds": backoff_base_seconds,
+            "backoff_max_seconds": backoff_max_seconds,
+            "poll_interval_seconds": poll_interval_seconds,
+            "session_options": dict(session_options or {}),
+            "launch_options": playwright_options,
+        }
+
+    def add_url(self, url: str, max_attempts: int = 3) -> int:
+        """Queue a capture of a single URL. Returns the job id."""
+        return self.queue.add_url(url, max_attempts=max_attempts)
+
+    def add_flow(self, flow_path: Union[str, Path], max_attempts: int = 3) -> int:
+        """Queue a replay of a saved flow file. Returns the job id."""
+        return self.queue.add_flow(flow_path, max_attempts=max_attempts)
+
+    def _start_worker(self, context, index: int):
+        worker_id = f"{socket.gethostname()}-{os.getpid()}-w{index}"
+        process = context.Process(
+            target=_worker_main,
+            args=(str(self.queue.db_path), self.auth_token, str(self.results_dir), worker_id, self._config),
+            name=f"zapi-capture-worker-{index}",
+            daemon=True,
+        )
+        process.start()
+        return process
+
+    def run(self) -> FarmResult:
+        """
+        Process queued jobs until none are pending or running.
+
+        Returns:
+            FarmResult with final job counts
+
+        Raises:
+            CaptureFarmError: If the workers keep crashing without making progress
+        """
+        self.results_dir.mkdir(parents=True, exist_ok=True)
+        started = time.monotonic()
+        restarts = 0
+
+        # Spawn, not fork: the parent may already run Playwright or the background event loop thread
+        context = multiprocessing.get_context("spawn")
+        processes = {index: self._start_worker(context, index) for index in range(self.workers)}
+        print(f"Capture farm started with {self.workers} workers ({self.queue.counts()[JOB_PENDING]} jobs queued)")
+
+        try:
+            while processes:
+                time.sleep(self._config["poll_interval_seconds"])
+                for index, process in list(processes.items()):
+                    if process.is_alive():
+                        continue
+                    del processes[index]
+                    if process.exitcode != 0 and self.queue.has_unfinished():
+                        restarts += 1
+                        if restarts > self.workers * 10:
+                            raise CaptureFarmError("Capture workers keep crashing; giving up.")
+                        print(f"Capture worker {index} exited with code {process.exitcode}, restarting")
+                        processes[index] = self._start_worker(context, index)
+        finally:
+            for process in processes.values():
+                process.terminate()
+                process.join()
+
+        counts = self.queue.counts()
+        result = FarmResult(
+            completed=counts[JOB_DONE],
+            failed=counts[JOB_FAILED],
+            pending=counts[JOB_PENDING] + counts[JOB_RUNNING],
+            elapsed_seconds=time.monotonic() - started,
+            worker_restarts=restarts,
+        )
+        print(
+            f"Capture farm finished: {result.completed} done, {result.failed} failed "
+            f"in {result.elapsed_seconds:.1f}s ({result.captures_per_minute:.1f} captures/min)"
+        )
+        return result
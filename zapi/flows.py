@@ -0,0 +1,365 @@
+"""Record-and-replay of scripted capture flows."""
+
+import asyncio
+import json
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from string import Template
+from typing import Any, Optional, Union
+
+from .session import BrowserSession, _run_async
+
+# Version of the on-disk flow format
+FLOW_FORMAT_VERSION = 1
+
+# Actions a flow may contain, mapped to the BrowserSession coroutine that performs them
+FLOW_ACTIONS = {
+    "navigate": "_navigate_async",
+    "click": "_click_async",
+    "fill": "_fill_async",
+    "wait_for": "_wait_for_async",
+    "wait_for_api_idle": "_wait_for_api_idle_async",
+}
+
+# Name of the page binding the in-page recorder reports manual interactions to
+RECORDER_BINDING = "__zapiRecordAction"
+
+# In-page recorder installed when a session records a flow. It reports manual clicks
+# and field edits in the top frame with a best-effort stable CSS selector.
+RECORDER_SCRIPT = r"""
+(() => {
+  if (window !== window.top || window.__zapiRecorderInstalled) return;
+  window.__zapiRecorderInstalled = true;
+  const report = (action) => {
+    if (typeof window.__zapiRecordAction === "function") window.__zapiRecordAction(action);
+  };
+  const quote = (value) => value.replace(/\\/g, "\\\\").replace(/"/g, '\\"');
+  const selectorFor = (el) => {
+    if (!(el instanceof Element)) return null;
+    for (const attr of ["data-testid", "data-test", "data-qa"]) {
+      const value = el.getAttribute(attr);
+      if (value) return `[${attr}="${quote(value)}"]`;
+    }
+    if (el.id) return `[id="${quote(el.id)}"]`;
+    const name = el.getAttribute("name");
+    if (name) return `${el.tagName.toLowerCase()}[name="${quote(name)}"]`;
+    const parts = [];
+    for (let node = el; node && node !== document.documentElement; node = node.parentElement) {
+      if (node.id) {
+        parts.unshift(`[id="${quote(node.id)}"]`);
+        break;
+      }
+      let part = node.tagName.toLowerCase();
+      const parent = node.parentElement;
+      if (parent) {
+        const siblings = Array.from(parent.children).filter((child) => child.tagName === node.tagName);
+        if (siblings.length > 1) part += `:nth-of-type(${siblings.indexOf(node) + 1})`;
+      }
+      parts.unshift(part);
+    }
+    return parts.join(" > ");
+  };
+  document.addEventListener("click", (event) => {
+    if (!(event.target instanceof Element)) return;
+    const target = event.target.closest("a,button,input,label,[role],[onclick]") || event.target;
+    const selector = selectorFor(target);
+    if (selector) report({ action: "click", selector });
+  }, true);
+  document.addEventListener("change", (event) => {
+    const el = event.target;
+    if (!(el instanceof HTMLInputElement || el instanceof HTMLTextAreaElement)) return;
+    if (["checkbox", "radio", "submit", "button", "file", "image", "reset"].includes(el.type)) return;
+    const selector = selectorFor(el);
+    if (selector) {
+      report({ action: "fill", selector, value: el.value, secret: el.type === "password", field: el.name || el.id });
+    }
+  }, true);
+})();
+"""
+
+
+class FlowError(Exception):
+    """Base exception for flow recording and replay errors."""
+
+    pass
+
+
+@dataclass
+class FlowStep:
+    """A single recorded BrowserSession action."""
+
+    action: str
+    args: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class CaptureFlow:
+    """
+    Portable, JSON-serializable list of BrowserSession actions.
+
+    Fill values may reference environment variables as ``${NAME}``; they are
+    substituted at replay time so secrets never need to live in the flow file.
+    """
+
+    steps: list[FlowStep] = field(default_factory=list)
+    name: Optional[str] = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the flow to a plain dictionary."""
+        return {
+            "version": FLOW_FORMAT_VERSION,
+            "name": self.name,
+            "steps": [{"action": step.action, "args": step.args} for step in self.steps],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "CaptureFlow":
+        """
+        Build a flow from its dictionary form.
+
+        Raises:
+            FlowError: If the data is not a valid flow
+        """
+        if not isinstance(data, dict) or not isinstance(data.get("steps"), list):
+            raise FlowError("Invalid flow format: expected an object with a 'steps' list")
+
+        version = data.get("version", FLOW_FORMAT_VERSION)
+        if version > FLOW_FORMAT_VERSION:
+            raise FlowError(f"Unsupported flow version {version} (max supported: {FLOW_FORMAT_VERSION})")
+
+        steps = []
+        for index, raw_step in enumerate(data["steps"]):
+            action = raw_step.get("action") if isinstance(raw_step, dict) else None
+            if action not in FLOW_ACTIONS:
+                raise FlowError(f"Invalid flow step #{index + 1}: unknown action '{action}'")
+            steps.append(FlowStep(action=action, args=dict(raw_step.get("args") or {})))
+
+        return cls(steps=steps, name=data.get("name"))
+
+    def save(self, filepath: Union[str, Path]) -> str:
+        """
+        Write the flow to a JSON file.
+
+        Args:
+            filepath: Destination path
+
+        Returns:
+            Path to the saved flow file
+
+        Raises:
+            FlowError: If the file cannot be written
+        """
+        try:
+            dest_path = Path(filepath)
+            dest_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(dest_path, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+            return str(dest_path)
+        except (OSError, TypeError) as e:
+            raise FlowError(f"Failed to save flow to '{filepath}': {e}")
+
+    @classmethod
+    def load(cls, filepath: Union[str, Path]) -> "CaptureFlow":
+        """
+        Load a flow from a JSON file.
+
+        Raises:
+            FlowError: If the file is missing or not a valid flow
+        """
+        try:
+            with open(filepath, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            raise FlowError(f"Flow file not found: '{filepath}'")
+        except (OSError, json.JSONDecodeError) as e:
+            raise FlowError(f"Failed to read flow file '{filepath}': {e}")
+
+        flow = cls.from_dict(data)
+        if not flow.name:
+            flow.name = Path(filepath).stem
+        return flow
+
+
+@dataclass
+class FlowReplayResult:
+    """Outcome of replaying a single flow."""
+
+    flow_name: str
+    har_path: Optional[str]
+    success: bool
+    steps_completed: int
+    duration_seconds: float
+    error: Optional[str] = None
+
+
+def _expand_env(value: Any) -> Any:
+    """Substitute ``${NAME}`` references with environment variables, leaving unknown names intact."""
+    if isinstance(value, str):
+        return Template(value).safe_substitute(os.environ)
+    return value
+
+
+async def areplay_flow(
+    flow: Union[CaptureFlow, str, Path],
+    auth_token: str,
+    har_path: Union[str, Path],
+    headless: bool = True,
+    pace_ms: float = 0,
+    jitter_ms: float = 0,
+    **playwright_options,
+) -> FlowReplayResult:
+    """
+    Replay a flow in a fresh browser session and save the captured HAR.
+
+    Failures are reported in the returned result rather than raised, so a batch
+    of replays keeps going when one application misbehaves.
+
+    Args:
+        flow: CaptureFlow instance or path to a flow file
+        auth_token: Authentication token injected into the session
+        har_path: Where to save the HAR captured during replay
+        headless: Whether to run the browser headless (default: True)
+        pace_ms: Delay between steps in milliseconds
+        jitter_ms: Random extra delay (0..jitter_ms) added to each pause
+        **playwright_options: Additional Playwright browser launch options
+
+    Returns:
+        FlowReplayResult describing the replay
+    """
+    started = time.monotonic()
+    steps_completed = 0
+    flow_name = str(flow)
+
+    session = None
+    try:
+        if not isinstance(flow, CaptureFlow):
+            flow = CaptureFlow.load(flow)
+        flow_name = flow.name or "flow"
+
+        session = BrowserSession(auth_token=auth_token, headless=headless, **playwright_options)
+        await session.start()
+
+        for step in flow.steps:
+            if steps_completed and (pace_ms or jitter_ms):
+                await asyncio.sleep((pace_ms + random.uniform(0, jitter_ms)) / 1000)
+
+            args = {key: _expand_env(value) for key, value in step.args.items()}
+            await getattr(session, FLOW_ACTIONS[step.action])(**args)
+            steps_completed += 1
+
+        await session._dump_logs_async(har_path)
+        return FlowReplayResult(
+            flow_name=flow_name,
+            har_path=str(har_path),
+            success=True,
+            steps_completed=steps_completed,
+            duration_seconds=time.monotonic() - started,
+        )
+    except Exception as e:
+        return FlowReplayResult(
+            flow_name=flow_name,
+            har_path=None,
+            success=False,
+            steps_completed=steps_completed,
+            duration_seconds=time.monotonic() - started,
+            error=str(e),
+        )
+    finally:
+        if session is not None:
+            try:
+                await session._close_async()
+            except Exception:
+                # Ignore cleanup errors, the result already reflects the replay outcome
+                pass
+
+
+async def areplay_flows(
+    flows: list[Union[CaptureFlow, str, Path]],
+    auth_token: str,
+    output_dir: Union[str, Path],
+    concurrency: int = 4,
+    headless: bool = True,
+    pace_ms: float = 0,
+    jitter_ms: float = 0,
+    **playwright_options,
+) -> list[FlowReplayResult]:
+    """
+    Replay many flows headless and in parallel, one browser per flow.
+
+    Each flow's HAR is written to ``<output_dir>/<flow name>.har``.
+
+    Args:
+        flows: CaptureFlow instances or paths to flow files
+        auth_token: Authentication token injected into every session
+        output_dir: Directory receiving the captured HAR files
+        concurrency: Maximum number of browsers running at once (default: 4)
+        headless: Whether to run browsers headless (default: True)
+        pace_ms: Delay between steps in milliseconds
+        jitter_ms: Random extra delay (0..jitter_ms) added to each pause
+        **playwright_options: Additional Playwright browser launch options
+
+    Returns:
+        List of FlowReplayResult, in the same order as ``flows``
+    """
+    if concurrency < 1:
+        raise FlowError("concurrency must be at least 1")
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    semaphore = asyncio.Semaphore(concurrency)
+    used_names: set[str] = set()
+
+    def _har_path_for(index: int, flow: Union[CaptureFlow, str, Path]) -> Path:
+        base = flow.name if isinstance(flow, CaptureFlow) else Path(flow).stem
+        name = base or f"flow_{index + 1}"
+        if name in used_names:
+            name = f"{name}_{index + 1}"
+        used_names.add(name)
+        return output_dir / f"{name}.har"
+
+    async def _replay(flow, har_path):
+        async with semaphore:
+            return await areplay_flow(
+                flow,
+                auth_token,
+                har_path,
+                headless=headless,
+                pace_ms=pace_ms,
+                jitter_ms=jitter_ms,
+                **playwright_options,
+            )
+
+    jobs = [_replay(flow, _har_path_for(index, flow)) for index, flow in enumerate(flows)]
+    return list(await asyncio.gather(*jobs))
+
+
+def replay_flows(
+    flows: list[Union[CaptureFlow, str, Path]],
+    auth_token: str,
+    output_dir: Union[str, Path],
+    concurrency: int = 4,
+    headless: bool = True,
+    pace_ms: float = 0,
+    jitter_ms: float = 0,
+    **playwright_options,
+) -> list[FlowReplayResult]:
+    """
+    Replay many flows headless and in parallel (synchronous wrapper).
+
+    See ``areplay_flows`` for the argument reference.
+    """
+    return _run_async(
+        areplay_flows(
+            flows,
+            auth_token,
+            output_dir,
+            concurrency=concurrency,
+            headless=headless,
+            pace_ms=pace_ms,
+            jitter_ms=jitter_ms,
+            **playwright_options,
+        )
+    )
@@ -42,11 +42,11 @@ class HarProcessor:
     # Time per entry in minutes (24 seconds = 0.4 minutes)
     TIME_PER_ENTRY_MINUTES = 24 / 60
 
+    # File extensions (regex fragments) of static assets and non-API content
+    STATIC_EXTENSIONS = "js|css|png|jpe?g|gif|svg|webp|ico|bmp|avif|mp4|webm|mp3|wav|woff2?|ttf|otf|map|jpf"
+
     # Filter patterns for static assets and non-API content
-    DENY_EXTENSIONS = re.compile(
-        r"\.(js|css|png|jpe?g|gif|svg|webp|ico|bmp|avif|mp4|webm|mp3|wav|woff2?|ttf|otf|map|jpf)(\?.*)?$",
-        re.IGNORECASE,
-    )
+    DENY_EXTENSIONS = re.compile(rf"\.({STATIC_EXTENSIONS})(\?.*)?$", re.IGNORECASE)
 
     # MIME types to exclude
     DENY_MIMETYPES = {
@@ -72,6 +72,48 @@ class HarProcessor:
         "application/font-woff",
     }
 
+    @classmethod
+    def api_url_filter(cls) -> "re.Pattern[str]":
+        """
+        Build a URL filter that only matches likely API requests.
+
+        The pattern accepts http(s) URLs whose path does not end in one of the
+        static asset extensions filtered by this class. It is suitable for
+        Playwright's ``record_har_url_filter`` (the regex is also valid in
+        JavaScript), so static assets never reach the HAR. MIME-type filtering
+        still happens when the HAR is processed.
+
+        Returns:
+            Compiled case-insensitive regular expression
+        """
+        return re.compile(rf"^https?://(?![^?#]*\.(?:{cls.STATIC_EXTENSIONS})(?:[?#]|$))", re.IGNORECASE)
+
+    @classmethod
+    def static_asset_reason(cls, url: str, mime_type: str = "") -> Optional[str]:
+        """
+        Check whether a request/response is a static asset rather than API traffic.
+
+        Args:
+            url: Request URL
+            mime_type: Response MIME type (parameters such as charset are ignored)
+
+        Returns:
+            "denied_extension" or "denied_mime_type" if the entry is a static asset, None otherwise
+        """
+        # Filter by file extensions - exclude static assets
+        try:
+            if cls.DENY_EXTENSIONS.search(urlparse(url).path):
+                return "denied_extension"
+        except Exception:
+            # URL parsing failed, but we'll continue processing
+            pass
+
+        # Filter by response MIME types
+        if (mime_type or "").split(";")[0].strip().lower() in cls.DENY_MIMETYPES:
+            return "denied_mime_type"
+
+        return None
+
     def __init__(self, har_file_path: str):
         """
         Initialize HAR processor with a file path.
@@ -196,79 +238,71 @@ class HarProcessor:
         Returns:
             True if entry is valid and processed, False if skipped
         """
+        reason = self.skip_reason(entry)
+        if reason:
+            self.skipped_entries_by_reason[reason].append(entry)
+            self.skipped_counters[reason] += 1
+            self.skipped_entries += 1
+            return False
+
+        # Extract domain information
+        try:
+            parsed_url = urlparse(self._extract_url_from_entry(entry))
+            domain = parsed_url.netloc
+            if domain:
+                self.domains_found.add(domain)
+        except Exception:
+            # URL parsing failed, but we'll still count it as valid
+            pass
+
+        # Store processed entry
+        self.entries.append(entry)
+        return True
+
+    @classmethod
+    def skip_reason(cls, entry: dict[str, Any]) -> Optional[str]:
+        """
+        Check whether an entry is left out of API-only HARs.
+
+        These are the filter rules of load_and_process(), usable on entries
+        streamed one at a time.
+
+        Args:
+            entry: HAR entry dictionary
+
+        Returns:
+            The reason the entry is skipped (a key of ``skipped_counters``), None if it is kept
+        """
         try:
             # Basic validation - check for required fields
             if "request" not in entry or "response" not in entry:
-                self.skipped_entries_by_reason["invalid_entry_format"].append(entry)
-                self.skipped_counters["invalid_entry_format"] += 1
-                self.skipped_entries += 1
-                return False
+                return "invalid_entry_format"
 
             # Extract URL
-            url = self._extract_url_from_entry(entry)
+            url = cls._extract_url_from_entry(entry)
             if not url:
-                self.skipped_entries_by_reason["missing_url"].append(entry)
-                self.skipped_counters["missing_url"] += 1
-                self.skipped_entries += 1
-                return False
+                return "missing_url"
 
             # Validate HTTP/HTTPS scheme
             if not url.lower().startswith(("http://", "https://")):
-                self.skipped_entries_by_reason["non_http_scheme"].append(entry)
-                self.skipped_counters["non_http_scheme"] += 1
-                self.skipped_entries += 1
-                return False
-
-            # Filter by file extensions - exclude static assets
-            try:
-                parsed_url = urlparse(url)
-                path = parsed_url.path
-                if self.DENY_EXTENSIONS.search(path):
-                    self.skipped_entries_by_reason["denied_extension"].append(entry)
-                    self.skipped_counters["denied_extension"] += 1
-                    self.skipped_entries += 1
-                    return False
-            except Exception:
-                # URL parsing failed, but we'll continue processing
-                pass
-
-            # Filter by response MIME types
-            response_content = self._extract_response_content(entry)
-            mime_type = response_content.get("mimeType", "").split(";")[0]
-            if mime_type in self.DENY_MIMETYPES:
-                self.skipped_entries_by_reason["denied_mime_type"].append(entry)
-                self.skipped_counters["denied_mime_type"] += 1
-                self.skipped_entries += 1
-                return False
-
-            # Extract domain information
-            try:
-                parsed_url = urlparse(url)
-                domain = parsed_url.netloc
-                if domain:
-                    self.domains_found.add(domain)
-            except Exception:
-                # URL parsing failed, but we'll still count it as valid
-                pass
-
-            # Store processed entry
-            self.entries.append(entry)
-            return True
+                return "non_http_scheme"
 
+            # Filter static assets by file extension and response MIME type
+            response_content = cls._extract_response_content(entry)
+            return cls.static_asset_reason(url, response_content.get("mimeType", ""))
         except Exception:
-            self.skipped_entries_by_reason["parsing_error"].append(entry)
-            self.skipped_counters["parsing_error"] += 1
-            self.skipped_entries += 1
-            return False
+            return "parsing_error"
 
-    def _extract_url_from_entry(self, entry: dict[str, Any]) -> str:
+    @staticmethod
+    def _extract_url_from_entry(entry: dict[str, Any]) -> str:
         """Extract URL from an entry efficiently, returning empty string if not found."""
         try:
             return entry.get("request", {}).get("url", "")
         except (KeyError, AttributeError):
             return ""
 
-    def _extract_response_content(self, entry: dict[str, Any]) -> dict[str, Any]:
+    @staticmethod
+    def _extract_response_content(entry: dict[str, Any]) -> dict[str, Any]:
         """Extract response content from an entry efficiently, returning empty dict if not found."""
         try:
             return entry.get("response", {}).get("content", {})
@@ -0,0 +1,296 @@
+"""Serve recorded HAR responses for offline, reproducible re-capture and benchmarking."""
+
+import base64
+import json
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Optional, Union
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+from .har_processing import HarProcessingError
+
+# Hop-by-hop and encoding headers that no longer describe the decoded body we serve
+_SKIP_RESPONSE_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"}
+
+
+@dataclass
+class HarReplayResponse:
+    """A recorded response ready to be served."""
+
+    status: int
+    status_text: str
+    headers: list[tuple[str, str]]
+    body: bytes
+
+
+class HarReplayIndex:
+    """
+    Lookup table from request (method, URL, body) to recorded HAR responses.
+
+    When the same request was recorded several times, its responses are served
+    in recorded order and the last one repeats, like Playwright's route_from_har.
+    """
+
+    def __init__(
+        self,
+        har_path: Union[str, Path],
+        match_host: bool = True,
+        match_query: bool = True,
+        ignore_query_params: tuple[str, ...] = (),
+        match_body: bool = True,
+    ):
+        """
+        Load a HAR file and index its entries.
+
+        Args:
+            har_path: HAR file recorded with record_har_content="embed" (or "attach"
+                      with the body files next to the HAR)
+            match_host: Include scheme and host in the key. Disable to serve a HAR
+                        recorded against another environment.
+            match_query: Include the query string in the key
+            ignore_query_params: Query parameters left out of the key (cache busters,
+                                 timestamps, nonces, ...)
+            match_body: Include the request body in the key. JSON bodies are compared
+                        with sorted keys. A request whose body was never recorded falls
+                        back to a response recorded for the same method and URL.
+
+        Raises:
+            HarProcessingError: If the HAR file cannot be read
+        """
+        self.har_path = Path(har_path)
+        self.match_host = match_host
+        self.match_query = match_query
+        self.ignore_query_params = set(ignore_query_params)
+        self.match_body = match_body
+
+        try:
+            with open(self.har_path, encoding="utf-8") as f:
+                har_data = json.load(f)
+            entries = har_data["log"]["entries"]
+        except FileNotFoundError:
+            raise HarProcessingError(f"HAR file not found: {self.har_path}")
+        except (OSError, json.JSONDecodeError, KeyError, TypeError) as e:
+            raise HarProcessingError(f"Invalid HAR file '{self.har_path}': {e}")
+
+        self._responses: dict[tuple, list[HarReplayResponse]] = defaultdict(list)
+        self._fallbacks: dict[tuple, list[HarReplayResponse]] = defaultdict(list)
+        self._served: dict[tuple, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+        for entry in entries:
+            try:
+                request = entry["request"]
+                response = self._build_response(entry["response"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if response is None:
+                continue
+            body = (request.get("postData") or {}).get("text", "")
+            self._responses[self._key(request["method"], request["url"], body)].append(response)
+            self._fallbacks[self._key(request["method"], request["url"], None)].append(response)
+
+    def __len__(self) -> int:
+        return sum(len(responses) for responses in self._responses.values())
+
+    def _key(self, method: str, url: str, body: Optional[Union[str, bytes]]) -> tuple:
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme.lower()}://{parsed.netloc.lower()}" if self.match_host else ""
+        query = ""
+        if self.match_query:
+            params = parse_qsl(parsed.query, keep_blank_values=True)
+            query = urlencode(sorted(p for p in params if p[0] not in self.ignore_query_params))
+        body_key = None if body is None or not self.match_body else self._normalize_body(body)
+        return (method.upper(), origin, parsed.path or "/", query, body_key)
+
+    @staticmethod
+    def _normalize_body(body: Union[str, bytes]) -> str:
+        if isinstance(body, bytes):
+            body = body.decode("utf-8", errors="replace")
+        try:
+            return json.dumps(json.loads(body), sort_keys=True, separators=(",", ":"))
+        except ValueError:
+            return body
+
+    def _build_response(self, response: dict[str, Any]) -> Optional[HarReplayResponse]:
+        status = int(response["status"])
+        if status <= 0:
+            # Aborted or failed requests have no response to replay
+            return None
+
+        content = response.get("content") or {}
+        if content.get("_file"):
+            body_path = self.har_path.parent / content["_file"]
+            body = body_path.read_bytes() if body_path.exists() else b""
+        elif content.get("encoding") == "base64":
+            body = base64.b64decode(content.get("text", ""))
+        else:
+            body = content.get("text", "").encode("utf-8")
+
+        headers = [
+            (header["name"], header["value"])
+            for header in response.get("headers", [])
+            if header["name"].lower() not in _SKIP_RESPONSE_HEADERS and not header["name"].startswith(":")
+        ]
+        return HarReplayResponse(status, response.get("statusText", ""), headers, body)
+
+    def lookup(self, method: str, url: str, body: Optional[Union[str, bytes]] = None) -> Optional[HarReplayResponse]:
+        """
+        Find the recorded response for a request.
+
+        Args:
+            method: HTTP method
+            url: Absolute request URL
+            body: Request body, if any
+
+        Returns:
+            The recorded response, or None if the request was not recorded
+        """
+        key = self._key(method, url, body or "")
+        candidates = self._responses.get(key)
+        if not candidates:
+            key = self._key(method, url, None)
+            candidates = self._fallbacks.get(key)
+        if not candidates:
+            return None
+
+        with self._lock:
+            index = self._served[key]
+            self._served[key] += 1
+        return candidates[min(index, len(candidates) - 1)]
+
+
+class _ReplayRequestHandler(BaseHTTPRequestHandler):
+    server: "_ReplayHTTPServer"
+    protocol_version = "HTTP/1.1"
+
+    def _serve(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+
+        # Absolute-form when used as an HTTP proxy, origin-form when called directly
+        if self.path.startswith(("http://", "https://")):
+            url = self.path
+        else:
+            url = f"http://{self.headers.get('Host', 'localhost')}{self.path}"
+
+        replay = self.server.replay
+        response = replay.index.lookup(self.command, url, body)
+        if response is None:
+            replay._record_miss(self.command, url)
+            payload = f"No recorded response for {self.command} {url}".encode()
+            self.send_response(replay.not_found_status)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+
+        replay._record_hit()
+        self.send_response(response.status, response.status_text or None)
+        for name, value in response.headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(response.body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(response.body)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = do_OPTIONS = _serve  # noqa: N815
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.replay.verbose:
+            super().log_message(format, *args)
+
+
+class _ReplayHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    replay: "HarReplayServer"
+
+
+class HarReplayServer:
+    """
+    Local HTTP server answering requests from a recorded HAR.
+
+    Requests are served either directly (``http://127.0.0.1:<port>/api/...``,
+    matched host-agnostically) or through the server used as a plain-HTTP
+    proxy. Use it to benchmark API clients and the upload pipeline against a
+    fixed data set; for browser sessions on HTTPS apps use
+    ``BrowserSession(replay_har=...)`` instead, which serves the same HAR from
+    Playwright routes without TLS interception.
+
+    Example:
+        >>> with HarReplayServer("session.har") as server:
+        ...     requests.get(f"{server.url}/api/users")
+    """
+
+    def __init__(
+        self,
+        har_path: Union[str, Path],
+        host: str = "127.0.0.1",
+        port: int = 0,
+        not_found_status: int = 404,
+        verbose: bool = False,
+        **match_options,
+    ):
+        """
+        Load the HAR and bind the server (it starts serving on start()).
+
+        Args:
+            har_path: HAR file to serve
+            host: Interface to bind (default: 127.0.0.1)
+            port: Port to bind (default: a free port)
+            not_found_status: Status returned for requests missing from the HAR
+            verbose: Log every request to stderr
+            **match_options: Matching options of HarReplayIndex (match_query,
+                             ignore_query_params, match_body). match_host defaults
+                             to False so direct requests to the server match.
+        """
+        match_options.setdefault("match_host", False)
+        self.index = HarReplayIndex(har_path, **match_options)
+        self.not_found_status = not_found_status
+        self.verbose = verbose
+        self.hits = 0
+        self.misses: list[str] = []
+        self._stats_lock = threading.Lock()
+
+        self._httpd = _ReplayHTTPServer((host, port), _ReplayRequestHandler)
+        self._httpd.replay = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _record_hit(self) -> None:
+        with self._stats_lock:
+            self.hits += 1
+
+    def _record_miss(self, method: str, url: str) -> None:
+        with self._stats_lock:
+            self.misses.append(f"{method} {url}")
+
+    def start(self) -> "HarReplayServer":
+        """Start serving on a background thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._httpd.serve_forever, name="zapi-har-replay", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server and release its port."""
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> "HarReplayServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+        return False
@@ -0,0 +1,319 @@
+"""Streaming HAR reader and size-bounded HAR sharding."""
+
+import codecs
+import json
+import os
+import re
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+from .har_processing import HarProcessingError
+
+# Bytes read from the HAR file per refill of the parse buffer
+_READ_SIZE = 1024 * 1024
+
+_WHITESPACE = " \t\n\r"
+
+# Bytes read from the end of a HAR file to check what follows the entries
+_TAIL_BYTES = 4096
+
+# The "pages" key outside of a JSON string (where its quotes would be escaped)
+_PAGES_KEY = re.compile(rb'(?<!\\)"pages"\s*:')
+
+
+class HarStreamReader:
+    """
+    Reads a HAR file's entries one at a time without loading the whole file.
+
+    Every top-level field of ``log`` other than ``entries`` (version, creator,
+    pages, ...) is collected in ``header``. Values are decoded with the C JSON
+    decoder, so streaming costs about the same as ``json.load`` without its
+    memory footprint.
+    """
+
+    def __init__(self, har_path: Union[str, Path]):
+        """
+        Args:
+            har_path: Path to the HAR file
+        """
+        self.har_path = Path(har_path)
+        self.header: dict[str, Any] = {}
+        self._decoder = json.JSONDecoder()
+
+    def _open(self):
+        self._file = open(self.har_path, "rb")  # noqa: SIM115 - closed in iter_entries
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Read more of the file into the buffer. Returns False at end of file."""
+        if self._eof:
+            return False
+        chunk = self._file.read(_READ_SIZE)
+        if not chunk:
+            self._eof = True
+            self._buf = self._buf[self._pos :] + self._utf8.decode(b"", final=True)
+            self._pos = 0
+            return False
+        self._buf = self._buf[self._pos :] + self._utf8.decode(chunk)
+        self._pos = 0
+        return True
+
+    def _skip_whitespace(self) -> None:
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf) or not self._fill():
+                return
+
+    def _expect(self, char: str) -> None:
+        self._skip_whitespace()
+        if self._pos >= len(self._buf) or self._buf[self._pos] != char:
+            found = self._buf[self._pos : self._pos + 20] or "end of file"
+            raise HarProcessingError(f"Invalid HAR file '{self.har_path}': expected '{char}', found '{found}'")
+        self._pos += 1
+
+    def _peek(self) -> str:
+        self._skip_whitespace()
+        return self._buf[self._pos] if self._pos < len(self._buf) else ""
+
+    def _value(self) -> Any:
+        """Decode the next JSON value, reading more of the file until it is complete."""
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError as e:
+                if self._fill():
+                    continue
+                raise HarProcessingError(f"Invalid HAR file '{self.har_path}': {e.msg}")
+            # A number at the very end of the buffer may continue in the next chunk
+            if end == len(self._buf) and not self._eof and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def _object_keys(self) -> Iterator[str]:
+        """Iterate the keys of the object at the cursor, leaving the cursor on each value."""
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self._value()
+            self._expect(":")
+            yield key
+            if self._peek() == ",":
+                self._pos += 1
+                continue
+            self._expect("}")
+            return
+
+    def _iter_entries_pass(self, keep_entries: bool) -> Iterator[dict[str, Any]]:
+        self._open()
+        try:
+            for root_key in self._object_keys():
+                if root_key != "log":
+                    self._value()
+                    continue
+                for key in self._object_keys():
+                    if key != "entries":
+                        self.header[key] = self._value()
+                        continue
+                    self._expect("[")
+                    if self._peek() == "]":
+                        self._pos += 1
+                        continue
+                    while True:
+                        entry = self._value()
+                        if keep_entries:
+                            yield entry
+                        if self._peek() == ",":
+                            self._pos += 1
+                            continue
+                        self._expect("]")
+                        break
+        except UnicodeDecodeError as e:
+            raise HarProcessingError(f"Invalid HAR file '{self.har_path}': {e}")
+        finally:
+            self._file.close()
+
+    def read_header(self) -> dict[str, Any]:
+        """Read every ``log`` field except the entries (scans the whole file)."""
+        for _ in self._iter_entries_pass(keep_entries=False):
+            pass
+        return self.header
+
+    def iter_entries(self) -> Iterator[dict[str, Any]]:
+        """
+        Yield the HAR entries in file order.
+
+        Raises:
+            HarProcessingError: If the file is not valid HAR JSON
+        """
+        try:
+            yield from self._iter_entries_pass(keep_entries=True)
+        except FileNotFoundError:
+            raise HarProcessingError(f"HAR file not found: {self.har_path}")
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class _ShardWriter:
+    """
+    Writes one shard file, tracking its size as entries are added.
+
+    The log fields are written after the entries, when the shard is closed,
+    so fields only found by a rescan still reach a shard opened before it.
+    """
+
+    def __init__(self, path: Path, header_fields: bytes, pages_by_id: dict[str, bytes]):
+        self.path = path
+        self.header_fields = header_fields
+        self.pages_by_id = pages_by_id
+        self._page_ids: dict[str, None] = {}
+        self._file = open(path, "wb")  # noqa: SIM115 - closed in close()
+        self._file.write(b'{"log":{"entries":[')
+        self.entries = 0
+        self.size = len(header_fields) + len(b'{"log":{"entries":[],"pages":[]}}')
+
+    def set_layout(self, header_fields: bytes, pages_by_id: dict[str, bytes]) -> None:
+        """Replace the log fields and pages, as found by a rescan (before any entry referenced a page)."""
+        self.size += len(header_fields) - len(self.header_fields)
+        self.header_fields = header_fields
+        self.pages_by_id = pages_by_id
+
+    def cost(self, entry_bytes: bytes, pageref: Optional[str]) -> int:
+        """Bytes the shard grows by when adding an entry."""
+        extra = len(entry_bytes) + (1 if self.entries else 0)
+        if pageref and pageref not in self._page_ids and pageref in self.pages_by_id:
+            extra += len(self.pages_by_id[pageref]) + (1 if self._page_ids else 0)
+        return extra
+
+    def add(self, entry_bytes: bytes, pageref: Optional[str]) -> None:
+        self.size += self.cost(entry_bytes, pageref)
+        if self.entries:
+            self._file.write(b",")
+        self._file.write(entry_bytes)
+        self.entries += 1
+        if pageref and pageref in self.pages_by_id:
+            self._page_ids[pageref] = None
+
+    def close(self) -> Path:
+        pages = b",".join(self.pages_by_id[page_id] for page_id in self._page_ids)
+        self._file.write(b"]," + self.header_fields + b'"pages":[' + pages + b"]}}")
+        self._file.close()
+        return self.path
+
+
+def iter_har_shards(
+    har_path: Union[str, Path],
+    max_shard_bytes: int,
+    output_dir: Union[str, Path],
+    entry_filter: Optional[Callable[[dict[str, Any]], bool]] = None,
+) -> Iterator[Path]:
+    """
+    Split a HAR into self-contained shard files of at most ``max_shard_bytes``.
+
+    Entries are streamed from the source, so memory use is bounded by the
+    largest single entry. Each shard is a valid HAR carrying the source's log
+    fields and exactly the pages its entries reference. An entry larger than
+    the budget on its own gets a shard to itself. Shards are yielded as soon
+    as they are complete, so the caller can upload one while the next is
+    being written, and filtering happens on the fly while earlier shards upload.
+
+    Args:
+        har_path: Source HAR file
+        max_shard_bytes: Size budget per shard file
+        output_dir: Directory the shard files are written to
+        entry_filter: Keep only the entries it returns True for (e.g. to drop
+                      static assets, see HarProcessor.skip_reason()). No shard
+                      is written when no entry is kept.
+
+    Yields:
+        Paths of the completed shard files, in entry order
+
+    Raises:
+        HarProcessingError: If the source is not a valid HAR file
+    """
+    har_path = Path(har_path)
+    output_dir = Path(output_dir)
+    reader = HarStreamReader(har_path)
+    # Filled with the log fields as the stream passes them
+    header = reader.header
+    if not _entries_end_log(har_path):
+        # Log fields follow the entries: read them up front so every shard carries them
+        reader.read_header()
+
+    pages_by_id: Optional[dict[str, bytes]] = None
+    header_fields = b""
+    rescanned = False
+    shard: Optional[_ShardWriter] = None
+    index = 0
+    entries = reader.iter_entries()
+    try:
+        for entry in entries:
+            if entry_filter is not None and not entry_filter(entry):
+                continue
+            entry_bytes = _dumps(entry)
+            pageref = entry.get("pageref") if isinstance(entry, dict) else None
+            if pageref and "pages" not in header and not rescanned:
+                # The pages follow the entries; only then is the file read twice
+                header.update(HarStreamReader(har_path).read_header())
+                rescanned = True
+                pages_by_id = None
+            if pages_by_id is None:
+                pages_by_id, header_fields = _shard_layout(header)
+                if shard is not None:
+                    shard.set_layout(header_fields, pages_by_id)
+
+            if shard is not None and shard.entries and shard.size + shard.cost(entry_bytes, pageref) > max_shard_bytes:
+                done, shard = shard.close(), None
+                yield done
+            if shard is None:
+                index += 1
+                shard = _ShardWriter(output_dir / f"{har_path.stem}.part{index:04d}.har", header_fields, pages_by_id)
+            shard.add(entry_bytes, pageref)
+
+        if shard is not None:
+            done, shard = shard.close(), None
+            yield done
+    finally:
+        if shard is not None:
+            shard.close()
+        entries.close()
+
+
+def _entries_end_log(har_path: Path) -> bool:
+    """
+    Check whether ``entries`` looks like the last log field, from the end of the file.
+
+    Files that end with anything but an array (a comment or other scalar
+    field after the entries), or whose tail holds the ``pages`` key, need
+    their header read before sharding. Pages too large to show in the tail
+    are picked up by a rescan at the first entry that references a page.
+    """
+    try:
+        with open(har_path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - _TAIL_BYTES))
+            tail = f.read()
+    except FileNotFoundError:
+        raise HarProcessingError(f"HAR file not found: {har_path}")
+    return b"".join(tail.split()).endswith(b"]}}") and _PAGES_KEY.search(tail) is None
+
+
+def _shard_layout(header: dict[str, Any]) -> tuple[dict[str, bytes], bytes]:
+    """Serialized pages by ID and the log fields written at the start of every shard."""
+    pages_by_id = {
+        page["id"]: _dumps(page) for page in header.get("pages") or [] if isinstance(page, dict) and "id" in page
+    }
+    header_fields = b"".join(
+        _dumps(key) + b":" + _dumps(value) + b"," for key, value in header.items() if key not in ("pages", "entries")
+    )
+    return pages_by_id, header_fields
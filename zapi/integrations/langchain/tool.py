@@ -5,12 +5,15 @@ Basic conversion of ZAPI documented APIs into Langchain tools.
 """
 
 import os
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Optional, Union
 
 import requests
 from langchain_core.tools import tool
 
+from ...async_core import AsyncZAPI
+from ...catalog import api_hash, api_key
 from ...core import ZAPI
+from ...tool_index import ToolIndex
 from ...utils import load_security_headers
 
 
@@ -32,28 +35,102 @@ class ZAPILangchainTool:
     }
     """
 
-    def __init__(self, zapi_instance: ZAPI, headers_file: Optional[str] = None):
+    def __init__(self, zapi_instance: Union[ZAPI, AsyncZAPI], headers_file: Optional[str] = None):
         self.zapi = zapi_instance
         self.security_headers = load_security_headers(headers_file)
+        # Tools built so far, by API key, with the content hash of the definition they were built from
+        self._tools: dict[str, tuple[str, Callable]] = {}
+        # Search index over the APIs behind self._tools, rebuilt when the catalog changes
+        self._index: Optional[ToolIndex] = None
 
     def create_tools(self) -> list[Callable]:
-        """Create Langchain tools from documented APIs."""
-        # Get APIs from ZAPI
-        response = self.zapi.get_documented_apis(page_size=50)
-        apis = response.get("items", [])
-
-        # Create tools
+        """Create Langchain tools from documented APIs (use acreate_tools() with AsyncZAPI)."""
+        # Get every API from ZAPI's catalog cache (kept up to date with delta syncs)
+        return self.tools_from_apis(self._sync_zapi("create_tools").get_catalog())
+
+    async def acreate_tools(self) -> list[Callable]:
+        """Create Langchain tools from documented APIs, fetched with AsyncZAPI."""
+        if not isinstance(self.zapi, AsyncZAPI):
+            return self.create_tools()
+        return self.tools_from_apis(await self.zapi.get_all_documented_apis())
+
+    def refresh_tools(self) -> list[Callable]:
+        """
+        Sync the catalog and return the up-to-date tool list.
+
+        Only the tools whose API definition was added or changed since they
+        were built are created again; the others are reused as is. With
+        AsyncZAPI, call acreate_tools() again instead.
+        """
+        return self.tools_from_apis(self._sync_zapi("refresh_tools").get_catalog(refresh=True))
+
+    def _sync_zapi(self, method: str) -> ZAPI:
+        """The ZAPI instance, for methods reading its catalog cache."""
+        if isinstance(self.zapi, AsyncZAPI):
+            raise TypeError(f"{method}() needs a ZAPI instance; with AsyncZAPI, await acreate_tools() instead")
+        return self.zapi
+
+    def tools_from_apis(self, apis: list[dict[str, Any]]) -> list[Callable]:
+        """
+        Create Langchain tools from already fetched API descriptions.
+
+        Tools already built from an identical definition are reused, and tools
+        of APIs missing from ``apis`` are dropped.
+        """
         tools = []
+        built: dict[str, tuple[str, Callable]] = {}
         for api_data in apis:
+            key, digest = api_key(api_data), api_hash(api_data)
+            previous = self._tools.get(key)
+            if previous is not None and previous[0] == digest:
+                built[key] = previous
+                tools.append(previous[1])
+                continue
             try:
                 tool_func = self._create_tool(api_data)
+                built[key] = (digest, tool_func)
                 tools.append(tool_func)
             except Exception as e:
                 print(f"Error creating tool: {e}")
                 continue  # Skip failed tools
 
+        if (
+            self._index is None
+            or built.keys() != self._tools.keys()
+            or any(built[key][0] != self._tools[key][0] for key in built)
+        ):
+            self._index = ToolIndex([api_data for api_data in apis if api_key(api_data) in built])
+        self._tools = built
         return tools
 
+    def select_tools(self, query: str, k: int = 5) -> list[Callable]:
+        """
+        Return only the tools relevant to a query.
+
+        APIs are ranked with a local BM25 index over their title, description,
+        path and method, so each agent turn can bind a handful of tools instead
+        of the whole catalog. Tools are created on first use.
+
+        Args:
+            query: Free text, typically the user's message
+            k: Maximum number of tools
+
+        Returns:
+            Up to k tools, most relevant first (empty if no API matches the query)
+        """
+        if self._index is None:
+            self.create_tools()
+        return self._search(query, k)
+
+    async def aselect_tools(self, query: str, k: int = 5) -> list[Callable]:
+        """Return only the tools relevant to a query (see select_tools), for AsyncZAPI."""
+        if self._index is None:
+            await self.acreate_tools()
+        return self._search(query, k)
+
+    def _search(self, query: str, k: int) -> list[Callable]:
+        return [self._tools[api_key(match.api)][1] for match in self._index.search(query, k)]
+
     def _create_tool(self, api_data: dict[str, Any]) -> Callable:
         """Create a tool from API data."""
         api_id = api_data.get("id", "")
@@ -0,0 +1,144 @@
+"""Live capture metrics collected from Playwright browser context events."""
+
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Optional
+
+from playwright.async_api import BrowserContext, Request, Response
+
+from .har_processing import HarProcessor
+
+
+@dataclass
+class CaptureMetrics:
+    """Snapshot of a capture session's counters and timings."""
+
+    elapsed_seconds: float
+    navigations: int
+    navigation_total_ms: float
+    navigation_max_ms: float
+    requests: int
+    responses: int
+    requests_by_type: dict[str, int] = field(default_factory=dict)
+    responses_by_type: dict[str, int] = field(default_factory=dict)
+    bytes_received: int = 0
+    responses_without_length: int = 0
+    api_responses: int = 0
+    static_responses: int = 0
+    api_bytes: int = 0
+    static_bytes: int = 0
+    failed_requests: int = 0
+    blocked_requests: int = 0
+    estimated_cost_usd: float = 0.0
+    estimated_time_minutes: float = 0.0
+
+    @property
+    def navigation_avg_ms(self) -> float:
+        """Average duration of scripted navigations in milliseconds."""
+        return self.navigation_total_ms / self.navigations if self.navigations else 0.0
+
+    @property
+    def requests_per_minute(self) -> float:
+        """Request throughput over the life of the session."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.requests / (self.elapsed_seconds / 60)
+
+
+class CaptureMetricsCollector:
+    """
+    Counts requests, responses and navigation timings of a browser context.
+
+    Handlers only read data Playwright already delivered with each event
+    (resource type, URL, response headers), so collecting costs no extra
+    round trips to the browser. Byte counts come from ``Content-Length``;
+    responses without it are counted in ``responses_without_length``.
+    """
+
+    def __init__(self):
+        self._started = time.monotonic()
+        self._navigations = 0
+        self._navigation_total_ms = 0.0
+        self._navigation_max_ms = 0.0
+        self._requests_by_type: Counter = Counter()
+        self._responses_by_type: Counter = Counter()
+        self._bytes_received = 0
+        self._responses_without_length = 0
+        self._api_responses = 0
+        self._static_responses = 0
+        self._api_bytes = 0
+        self._static_bytes = 0
+        self._failed_requests = 0
+        self._blocked_requests = 0
+
+    def attach(self, context: BrowserContext) -> None:
+        """Subscribe to the request lifecycle events of a context."""
+        context.on("request", self._on_request)
+        context.on("response", self._on_response)
+        context.on("requestfailed", self._on_request_failed)
+
+    def record_navigation(self, duration_ms: float) -> None:
+        """Record the duration of a completed scripted navigation."""
+        self._navigations += 1
+        self._navigation_total_ms += duration_ms
+        self._navigation_max_ms = max(self._navigation_max_ms, duration_ms)
+
+    def _on_request(self, request: Request) -> None:
+        self._requests_by_type[request.resource_type] += 1
+
+    def _on_response(self, response: Response) -> None:
+        self._responses_by_type[response.request.resource_type] += 1
+
+        headers = response.headers
+        size = self._content_length(headers.get("content-length"))
+        if size is None:
+            self._responses_without_length += 1
+            size = 0
+        self._bytes_received += size
+
+        if HarProcessor.static_asset_reason(response.url, headers.get("content-type", "")):
+            self._static_responses += 1
+            self._static_bytes += size
+        else:
+            self._api_responses += 1
+            self._api_bytes += size
+
+    def _on_request_failed(self, request: Request) -> None:
+        # net::ERR_BLOCKED_BY_CLIENT, ERR_BLOCKED_BY_RESPONSE, ERR_BLOCKED_BY_ORB, ...
+        if "BLOCKED" in (request.failure or ""):
+            self._blocked_requests += 1
+        else:
+            self._failed_requests += 1
+
+    @staticmethod
+    def _content_length(value: Optional[str]) -> Optional[int]:
+        try:
+            return int(value) if value is not None else None
+        except ValueError:
+            return None
+
+    def snapshot(self) -> CaptureMetrics:
+        """Return the current counters as a CaptureMetrics instance."""
+        requests_by_type = dict(self._requests_by_type)
+        responses_by_type = dict(self._responses_by_type)
+        return CaptureMetrics(
+            elapsed_seconds=time.monotonic() - self._started,
+            navigations=self._navigations,
+            navigation_total_ms=self._navigation_total_ms,
+            navigation_max_ms=self._navigation_max_ms,
+            requests=sum(requests_by_type.values()),
+            responses=sum(responses_by_type.values()),
+            requests_by_type=requests_by_type,
+            responses_by_type=responses_by_type,
+            bytes_received=self._bytes_received,
+            responses_without_length=self._responses_without_length,
+            api_responses=self._api_responses,
+            static_responses=self._static_responses,
+            api_bytes=self._api_bytes,
+            static_bytes=self._static_bytes,
+            failed_requests=self._failed_requests,
+            blocked_requests=self._blocked_requests,
+            estimated_cost_usd=self._api_responses * HarProcessor.COST_PER_ENTRY,
+            estimated_time_minutes=self._api_responses * HarProcessor.TIME_PER_ENTRY_MINUTES,
+        )
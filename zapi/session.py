@@ -1,14 +1,25 @@
 """BrowserSession implementation with Playwright integration."""
 
 import asyncio
+import atexit
+import concurrent.futures
+import contextlib
+import errno
+import os
+import re
+import shutil
+import threading
+import time
+import weakref
 from pathlib import Path
-from typing import Optional, Union
+from typing import Callable, Literal, Optional, Union
 
 from playwright.async_api import (
     Browser,
     BrowserContext,
     Page,
     Playwright,
+    Request,
     async_playwright,
 )
 from playwright.async_api import (
@@ -19,22 +30,155 @@ from playwright.async_api import (
 )
 
 from .auth import get_auth_handler
+from .har_processing import HarProcessingError, HarProcessor, HarStats
+from .metrics import CaptureMetrics, CaptureMetricsCollector
+from .storage_state import StorageStateCache, write_private_json
 
+HarContentPolicy = Literal["omit", "attach", "embed"]
+
+# Accepted values for record_har_content
+HAR_CONTENT_POLICIES = ("omit", "attach", "embed")
+
+# Resource types that count as API traffic
+API_RESOURCE_TYPES = {"xhr", "fetch"}
+
+
+class _BackgroundLoop:
+    """
+    Single managed event loop running on a daemon thread.
+
+    All synchronous BrowserSession work is dispatched onto this loop with
+    ``asyncio.run_coroutine_threadsafe``, so sessions can be driven from any
+    thread (including threads that already run their own event loop).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._sessions: weakref.WeakSet = weakref.WeakSet()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Return the background loop, starting its thread on first use."""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+                thread = threading.Thread(
+                    target=self._run_forever, args=(loop, ready), name="zapi-event-loop", daemon=True
+                )
+                thread.start()
+                ready.wait()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    def owns(self, loop: asyncio.AbstractEventLoop) -> bool:
+        """Check whether ``loop`` is the managed background loop."""
+        return loop is not None and loop is self._loop
+
+    @staticmethod
+    def _run_forever(loop: asyncio.AbstractEventLoop, ready: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        loop.run_forever()
+
+    def track(self, session: "BrowserSession") -> None:
+        """Remember a session living on this loop so it can be closed at shutdown."""
+        self._sessions.add(session)
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        """Close tracked sessions, cancel pending tasks and stop the loop thread."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop, self._thread = None, None
+
+        if loop is None:
+            return
+
+        async def _drain():
+            for session in list(self._sessions):
+                try:
+                    await session._close_async()
+                except Exception:
+                    # Best-effort cleanup during interpreter shutdown
+                    pass
+            current = asyncio.current_task()
+            pending = [task for task in asyncio.all_tasks() if task is not current]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        try:
+            asyncio.run_coroutine_threadsafe(_drain(), loop).result(timeout)
+        except Exception:
+            pass
+
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        if not loop.is_running():
+            loop.close()
+
+
+_background_loop = _BackgroundLoop()
+atexit.register(_background_loop.shutdown)
+
+
+def _run_async(coro, loop: Optional[asyncio.AbstractEventLoop] = None):
+    """
+    Helper to run async coroutines synchronously.
+
+    The coroutine runs on ``loop`` (default: the shared background loop) and the
+    calling thread blocks on the resulting future.
+
+    Raises:
+        BrowserSessionError: If called from the target loop itself, which would deadlock.
+                             Use the async API (``anavigate``, ``aclick``, ...) there.
+    """
+    loop = loop or _background_loop.loop
 
-def _run_async(coro):
-    """Helper to run async coroutines synchronously."""
     try:
-        loop = asyncio.get_event_loop()
+        running = asyncio.get_running_loop()
     except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+        running = None
 
-    if loop.is_running():
-        # If we're already in an async context, just return the coroutine
-        return coro
-    else:
-        # Run synchronously
-        return loop.run_until_complete(coro)
+    if running is loop:
+        # Blocking here would deadlock the loop the coroutine needs
+        coro.close()
+        raise BrowserSessionError(
+            "Synchronous BrowserSession methods cannot be used from the event loop that owns the session. "
+            "Use the async API instead (e.g. 'await session.anavigate(...)')."
+        )
+
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return future.result()
+    except BaseException:
+        # KeyboardInterrupt and friends: don't leave the coroutine running
+        future.cancel()
+        raise
+
+
+def _move_file(src: Path, dst: Path) -> None:
+    """Move a file with an atomic rename, falling back to copy + delete across filesystems."""
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.copyfile(src, dst)
+        src.unlink()
+
+
+def _flow_secret_placeholder(field: Optional[str]) -> str:
+    """
+    Placeholder recorded instead of a password value.
+
+    Secrets are never written into flow files: replay reads them from the
+    ``ZAPI_FLOW_<FIELD>`` environment variable.
+    """
+    field_name = re.sub(r"[^A-Za-z0-9]+", "_", field or "password").strip("_").upper()
+    return f"${{ZAPI_FLOW_{field_name or 'PASSWORD'}}}"
 
 
 class BrowserSessionError(Exception):
@@ -55,6 +199,62 @@ class BrowserInitializationError(BrowserSessionError):
     pass
 
 
+class _ApiActivityTracker:
+    """Tracks in-flight fetch/XHR requests of a browser context from Playwright events."""
+
+    def __init__(self):
+        self.inflight: dict[Request, None] = {}
+        self.listeners: list[Callable[[Request], None]] = []
+
+    def attach(self, context: BrowserContext) -> None:
+        """Subscribe to the request lifecycle events of a context."""
+        context.on("request", self._on_request)
+        context.on("requestfinished", self._on_request_done)
+        context.on("requestfailed", self._on_request_done)
+
+    def _on_request(self, request: Request) -> None:
+        if request.resource_type in API_RESOURCE_TYPES:
+            self.inflight[request] = None
+            self._notify(request)
+
+    def _on_request_done(self, request: Request) -> None:
+        if self.inflight.pop(request, False) is None:
+            self._notify(request)
+
+    def _notify(self, request: Request) -> None:
+        for listener in list(self.listeners):
+            listener(request)
+
+    def pending(self, matches: Callable[[Request], bool]) -> int:
+        """Count in-flight API requests accepted by ``matches``."""
+        return sum(1 for request in self.inflight if matches(request))
+
+
+def _request_matcher(
+    url_filter: Optional[Union[str, re.Pattern, Callable[[str], bool]]] = None, page: Optional[Page] = None
+) -> Callable[[Request], bool]:
+    """Build a predicate selecting requests by URL filter (regex string, pattern or callable) and page."""
+    if url_filter is None:
+        url_matches = None
+    elif callable(url_filter) and not isinstance(url_filter, re.Pattern):
+        url_matches = url_filter
+    else:
+        url_matches = re.compile(url_filter).search
+
+    def _matches(request: Request) -> bool:
+        if url_matches is not None and not url_matches(request.url):
+            return False
+        if page is not None:
+            try:
+                return request.frame.page is page
+            except Exception:
+                # Service worker requests have no frame
+                return False
+        return True
+
+    return _matches
+
+
 class BrowserSession:
     """
     Manages a Playwright browser session with HAR recording and network log capture.
@@ -63,24 +263,127 @@ class BrowserSession:
     and HAR file export for API discovery.
     """
 
-    def __init__(self, auth_token: str, headless: bool = True, **playwright_options):
+    def __init__(
+        self,
+        auth_token: Union[str, concurrent.futures.Future],
+        headless: bool = True,
+        record_flow: bool = False,
+        record_har_content: HarContentPolicy = "embed",
+        record_har_url_filter: Optional[Union[str, re.Pattern]] = None,
+        api_only: bool = False,
+        storage_state: Optional[Union[str, Path, dict]] = None,
+        storage_state_cache: Optional[StorageStateCache] = None,
+        storage_state_key: Optional[str] = None,
+        login_url_pattern: Optional[Union[str, re.Pattern]] = None,
+        browser: Optional[Browser] = None,
+        replay_har: Optional[Union[str, Path]] = None,
+        replay_har_options: Optional[dict] = None,
+        **playwright_options,
+    ):
         """
         Initialize a browser session.
 
         Args:
-            auth_token: Authentication token to inject via Authorization header
+            auth_token: Authentication token to inject via Authorization header, or a
+                        future resolving to it. The browser starts while the future is
+                        pending; only the header injection waits for it.
             headless: Whether to run browser in headless mode
+            record_flow: Record navigate/click/fill/wait_for actions, including manual clicks
+                         and field edits in the page, so they can be saved with save_flow()
+                         and replayed later
+            record_har_content: How response bodies are recorded (default: "embed").
+                                "omit" records headers only, "embed" inlines bodies in the HAR,
+                                "attach" stores them as separate files in a .zip archive.
+            record_har_url_filter: Glob string or regex; only matching requests are recorded
+            api_only: Only record likely API requests, using HarProcessor's static asset
+                      rules (ignored when record_har_url_filter is given)
+            storage_state: Storage state (cookies, localStorage) to start from, as a file
+                           saved with save_storage_state() or a dictionary. A missing file
+                           is ignored so the first run can create it.
+            storage_state_cache: Cache to load the starting state from and to save it back
+                                 to when the session ends
+            storage_state_key: Cache key (default: origin of the initial URL)
+            login_url_pattern: Regex matching the app's login page. Landing on it means the
+                               saved state no longer works: the cache entry is dropped and
+                               the state is not saved again until the page moves on.
+            browser: Already running Playwright browser to open the session's context in.
+                     It is shared, so close() leaves it running. Must live on the event
+                     loop the session is initialized on.
+            replay_har: Serve every request from this HAR instead of the network, for
+                        fast offline and reproducible captures (see route_from_har)
+            replay_har_options: Keyword arguments for route_from_har (url_filter,
+                                not_found, match_query, match_body, ...)
             **playwright_options: Additional options for Playwright browser launch
+
+        Raises:
+            BrowserSessionError: If record_har_content is not a valid policy
         """
+        if record_har_content not in HAR_CONTENT_POLICIES:
+            raise BrowserSessionError(
+                f"Invalid record_har_content: {record_har_content}. Must be one of: {', '.join(HAR_CONTENT_POLICIES)}"
+            )
+
         self.auth_token = auth_token
         self.headless = headless
+        self.record_flow = record_flow
+        self.record_har_content = record_har_content
+        if record_har_url_filter is None and api_only:
+            record_har_url_filter = HarProcessor.api_url_filter()
+        self.record_har_url_filter = record_har_url_filter
+        self.storage_state = storage_state
+        self.storage_state_cache = storage_state_cache
+        self.storage_state_key = storage_state_key
+        self.login_url_pattern = (
+            re.compile(login_url_pattern) if isinstance(login_url_pattern, str) else login_url_pattern
+        )
+        self.on_login_page = False
         self.playwright_options = playwright_options
+        self._flow_steps: list[dict] = []
+        self._scripted_actions = 0
+        self._scripted_action_ended = 0.0
 
         self._playwright: Optional[Playwright] = None
-        self._browser: Optional[Browser] = None
+        self._browser: Optional[Browser] = browser
+        self._owns_browser = browser is None
+        self.replay_har = replay_har
+        self.replay_har_options = dict(replay_har_options or {})
         self._context: Optional[BrowserContext] = None
         self._page: Optional[Page] = None
         self._har_path: Optional[Path] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._api_tracker = _ApiActivityTracker()
+        self._metrics = CaptureMetricsCollector()
+
+    def _run_sync(self, coro):
+        """Run a coroutine on the loop that owns this session's Playwright objects."""
+        return _run_async(coro, self._loop)
+
+    async def _run_on_session_loop(self, coro):
+        """Await a coroutine on the session's loop, hopping threads if the caller is on another loop."""
+        if self._loop is None or self._loop is asyncio.get_running_loop():
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self._loop))
+
+    async def start(self, url: Optional[str] = None, wait_until: str = "load") -> "BrowserSession":
+        """
+        Launch the browser for a session created directly (async).
+
+        Sessions from ZAPI.launch_browser() and alaunch_browser() are already
+        started. The session is bound to the running event loop.
+
+        Args:
+            url: Optional initial URL to navigate to
+            wait_until: When to consider navigation complete (default: "load")
+
+        Returns:
+            The session itself, so ``session = await BrowserSession(...).start(url)`` works
+
+        Raises:
+            BrowserInitializationError: If browser initialization fails
+            BrowserNavigationError: If initial navigation fails
+        """
+        await self._initialize(initial_url=url, wait_until=wait_until)
+        return self
 
     async def _initialize(self, initial_url: Optional[str] = None, wait_until: str = "load"):
         """
@@ -94,35 +397,74 @@ class BrowserSession:
             BrowserInitializationError: If browser initialization fails
             BrowserNavigationError: If initial navigation fails
         """
-        try:
-            # Start Playwright
-            self._playwright = await async_playwright().start()
+        # Playwright objects are bound to the loop that created them
+        self._loop = asyncio.get_running_loop()
+        if _background_loop.owns(self._loop):
+            _background_loop.track(self)
 
-            # Launch browser with enhanced error handling
-            try:
-                self._browser = await self._playwright.chromium.launch(
-                    headless=self.headless, **self.playwright_options
-                )
-            except Exception as e:
-                raise BrowserInitializationError(
-                    f"Failed to launch browser: {str(e)}. "
-                    "This may be due to missing browser dependencies or system restrictions."
-                )
+        try:
+            if self._owns_browser:
+                # Start Playwright
+                self._playwright = await async_playwright().start()
+
+                # Launch browser with enhanced error handling
+                try:
+                    self._browser = await self._playwright.chromium.launch(
+                        headless=self.headless, **self.playwright_options
+                    )
+                except Exception as e:
+                    raise BrowserInitializationError(
+                        f"Failed to launch browser: {str(e)}. "
+                        "This may be due to missing browser dependencies or system restrictions."
+                    )
+            elif not self._browser.is_connected():
+                raise BrowserInitializationError("The shared browser passed to the session is no longer connected.")
 
             # Create temporary HAR file path
             import tempfile
 
-            self._har_path = Path(tempfile.mktemp(suffix=".har"))
+            # "attach" keeps response bodies as separate entries of a zip archive
+            har_suffix = ".zip" if self.record_har_content == "attach" else ".har"
+            self._har_path = Path(tempfile.mktemp(suffix=har_suffix))
 
             # Create context with HAR recording
+            har_options = {
+                "record_har_path": str(self._har_path),
+                "record_har_mode": "minimal",
+                "record_har_content": self.record_har_content,
+            }
+            if self.record_har_url_filter is not None:
+                har_options["record_har_url_filter"] = self.record_har_url_filter
+
+            # Start from a saved login when one is available
+            storage_state = self._resolve_storage_state(initial_url)
+            if storage_state is not None:
+                har_options["storage_state"] = storage_state
+
             try:
-                self._context = await self._browser.new_context(
-                    record_har_path=str(self._har_path),
-                    record_har_mode="minimal",
-                )
+                self._context = await self._browser.new_context(**har_options)
             except Exception as e:
                 raise BrowserInitializationError(f"Failed to create browser context: {str(e)}")
 
+            # Track in-flight API requests for wait_for_api_idle() and traffic counters for metrics()
+            self._api_tracker.attach(self._context)
+            self._metrics.attach(self._context)
+
+            # Notice redirects to the login page, which mean the saved state has expired
+            if self.login_url_pattern is not None:
+                self._context.on("page", lambda page: page.on("framenavigated", self._on_frame_navigated))
+
+            # Answer requests from a recorded HAR instead of the network
+            if self.replay_har is not None:
+                try:
+                    await self._route_from_har_async(self.replay_har, **self.replay_har_options)
+                except HarProcessingError as e:
+                    raise BrowserInitializationError(f"Failed to load replay HAR: {str(e)}")
+
+            # Wait for background authentication only now that the browser is up
+            if isinstance(self.auth_token, concurrent.futures.Future):
+                self.auth_token = await asyncio.wrap_future(self.auth_token)
+
             # Apply header-based authentication (Bearer token)
             try:
                 auth_handler = get_auth_handler("header")
@@ -130,6 +472,16 @@ class BrowserSession:
             except Exception as e:
                 raise BrowserInitializationError(f"Failed to apply authentication: {str(e)}")
 
+            # Record manual interactions in the page alongside scripted actions
+            if self.record_flow:
+                try:
+                    from .flows import RECORDER_BINDING, RECORDER_SCRIPT
+
+                    await self._context.expose_binding(RECORDER_BINDING, self._on_page_action)
+                    await self._context.add_init_script(RECORDER_SCRIPT)
+                except Exception as e:
+                    raise BrowserInitializationError(f"Failed to install flow recorder: {str(e)}")
+
             # Create page
             try:
                 self._page = await self._context.new_page()
@@ -160,11 +512,14 @@ class BrowserSession:
             BrowserNavigationError: If navigation fails
         """
         if not self._page:
-            raise BrowserSessionError("Browser session not initialized. Call _initialize() first.")
+            raise BrowserSessionError("Browser session not initialized. Call start() first.")
 
         try:
             # Navigate with Authorization header already set
+            started = time.monotonic()
             await self._page.goto(url, wait_until=wait_until, timeout=30000)  # 30 second timeout
+            self._metrics.record_navigation((time.monotonic() - started) * 1000)
+            self._record_step("navigate", url=url, wait_until=wait_until)
 
         except PlaywrightTimeoutError:
             raise BrowserNavigationError(
@@ -203,6 +558,20 @@ class BrowserSession:
         except Exception as e:
             raise BrowserNavigationError(f"Unexpected navigation error for '{url}': {str(e)}")
 
+    async def anavigate(self, url: str, wait_until: str = "load") -> None:
+        """
+        Navigate to a URL with authentication injection (async).
+
+        Args:
+            url: URL to navigate to
+            wait_until: When to consider navigation complete
+                       ("load", "domcontentloaded", "networkidle")
+
+        Raises:
+            BrowserNavigationError: If navigation fails
+        """
+        await self._run_on_session_loop(self._navigate_async(url, wait_until))
+
     def navigate(self, url: str, wait_until: str = "load") -> None:
         """
         Navigate to a URL with authentication injection.
@@ -215,7 +584,7 @@ class BrowserSession:
         Raises:
             BrowserNavigationError: If navigation fails
         """
-        _run_async(self._navigate_async(url, wait_until))
+        self._run_sync(self._navigate_async(url, wait_until))
 
     async def _click_async(self, selector: str, **kwargs) -> None:
         """
@@ -228,7 +597,9 @@ class BrowserSession:
             raise BrowserSessionError("Browser session not initialized.")
 
         try:
-            await self._page.click(selector, **kwargs)
+            with self._scripted_action():
+                await self._page.click(selector, **kwargs)
+            self._record_step("click", selector=selector, **kwargs)
         except PlaywrightTimeoutError:
             raise BrowserSessionError(
                 f"Element not found or not clickable: '{selector}'. "
@@ -237,6 +608,16 @@ class BrowserSession:
         except PlaywrightError as e:
             raise BrowserSessionError(f"Click failed for selector '{selector}': {str(e)}")
 
+    async def aclick(self, selector: str, **kwargs) -> None:
+        """
+        Click an element by selector (async).
+
+        Args:
+            selector: CSS selector for the element
+            **kwargs: Additional options for Playwright click
+        """
+        await self._run_on_session_loop(self._click_async(selector, **kwargs))
+
     def click(self, selector: str, **kwargs) -> None:
         """
         Click an element by selector.
@@ -245,7 +626,7 @@ class BrowserSession:
             selector: CSS selector for the element
             **kwargs: Additional options for Playwright click
         """
-        _run_async(self._click_async(selector, **kwargs))
+        self._run_sync(self._click_async(selector, **kwargs))
 
     async def _fill_async(self, selector: str, value: str, **kwargs) -> None:
         """
@@ -258,7 +639,12 @@ class BrowserSession:
             raise BrowserSessionError("Browser session not initialized.")
 
         try:
-            await self._page.fill(selector, value, **kwargs)
+            with self._scripted_action():
+                await self._page.fill(selector, value, **kwargs)
+            if self.record_flow:
+                self._record_step(
+                    "fill", selector=selector, value=await self._recorded_fill_value(selector, value), **kwargs
+                )
         except PlaywrightTimeoutError:
             raise BrowserSessionError(
                 f"Input element not found: '{selector}'. "
@@ -267,6 +653,17 @@ class BrowserSession:
         except PlaywrightError as e:
             raise BrowserSessionError(f"Fill failed for selector '{selector}': {str(e)}")
 
+    async def afill(self, selector: str, value: str, **kwargs) -> None:
+        """
+        Fill a form field (async).
+
+        Args:
+            selector: CSS selector for the input element
+            value: Value to fill
+            **kwargs: Additional options for Playwright fill
+        """
+        await self._run_on_session_loop(self._fill_async(selector, value, **kwargs))
+
     def fill(self, selector: str, value: str, **kwargs) -> None:
         """
         Fill a form field.
@@ -276,7 +673,7 @@ class BrowserSession:
             value: Value to fill
             **kwargs: Additional options for Playwright fill
         """
-        _run_async(self._fill_async(selector, value, **kwargs))
+        self._run_sync(self._fill_async(selector, value, **kwargs))
 
     async def _wait_for_async(self, selector: Optional[str] = None, timeout: Optional[float] = None) -> None:
         """
@@ -306,6 +703,18 @@ class BrowserSession:
         else:
             raise BrowserSessionError("Must provide either selector or timeout")
 
+        self._record_step("wait_for", selector=selector, timeout=timeout)
+
+    async def await_for_selector(self, selector: Optional[str] = None, timeout: Optional[float] = None) -> None:
+        """
+        Wait for a selector or timeout (async).
+
+        Args:
+            selector: CSS selector to wait for (if None, waits for timeout)
+            timeout: Timeout in milliseconds
+        """
+        await self._run_on_session_loop(self._wait_for_async(selector, timeout))
+
     def wait_for(self, selector: Optional[str] = None, timeout: Optional[float] = None) -> None:
         """
         Wait for a selector or timeout.
@@ -314,83 +723,603 @@ class BrowserSession:
             selector: CSS selector to wait for (if None, waits for timeout)
             timeout: Timeout in milliseconds
         """
-        _run_async(self._wait_for_async(selector, timeout))
+        self._run_sync(self._wait_for_async(selector, timeout))
+
+    async def _new_page_async(self) -> Page:
+        """
+        Open an additional tab in the session's context (its traffic is recorded in the same HAR).
+
+        Raises:
+            BrowserSessionError: If the session is not initialized or the tab cannot be created
+        """
+        if not self._context:
+            raise BrowserSessionError("Browser session not initialized.")
+
+        try:
+            return await self._context.new_page()
+        except Exception as e:
+            raise BrowserSessionError(f"Failed to open a new browser tab: {str(e)}")
+
+    async def acrawl(self, start_url: Optional[str] = None, **crawler_options):
+        """
+        Crawl same-origin links from the current page to discover more APIs (async).
+
+        Args:
+            start_url: URL to start from (default: the current page)
+            **crawler_options: SameOriginCrawler options (max_depth, max_pages, concurrency, ...)
+
+        Returns:
+            CrawlResult with visit counts and the distinct API endpoints observed
+        """
+        from .crawler import SameOriginCrawler
+
+        crawler = SameOriginCrawler(self, **crawler_options)
+        return await self._run_on_session_loop(crawler.acrawl(start_url))
+
+    def crawl(self, start_url: Optional[str] = None, **crawler_options):
+        """
+        Crawl same-origin links from the current page to discover more APIs.
+
+        Pages are visited in concurrent tabs of this session, so all captured
+        traffic ends up in the HAR written by dump_logs().
+
+        Args:
+            start_url: URL to start from (default: the current page)
+            **crawler_options: SameOriginCrawler options (max_depth, max_pages, concurrency, ...)
+
+        Returns:
+            CrawlResult with visit counts and the distinct API endpoints observed
+        """
+        from .crawler import SameOriginCrawler
+
+        crawler = SameOriginCrawler(self, **crawler_options)
+        return self._run_sync(crawler.acrawl(start_url))
+
+    def _resolve_storage_state(self, initial_url: Optional[str]) -> Optional[Union[str, dict]]:
+        """Pick the storage state a new context starts from: explicit state first, then the cache."""
+        if self.storage_state is not None:
+            if isinstance(self.storage_state, dict):
+                return self.storage_state
+            return str(self.storage_state) if Path(self.storage_state).exists() else None
+
+        if self.storage_state_cache is None:
+            return None
+        if self.storage_state_key is None and initial_url:
+            self.storage_state_key = StorageStateCache.key_for(initial_url)
+        if self.storage_state_key is None:
+            return None
+        return self.storage_state_cache.load(self.storage_state_key)
+
+    def _on_frame_navigated(self, frame) -> None:
+        """Track whether the session's pages sit on the login page."""
+        if frame.parent_frame is not None:
+            return
+
+        on_login_page = bool(self.login_url_pattern.search(frame.url))
+        entered_login_page = on_login_page and not self.on_login_page
+        cache, key = self.storage_state_cache, self.storage_state_key
+        if entered_login_page and cache and key and cache.invalidate(key):
+            print(f"Saved login for '{key}' has expired, cached storage state removed")
+        self.on_login_page = on_login_page
+
+    async def _storage_state_async(self) -> dict:
+        if not self._context:
+            raise BrowserSessionError("Browser session not initialized.")
+        try:
+            return await self._context.storage_state()
+        except Exception as e:
+            raise BrowserSessionError(f"Failed to read storage state: {str(e)}")
+
+    async def _persist_storage_state_async(self) -> None:
+        """Save the current login to the cache before the context closes (best effort)."""
+        if self.storage_state_cache is None or self.on_login_page or not self._context:
+            return
+        if self.storage_state_key is None and self._page and self._page.url.startswith(("http://", "https://")):
+            self.storage_state_key = StorageStateCache.key_for(self._page.url)
+        if self.storage_state_key is None:
+            return
+        try:
+            self.storage_state_cache.save(self.storage_state_key, await self._storage_state_async())
+        except Exception as e:
+            # A failed cache write must not lose the capture itself
+            print(f"Warning: could not cache storage state: {e}")
+
+    async def _save_storage_state_async(self, filepath: Optional[Union[str, Path]] = None) -> str:
+        if filepath is None and (self.storage_state_cache is None or self.storage_state_key is None):
+            raise BrowserSessionError("No filepath given and the session has no storage_state_cache/key to save to.")
+
+        state = await self._storage_state_async()
+        try:
+            if filepath is None:
+                return str(self.storage_state_cache.save(self.storage_state_key, state))
+            return str(write_private_json(filepath, state))
+        except OSError as e:
+            raise BrowserSessionError(f"Failed to save storage state: {str(e)}")
+
+    async def asave_storage_state(self, filepath: Optional[Union[str, Path]] = None) -> str:
+        """
+        Save cookies and localStorage of the session (async).
+
+        See ``save_storage_state`` for the argument reference.
+        """
+        return await self._run_on_session_loop(self._save_storage_state_async(filepath))
+
+    def save_storage_state(self, filepath: Optional[Union[str, Path]] = None) -> str:
+        """
+        Save cookies and localStorage of the session so later sessions skip the login.
+
+        The file is written with mode 0o600 since it holds session cookies.
+        Pass it back as ``storage_state=`` to start a new session logged in.
+
+        Args:
+            filepath: Destination JSON file (default: the session's storage_state_cache entry)
+
+        Returns:
+            Path to the saved state
+
+        Raises:
+            BrowserSessionError: If the session is not initialized or there is nowhere to save to
+        """
+        return self._run_sync(self._save_storage_state_async(filepath))
+
+    async def _route_from_har_async(
+        self,
+        har_path: Union[str, Path],
+        url_filter: Optional[Union[str, re.Pattern]] = None,
+        not_found: Literal["abort", "fallback"] = "abort",
+        **match_options,
+    ) -> None:
+        if not self._context:
+            raise BrowserSessionError("Browser session not initialized.")
+        if not_found not in ("abort", "fallback"):
+            raise BrowserSessionError(f"Invalid not_found: {not_found}. Must be one of: abort, fallback")
+
+        if not match_options:
+            # Playwright's own matching (method, URL, body) is all that is needed
+            await self._context.route_from_har(str(har_path), url=url_filter, not_found=not_found)
+            return
+
+        from .har_replay import HarReplayIndex
+
+        index = HarReplayIndex(har_path, **match_options)
+
+        async def _handler(route) -> None:
+            request = route.request
+            response = index.lookup(request.method, request.url, request.post_data_buffer)
+            if response is None:
+                await (route.fallback() if not_found == "fallback" else route.abort())
+                return
+
+            headers: dict[str, str] = {}
+            for name, value in response.headers:
+                if name in headers:
+                    value = headers[name] + ("\n" if name.lower() == "set-cookie" else ", ") + value
+                headers[name] = value
+            await route.fulfill(status=response.status, headers=headers, body=response.body)
+
+        await self._context.route(url_filter or "**/*", _handler)
+
+    async def aroute_from_har(
+        self,
+        har_path: Union[str, Path],
+        url_filter: Optional[Union[str, re.Pattern]] = None,
+        not_found: Literal["abort", "fallback"] = "abort",
+        **match_options,
+    ) -> None:
+        """
+        Serve matching requests from a recorded HAR (async).
+
+        See ``route_from_har`` for the argument reference.
+        """
+        await self._run_on_session_loop(self._route_from_har_async(har_path, url_filter, not_found, **match_options))
+
+    def route_from_har(
+        self,
+        har_path: Union[str, Path],
+        url_filter: Optional[Union[str, re.Pattern]] = None,
+        not_found: Literal["abort", "fallback"] = "abort",
+        **match_options,
+    ) -> None:
+        """
+        Serve matching requests from a recorded HAR instead of the network.
+
+        Flows replayed against a HAR run at full speed and give the same
+        traffic every time, which makes captures reproducible for benchmarks.
+        Without match options Playwright's own HAR routing is used; with them
+        requests are matched by a HarReplayIndex.
+
+        Args:
+            har_path: HAR file recorded with response bodies
+            url_filter: Glob string or regex; only matching requests are served from the HAR
+            not_found: "abort" (default) fails unrecorded requests, "fallback" sends
+                       them to the network
+            **match_options: HarReplayIndex options: match_host, match_query,
+                             ignore_query_params, match_body
+
+        Raises:
+            BrowserSessionError: If the session is not initialized
+            HarProcessingError: If the HAR file cannot be read
+        """
+        self._run_sync(self._route_from_har_async(har_path, url_filter, not_found, **match_options))
+
+    def _record_step(self, action: str, **args) -> None:
+        """Append a successfully performed action to the recorded flow."""
+        if self.record_flow:
+            self._flow_steps.append({"action": action, "args": {k: v for k, v in args.items() if v is not None}})
+
+    @contextlib.contextmanager
+    def _scripted_action(self):
+        """Mark a scripted click/fill so the in-page recorder doesn't record it twice."""
+        self._scripted_actions += 1
+        try:
+            yield
+        finally:
+            self._scripted_actions -= 1
+            self._scripted_action_ended = time.monotonic()
+
+    async def _on_page_action(self, source, action: dict) -> None:
+        """Binding callback receiving manual clicks and field edits from the in-page recorder."""
+        # Ignore echoes of scripted actions, which are recorded by the methods themselves
+        if self._scripted_actions or time.monotonic() - self._scripted_action_ended < 0.5:
+            return
+
+        if action.get("action") == "click":
+            self._record_step("click", selector=action["selector"])
+        elif action.get("action") == "fill":
+            value = action.get("value", "")
+            if action.get("secret"):
+                value = _flow_secret_placeholder(action.get("field"))
+            self._record_step("fill", selector=action["selector"], value=value)
+
+    async def _recorded_fill_value(self, selector: str, value: str) -> str:
+        """Value to record for a scripted fill: a placeholder for password inputs."""
+        try:
+            field = await self._page.eval_on_selector(
+                selector, "el => ({secret: el.type === 'password', field: el.name || el.id})"
+            )
+        except PlaywrightError:
+            # The field is gone (e.g. the fill submitted a form); don't risk writing a secret
+            return _flow_secret_placeholder(None)
+        return _flow_secret_placeholder(field.get("field")) if field.get("secret") else value
+
+    @property
+    def flow(self):
+        """
+        Actions recorded so far as a CaptureFlow (requires ``record_flow=True``).
 
-    async def _dump_logs_async(self, filepath: Union[str, Path]) -> None:
+        Returns:
+            CaptureFlow with one step per recorded action
+        """
+        from .flows import CaptureFlow
+
+        return CaptureFlow.from_dict({"steps": self._flow_steps})
+
+    def save_flow(self, filepath: Union[str, Path], name: Optional[str] = None) -> str:
+        """
+        Save the recorded actions to a portable flow file for headless replay.
+
+        Args:
+            filepath: Destination path for the JSON flow file
+            name: Optional flow name (defaults to the file name stem)
+
+        Returns:
+            Path to the saved flow file
+
+        Raises:
+            BrowserSessionError: If flow recording was not enabled
+        """
+        if not self.record_flow:
+            raise BrowserSessionError("Flow recording is disabled. Launch the session with record_flow=True.")
+
+        flow = self.flow
+        flow.name = name or Path(filepath).stem
+        return flow.save(filepath)
+
+    def metrics(self) -> CaptureMetrics:
+        """
+        Snapshot of the session's capture metrics.
+
+        Counters are updated from Playwright request/response events as they
+        arrive, so this is cheap to call while capturing (e.g. to show progress
+        or to decide when enough API traffic has been recorded).
+
+        Returns:
+            CaptureMetrics with navigation timings, request/response counts by
+            resource type, bytes received, the API vs static split, failed and
+            blocked requests and the running HarProcessor cost estimate
+        """
+        return self._metrics.snapshot()
+
+    async def _wait_for_api_idle_async(
+        self,
+        idle_ms: float = 500,
+        max_ms: float = 10000,
+        url_filter: Optional[Union[str, re.Pattern, Callable[[str], bool]]] = None,
+    ) -> float:
+        """
+        Internal async wait_for_api_idle method, recorded as a flow step.
+
+        Raises:
+            BrowserSessionError: If the session is not initialized
+        """
+        waited = await self._api_idle_async(idle_ms, max_ms, url_filter)
+        self._record_step(
+            "wait_for_api_idle",
+            idle_ms=idle_ms,
+            max_ms=max_ms,
+            url_filter=url_filter if isinstance(url_filter, str) else None,
+        )
+        return waited
+
+    async def _api_idle_async(
+        self,
+        idle_ms: float = 500,
+        max_ms: float = 10000,
+        url_filter: Optional[Union[str, re.Pattern, Callable[[str], bool]]] = None,
+        page: Optional[Page] = None,
+    ) -> float:
+        """
+        Wait for API traffic to go quiet without recording a flow step.
+
+        Used by the crawler and the capture farm, whose waits belong to their
+        own navigation rather than to the user's flow.
+
+        Args:
+            page: Only consider requests made by this page (default: the whole context)
+
+        Raises:
+            BrowserSessionError: If the session is not initialized
+        """
+        if not self._context:
+            raise BrowserSessionError("Browser session not initialized.")
+
+        matches = _request_matcher(url_filter, page)
+        loop = asyncio.get_running_loop()
+        started = last_activity = loop.time()
+        idle_seconds, max_seconds = idle_ms / 1000, max_ms / 1000
+        activity = asyncio.Event()
+
+        def _on_activity(request: Request) -> None:
+            nonlocal last_activity
+            if matches(request):
+                last_activity = loop.time()
+                activity.set()
+
+        self._api_tracker.listeners.append(_on_activity)
+        try:
+            while True:
+                now = loop.time()
+                remaining = started + max_seconds - now
+                if remaining <= 0:
+                    break
+
+                pending = self._api_tracker.pending(matches)
+                quiet_for = now - last_activity
+                if not pending and quiet_for >= idle_seconds:
+                    break
+
+                # Sleep until the idle window could elapse, or until API activity wakes us up
+                timeout = remaining if pending else min(idle_seconds - quiet_for, remaining)
+                activity.clear()
+                try:
+                    await asyncio.wait_for(activity.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._api_tracker.listeners.remove(_on_activity)
+
+        return (loop.time() - started) * 1000
+
+    async def await_api_idle(
+        self,
+        idle_ms: float = 500,
+        max_ms: float = 10000,
+        url_filter: Optional[Union[str, re.Pattern, Callable[[str], bool]]] = None,
+    ) -> float:
+        """
+        Wait until no fetch/XHR traffic has happened for ``idle_ms`` (async).
+
+        See ``wait_for_api_idle`` for the argument reference.
+        """
+        return await self._run_on_session_loop(self._wait_for_api_idle_async(idle_ms, max_ms, url_filter))
+
+    def wait_for_api_idle(
+        self,
+        idle_ms: float = 500,
+        max_ms: float = 10000,
+        url_filter: Optional[Union[str, re.Pattern, Callable[[str], bool]]] = None,
+    ) -> float:
+        """
+        Wait until no fetch/XHR traffic has happened for ``idle_ms``.
+
+        Returns as soon as the API traffic of the session is quiet instead of
+        sleeping for a fixed period. In-flight requests are tracked from
+        Playwright's request events, so a slow request keeps the wait open
+        until it finishes or fails.
+
+        Args:
+            idle_ms: Required quiet window in milliseconds (default: 500)
+            max_ms: Upper bound on the wait in milliseconds (default: 10000)
+            url_filter: Only consider requests whose URL matches this regex string,
+                        compiled pattern or predicate
+
+        Returns:
+            Time actually waited, in milliseconds (``max_ms`` or more means the
+            traffic never went idle)
+        """
+        return self._run_sync(self._wait_for_api_idle_async(idle_ms, max_ms, url_filter))
+
+    async def _dump_logs_async(
+        self,
+        filepath: Union[str, Path],
+        filtered: bool = False,
+        filtered_filepath: Optional[Union[str, Path]] = None,
+        keep_raw: bool = True,
+    ) -> Optional[HarStats]:
         """
         Internal async dump_logs method with error handling.
 
         Raises:
             BrowserSessionError: If log dumping fails
+            HarProcessingError: If filtering fails (the raw HAR is still saved when keep_raw=True)
         """
         if not self._context:
             raise BrowserSessionError("Browser session not initialized.")
 
+        if not filtered and not keep_raw:
+            raise BrowserSessionError("keep_raw=False requires filtered=True, otherwise nothing would be saved.")
+
+        if filtered and self.record_har_content == "attach":
+            raise BrowserSessionError(
+                "Filtered dumps require record_har_content='embed' or 'omit' (an 'attach' capture is a zip archive)."
+            )
+
+        await self._persist_storage_state_async()
+
         try:
             # Close context to finalize HAR recording
             await self._context.close()
         except Exception as e:
             raise BrowserSessionError(f"Failed to close browser context: {str(e)}")
 
-        # Copy HAR file to destination with enhanced error handling
-        try:
-            if self._har_path and self._har_path.exists():
-                import shutil
-
-                # Ensure destination directory exists
-                dest_path = Path(filepath)
-                dest_path.parent.mkdir(parents=True, exist_ok=True)
-
-                shutil.copy(self._har_path, filepath)
-
-                # Verify the copy was successful
-                if not dest_path.exists():
-                    raise BrowserSessionError(f"Failed to create HAR file at: '{filepath}'")
-
-                # Provide immediate feedback about HAR size post-save
-                file_size_mb = dest_path.stat().st_size / (1024 * 1024)
-                print(f"HAR file saved to '{dest_path}' ({file_size_mb:.1f} MB)")
-                if file_size_mb > 100:
-                    print("⚠️  Large HAR files (>100 MB) may lead to unexpected upload issues.")
-                    print(
-                        "   Consider using the filtering utilities in 'zapi.har_processing' to trim the HAR before uploading."
-                    )
+        # Mark context as closed
+        self._context = None
+        self._page = None
 
-                # Clean up temporary file
+        if not self._har_path or not self._har_path.exists():
+            raise BrowserSessionError(
+                "HAR file not found. Session may not have been properly initialized or no network activity was recorded."
+            )
+
+        # File moves and filtering are blocking work: keep them off the event loop
+        return await asyncio.to_thread(self._write_har_outputs, Path(filepath), filtered, filtered_filepath, keep_raw)
+
+    def _write_har_outputs(
+        self,
+        dest_path: Path,
+        filtered: bool,
+        filtered_filepath: Optional[Union[str, Path]],
+        keep_raw: bool,
+    ) -> Optional[HarStats]:
+        """
+        Move the recorded HAR into place, optionally writing a filtered copy from the same single read.
+
+        Returns:
+            HarStats when filtering, None otherwise
+        """
+        stats = None
+        try:
+            # Ensure destination directory exists
+            dest_path.parent.mkdir(parents=True, exist_ok=True)
+
+            if filtered:
+                if filtered_filepath is None:
+                    # Same naming convention as analyze_har_file(); without a raw copy the filtered HAR takes its place
+                    filtered_filepath = f"{dest_path.with_suffix('')}_filtered.har" if keep_raw else dest_path
+                filtered_path = Path(filtered_filepath)
+                filtered_path.parent.mkdir(parents=True, exist_ok=True)
+
+                try:
+                    processor = HarProcessor(str(self._har_path))
+                    stats = processor.load_and_process()
+                    if stats.valid_entries > 0:
+                        processor.save_filtered_har(str(filtered_path))
+                        print(f"Filtered HAR saved to '{filtered_path}' ({stats.valid_entries:,} API entries)")
+                    else:
+                        print("ℹ️  No API-relevant entries found - filtered HAR not written.")
+                except HarProcessingError:
+                    if keep_raw:
+                        # Never lose the capture because filtering failed
+                        _move_file(self._har_path, dest_path)
+                    raise
+
+            if not keep_raw:
                 self._har_path.unlink()
-            else:
-                raise BrowserSessionError(
-                    "HAR file not found. Session may not have been properly initialized "
-                    "or no network activity was recorded."
-                )
+                return stats
+
+            _move_file(self._har_path, dest_path)
+
+            # Verify the move was successful
+            if not dest_path.exists():
+                raise BrowserSessionError(f"Failed to create HAR file at: '{dest_path}'")
+
+            # Provide immediate feedback about HAR size post-save
+            file_size_mb = dest_path.stat().st_size / (1024 * 1024)
+            print(f"HAR file saved to '{dest_path}' ({file_size_mb:.1f} MB)")
+            if self._har_path.suffix == ".zip" and dest_path.suffix.lower() != ".zip":
+                print("ℹ️  record_har_content='attach' produces a zip archive (HAR + response bodies).")
+            if file_size_mb > 100 and not filtered:
+                print("⚠️  Large HAR files (>100 MB) may lead to unexpected upload issues.")
+                print("   Consider dump_logs(..., filtered=True) to write an API-only HAR before uploading,")
+                print("   or upload_har(..., max_shard_bytes=...) to upload it as smaller shards in parallel.")
+
+            return stats
+        except (BrowserSessionError, HarProcessingError):
+            raise
         except PermissionError:
             raise BrowserSessionError(
-                f"Permission denied writing to: '{filepath}'. Please check file permissions and directory access."
+                f"Permission denied writing to: '{dest_path}'. Please check file permissions and directory access."
             )
         except FileNotFoundError:
-            raise BrowserSessionError(f"Destination directory does not exist: '{Path(filepath).parent}'")
+            raise BrowserSessionError(f"Destination directory does not exist: '{dest_path.parent}'")
         except Exception as e:
-            raise BrowserSessionError(f"Failed to save HAR file to '{filepath}': {str(e)}")
-
-        # Mark context as closed
-        self._context = None
-        self._page = None
+            raise BrowserSessionError(f"Failed to save HAR file to '{dest_path}': {str(e)}")
+
+    async def adump_logs(
+        self,
+        filepath: Union[str, Path],
+        filtered: bool = False,
+        filtered_filepath: Optional[Union[str, Path]] = None,
+        keep_raw: bool = True,
+    ) -> Optional[HarStats]:
+        """
+        Export captured network logs to a HAR file (async).
 
-    def dump_logs(self, filepath: Union[str, Path]) -> None:
+        See ``dump_logs`` for the argument reference.
+        """
+        return await self._run_on_session_loop(
+            self._dump_logs_async(filepath, filtered=filtered, filtered_filepath=filtered_filepath, keep_raw=keep_raw)
+        )
+
+    def dump_logs(
+        self,
+        filepath: Union[str, Path],
+        filtered: bool = False,
+        filtered_filepath: Optional[Union[str, Path]] = None,
+        keep_raw: bool = True,
+    ) -> Optional[HarStats]:
         """
         Export captured network logs to a HAR file.
 
+        The recorded HAR is moved into place (``os.replace`` on the same filesystem)
+        rather than copied. With ``filtered=True`` the HarProcessor filter pipeline
+        runs over the same single read and writes an API-only HAR as well.
+
         Args:
             filepath: Path where to save the HAR file
+            filtered: Also write an API-only HAR and return its statistics
+            filtered_filepath: Path for the filtered HAR (default: "<filepath stem>_filtered.har",
+                               or ``filepath`` itself when keep_raw=False)
+            keep_raw: Keep the unfiltered HAR at ``filepath`` (default: True)
+
+        Returns:
+            HarStats for the capture when filtered=True, None otherwise
+
+        Raises:
+            BrowserSessionError: If the HAR cannot be saved
+            HarProcessingError: If filtering fails (the raw HAR is still saved when keep_raw=True)
         """
-        _run_async(self._dump_logs_async(filepath))
+        return self._run_sync(
+            self._dump_logs_async(filepath, filtered=filtered, filtered_filepath=filtered_filepath, keep_raw=keep_raw)
+        )
 
     async def _close_async(self) -> None:
         """Internal async close method."""
         if self._context:
+            await self._persist_storage_state_async()
             await self._context.close()
 
-        if self._browser:
+        if self._browser and self._owns_browser:
             await self._browser.close()
 
         if self._playwright:
@@ -405,11 +1334,47 @@ class BrowserSession:
         self._browser = None
         self._playwright = None
 
+    async def _set_auth_token_async(self, token: str) -> None:
+        self.auth_token = token
+        if self._context is not None:
+            await get_auth_handler("header")(self._context, token)
+
+    def update_auth_token(self, token: str) -> None:
+        """
+        Replace the Bearer token sent with every request of this session.
+
+        Safe to call from any thread; the new header applies to open pages too.
+        ZAPI calls this on its live sessions whenever it refreshes its token.
+
+        Args:
+            token: New authentication token
+        """
+        if self._loop is None or self._context is None:
+            self.auth_token = token
+            return
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            # Called on the session's own loop: blocking would deadlock it
+            self.auth_token = token
+            running.create_task(self._set_auth_token_async(token))
+            return
+        self._run_sync(self._set_auth_token_async(token))
+
+    async def aclose(self) -> None:
+        """
+        Close the browser session and cleanup resources (async).
+        """
+        await self._run_on_session_loop(self._close_async())
+
     def close(self) -> None:
         """
         Close the browser session and cleanup resources.
         """
-        _run_async(self._close_async())
+        self._run_sync(self._close_async())
 
     def __enter__(self):
         """Context manager entry."""
@@ -426,5 +1391,5 @@ class BrowserSession:
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
-        await self._close_async()
+        await self._run_on_session_loop(self._close_async())
         return False
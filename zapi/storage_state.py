@@ -0,0 +1,142 @@
+"""On-disk cache of Playwright storage state (cookies, localStorage) for reusing logins."""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional, Union
+from urllib.parse import urlparse
+
+# Default lifetime of a cached login (12 hours)
+DEFAULT_STORAGE_STATE_TTL_SECONDS = 12 * 60 * 60
+
+
+def default_cache_dir(name: str = "storage_state") -> Path:
+    """Return ``$XDG_CACHE_HOME/zapi/<name>`` (``~/.cache/zapi/<name>`` by default)."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "zapi" / name
+
+
+def write_private_json(filepath: Union[str, Path], data: Any) -> Path:
+    """
+    Atomically write JSON readable by the current user only (mode 0o600).
+
+    Storage state and auth tokens are credentials, so they must never be world readable.
+
+    Args:
+        filepath: Destination path
+        data: JSON-serializable data
+
+    Returns:
+        Path to the written file
+    """
+    dest_path = Path(filepath)
+    dest_path.parent.mkdir(parents=True, exist_ok=True)
+    # A temp file per writer, so concurrent writers of one key never share it
+    fd, tmp_name = tempfile.mkstemp(dir=dest_path.parent, prefix=f".{dest_path.name}.", suffix=".tmp")
+    tmp_path = Path(tmp_name)
+    try:
+        if hasattr(os, "fchmod"):
+            os.fchmod(fd, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, dest_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return dest_path
+
+
+class StorageStateCache:
+    """
+    Expiring cache of browser storage state, one private JSON file per key.
+
+    Keys are usually the origin of the application ("https://app.example.com"),
+    so every session against that application starts already logged in until
+    the entry expires or the session detects a redirect to the login page.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Union[str, Path]] = None,
+        ttl_seconds: float = DEFAULT_STORAGE_STATE_TTL_SECONDS,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding cached states (default: ~/.cache/zapi/storage_state)
+            ttl_seconds: How long a saved state is reused (default: 12 hours)
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        """Return the cache key (origin) for a URL."""
+        parsed = urlparse(url)
+        return f"{parsed.scheme.lower()}://{parsed.netloc.lower()}"
+
+    def path_for(self, key: str) -> Path:
+        """Return the file used to store ``key``."""
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+        return self.cache_dir / f"{digest}.json"
+
+    def load(self, key: str) -> Optional[dict[str, Any]]:
+        """
+        Return the cached storage state for ``key``.
+
+        Expired or unreadable entries are removed and reported as missing.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Playwright storage state dictionary, or None when there is no fresh entry
+        """
+        path = self.path_for(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+            saved_at = float(entry["saved_at"])
+            state = entry["storage_state"]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError):
+            self.invalidate(key)
+            return None
+
+        if time.time() - saved_at > self.ttl_seconds:
+            self.invalidate(key)
+            return None
+        return state
+
+    def save(self, key: str, state: dict[str, Any]) -> Path:
+        """
+        Store a storage state for ``key``.
+
+        Args:
+            key: Cache key
+            state: Playwright storage state dictionary
+
+        Returns:
+            Path to the cache file
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+        entry = {"key": key, "saved_at": time.time(), "storage_state": state}
+        return write_private_json(self.path_for(key), entry)
+
+    def invalidate(self, key: str) -> bool:
+        """
+        Remove the cached state for ``key``.
+
+        Returns:
+            True if an entry was removed
+        """
+        try:
+            self.path_for(key).unlink()
+            return True
+        except FileNotFoundError:
+            return False
@@ -0,0 +1,177 @@
+"""On-disk cache of ZAPI auth tokens so repeated ZAPI() construction skips the network."""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+from .storage_state import default_cache_dir, write_private_json
+
+# Tokens are treated as expired this long before their exp claim
+DEFAULT_TOKEN_REFRESH_MARGIN_SECONDS = 5 * 60
+
+# Lifetime assumed for tokens without a readable exp claim
+DEFAULT_TOKEN_FALLBACK_TTL_SECONDS = 15 * 60
+
+# scrypt cost of the secret verifier stored with each entry (16 MB, tens of milliseconds)
+_SCRYPT_PARAMS = {"n": 2**14, "r": 8, "p": 1}
+
+
+def _secret_verifier(secret: str, salt: bytes) -> str:
+    """Slow salted hash of a client secret, so a cache file does not allow fast offline guessing."""
+    return hashlib.scrypt(secret.encode(), salt=salt, dklen=32, **_SCRYPT_PARAMS).hex()
+
+
+def token_expiry(token: str) -> Optional[float]:
+    """
+    Read the expiry time from a JWT's ``exp`` claim.
+
+    The signature is not verified: the value only decides when to fetch a
+    new token, the backend still validates every request.
+
+    Args:
+        token: JWT string
+
+    Returns:
+        Expiry as a Unix timestamp, or None if the token carries no readable exp claim
+    """
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except (IndexError, ValueError, KeyError, TypeError):
+        return None
+
+
+@dataclass
+class CachedToken:
+    """Auth token with the identity it was validated for."""
+
+    token: str
+    org_id: str
+    email: str
+    expires_at: float
+
+    def expires_in(self) -> float:
+        """Seconds until the token expires."""
+        return self.expires_at - time.time()
+
+
+class TokenCache:
+    """
+    Expiring cache of auth tokens, one private JSON file per client.
+
+    Entries are keyed by the API base URL and client ID. The secret is never
+    written to disk: each entry carries a salted scrypt verifier of it, so a
+    rotated secret never reuses a token issued for the old one, and a cache
+    file does not allow fast offline guessing of the secret. Files are written
+    with mode 0o600.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Union[str, Path]] = None,
+        refresh_margin_seconds: float = DEFAULT_TOKEN_REFRESH_MARGIN_SECONDS,
+        fallback_ttl_seconds: float = DEFAULT_TOKEN_FALLBACK_TTL_SECONDS,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding cached tokens (default: ~/.cache/zapi/tokens)
+            refresh_margin_seconds: Tokens expiring within this window are not served
+                                    (default: 5 minutes)
+            fallback_ttl_seconds: Lifetime assumed for tokens without an exp claim
+                                  (default: 15 minutes)
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir("tokens")
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.fallback_ttl_seconds = fallback_ttl_seconds
+
+    @staticmethod
+    def key_for(base_url: str, client_id: str) -> str:
+        """Return the cache key for a client."""
+        return hashlib.sha256(f"{base_url}\n{client_id}".encode()).hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        """Return the file used to store ``key``."""
+        return self.cache_dir / f"{key[:32]}.json"
+
+    def load(self, key: str, secret: str) -> Optional[CachedToken]:
+        """
+        Return the cached token for ``key`` if it is not about to expire.
+
+        Expired or unreadable entries, and entries saved for another secret,
+        are removed and reported as missing.
+
+        Args:
+            key: Cache key from key_for()
+            secret: Client secret the token must have been issued for
+
+        Returns:
+            The cached token, or None when there is no fresh entry
+        """
+        path = self.path_for(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+            if entry.pop("key") != key:
+                return None
+            salt = bytes.fromhex(entry.pop("secret_salt"))
+            verifier = entry.pop("secret_verifier")
+            cached = CachedToken(**entry)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError):
+            self.invalidate(key)
+            return None
+
+        if not hmac.compare_digest(verifier, _secret_verifier(secret, salt)):
+            # Issued for a previous secret
+            self.invalidate(key)
+            return None
+
+        if cached.expires_in() <= self.refresh_margin_seconds:
+            self.invalidate(key)
+            return None
+        return cached
+
+    def save(self, key: str, secret: str, token: str, org_id: str, email: str) -> CachedToken:
+        """
+        Store a validated token for ``key``.
+
+        Args:
+            key: Cache key from key_for()
+            secret: Client secret the token was issued for (only a verifier is stored)
+            token: Auth token
+            org_id: Organization ID the token was validated for
+            email: User email the token was validated for
+
+        Returns:
+            The cached entry
+        """
+        expires_at = token_expiry(token) or time.time() + self.fallback_ttl_seconds
+        cached = CachedToken(token=token, org_id=org_id, email=email, expires_at=expires_at)
+        salt = os.urandom(16)
+        entry = {"key": key, "secret_salt": salt.hex(), "secret_verifier": _secret_verifier(secret, salt)}
+        self.cache_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+        write_private_json(self.path_for(key), {**entry, **asdict(cached)})
+        return cached
+
+    def invalidate(self, key: str) -> bool:
+        """
+        Remove the cached token for ``key``.
+
+        Returns:
+            True if an entry was removed
+        """
+        try:
+            self.path_for(key).unlink()
+            return True
+        except FileNotFoundError:
+            return False
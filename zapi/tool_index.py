@@ -0,0 +1,135 @@
+"""Local BM25 search over the documented API catalog, used to pick the tools relevant to a query."""
+
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+# Weight of each API field in the index: a term in the title counts three times
+DEFAULT_FIELD_WEIGHTS = {"title": 3, "path": 2, "api_type": 1, "description": 1}
+
+# Words too common in API descriptions to tell tools apart
+_STOPWORDS = frozenset(
+    [
+        "a",
+        "an",
+        "and",
+        "are",
+        "as",
+        "at",
+        "be",
+        "by",
+        "for",
+        "from",
+        "in",
+        "into",
+        "is",
+        "it",
+        "of",
+        "on",
+        "or",
+        "the",
+        "this",
+        "that",
+        "to",
+        "with",
+        "api",
+        "apis",
+        "endpoint",
+    ]
+)
+
+_CAMEL_BOUNDARY = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Split text into lowercase index terms.
+
+    camelCase and snake_case identifiers and URL paths are split into words,
+    so ``/v1/userAccounts/{account_id}`` yields ``v1 user accounts account id``.
+    """
+    return [word for word in _WORD.findall(_CAMEL_BOUNDARY.sub(" ", text).lower()) if word not in _STOPWORDS]
+
+
+@dataclass
+class ToolMatch:
+    """An API returned by ToolIndex.search(), with its relevance score."""
+
+    api: dict[str, Any]
+    score: float
+
+
+class ToolIndex:
+    """
+    In-memory BM25 index over API titles, descriptions, paths and methods.
+
+    Term weights are computed once when the index is built, so a search only
+    sums precomputed weights over the query terms' postings and keeps the
+    top k. That takes well under a millisecond for catalogs of a few thousand
+    APIs, with no external service.
+    """
+
+    def __init__(
+        self,
+        apis: list[dict[str, Any]],
+        k1: float = 1.2,
+        b: float = 0.75,
+        field_weights: Optional[dict[str, int]] = None,
+    ):
+        """
+        Build the index.
+
+        Args:
+            apis: API descriptions, as returned by the catalog listing
+            k1: BM25 term frequency saturation
+            b: BM25 document length normalization
+            field_weights: How many times each field's terms are counted
+                           (default: title 3, path 2, method and description 1)
+        """
+        self.apis = list(apis)
+        weights = DEFAULT_FIELD_WEIGHTS if field_weights is None else field_weights
+
+        documents = []
+        for api in self.apis:
+            terms: Counter[str] = Counter()
+            for field_name, weight in weights.items():
+                for term in tokenize(str(api.get(field_name) or "")):
+                    terms[term] += weight
+            documents.append(terms)
+
+        lengths = [sum(terms.values()) for terms in documents]
+        average_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+        document_frequency: Counter[str] = Counter(term for terms in documents for term in terms)
+
+        # term -> [(api position, BM25 weight of the term in that API)]
+        self._postings: dict[str, list[tuple[int, float]]] = defaultdict(list)
+        for position, (terms, length) in enumerate(zip(documents, lengths)):
+            norm = k1 * (1 - b + b * length / average_length) if average_length else k1
+            for term, frequency in terms.items():
+                idf = math.log(1 + (len(documents) - document_frequency[term] + 0.5) / (document_frequency[term] + 0.5))
+                self._postings[term].append((position, idf * frequency * (k1 + 1) / (frequency + norm)))
+
+    def __len__(self) -> int:
+        return len(self.apis)
+
+    def search(self, query: str, k: int = 5) -> list[ToolMatch]:
+        """
+        Find the APIs most relevant to a query.
+
+        Args:
+            query: Free text, typically the user's message
+            k: Maximum number of results
+
+        Returns:
+            Up to k matches, best first; APIs sharing no term with the query are left out
+        """
+        scores: dict[int, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            for position, weight in self._postings.get(term, ()):
+                scores[position] += weight
+        best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [ToolMatch(api=self.apis[position], score=score) for position, score in best]
@@ -0,0 +1,172 @@
+"""Pooled, retrying HTTP transport for ZAPI backend calls."""
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Optional, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+if TYPE_CHECKING:
+    import httpx
+
+# Statuses worth retrying: rate limiting and transient server/gateway errors
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# (connect, read) timeout applied when a call does not pass its own
+DEFAULT_TIMEOUT = (10.0, 30.0)
+
+Timeout = Union[float, tuple[float, Optional[float]]]
+
+
+def retry_after_seconds(response: Union[requests.Response, "httpx.Response"]) -> Optional[float]:
+    """
+    Parse a response's Retry-After header (requests or httpx response).
+
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def is_retryable_status(status_code: int) -> bool:
+    """True for responses worth sending again: rate limiting and transient server errors."""
+    return status_code in RETRY_STATUSES
+
+
+def retry_delay(
+    attempt: int,
+    backoff_base_seconds: float,
+    backoff_max_seconds: float,
+    response: Optional[Union[requests.Response, "httpx.Response"]] = None,
+) -> float:
+    """
+    Delay before retry number ``attempt`` (starting at 1).
+
+    A Retry-After header on ``response`` wins over the jittered exponential
+    backoff; both are capped at ``backoff_max_seconds``. Shared by
+    ZAPITransport and AsyncZAPI so both clients back off the same way.
+    """
+    if response is not None:
+        retry_after = retry_after_seconds(response)
+        if retry_after is not None:
+            return min(backoff_max_seconds, retry_after)
+    delay = min(backoff_max_seconds, backoff_base_seconds * 2 ** (attempt - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class ZAPITransport:
+    """
+    Keep-alive connection pool with retries, shared by one ZAPI instance.
+
+    Requests are retried on 429 and 5xx responses and on connection errors
+    (refused or reset connections, connect timeouts) with jittered exponential
+    backoff. A Retry-After header on the response takes precedence over the
+    computed delay. Read timeouts are not retried, since the server may have
+    acted on the request.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 4,
+        pool_maxsize: int = 16,
+        max_retries: int = 3,
+        backoff_base_seconds: float = 0.5,
+        backoff_max_seconds: float = 30.0,
+        timeout: Timeout = DEFAULT_TIMEOUT,
+    ):
+        """
+        Initialize the transport.
+
+        Args:
+            pool_connections: Number of hosts with a cached connection pool
+            pool_maxsize: Connections kept alive per host (size it to the largest
+                          number of parallel uploads)
+            max_retries: Retries after the first attempt (0 disables retrying)
+            backoff_base_seconds: Delay before the first retry, doubled on every retry
+            backoff_max_seconds: Upper bound on a single retry delay, including Retry-After
+            timeout: Default (connect, read) timeout in seconds
+        """
+        self.max_retries = max_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def retry_delay(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """Delay before retry number ``attempt`` (starting at 1)."""
+        return retry_delay(attempt, self.backoff_base_seconds, self.backoff_max_seconds, response)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        timeout: Optional[Timeout] = None,
+        retry: bool = True,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        Send a request, retrying transient failures.
+
+        Args:
+            method: HTTP method
+            url: Absolute URL
+            timeout: (connect, read) timeout; defaults to the transport's timeout
+            retry: Set to False for requests whose body cannot be sent twice
+                   (streamed uploads)
+            **kwargs: Passed to requests.Session.request
+
+        Returns:
+            The final response, which may still carry a retryable status once
+            retries are exhausted
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails after all retries
+        """
+        timeout = self.timeout if timeout is None else timeout
+        retries = self.max_retries if retry else 0
+
+        attempt = 0
+        while True:
+            try:
+                response = self.session.request(method, url, timeout=timeout, **kwargs)
+            except requests.exceptions.ConnectionError:
+                # Includes connect timeouts and connections reset before a response
+                if attempt >= retries:
+                    raise
+                attempt += 1
+                time.sleep(self.retry_delay(attempt))
+                continue
+
+            if not is_retryable_status(response.status_code) or attempt >= retries:
+                return response
+            response.close()
+            attempt += 1
+            time.sleep(self.retry_delay(attempt, response))
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Send a GET request (see request())."""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """Send a POST request (see request())."""
+        return self.request("POST", url, **kwargs)
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self.session.close()
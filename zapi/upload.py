@@ -0,0 +1,565 @@
+"""Streaming upload helpers for large HAR files."""
+
+import hashlib
+import io
+import json
+import os
+import random
+import threading
+import time
+import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Callable, Literal, Optional, Union
+
+import requests
+
+from .storage_state import write_private_json
+
+try:
+    import zstandard
+
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+# Size of the blocks read from the HAR file while streaming
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Slowest upload bandwidth (bytes/s) the timeouts allow for before giving up
+MIN_UPLOAD_BANDWIDTH = 256 * 1024
+
+# Files smaller than this are sent uncompressed: the saving can't pay for the extra work
+MIN_COMPRESS_BYTES = 64 * 1024
+
+ProgressCallback = Callable[[int, int], None]
+
+UploadCompression = Literal["gzip", "zstd", "auto"]
+
+# Content type and filename suffix of the file part for each compression codec
+COMPRESSION_FORMATS = {
+    "gzip": ("application/gzip", ".gz"),
+    "zstd": ("application/zstd", ".zst"),
+}
+
+
+@dataclass
+class UploadStats:
+    """Byte counts of an upload."""
+
+    raw_bytes: int
+    sent_bytes: int
+    content_encoding: Optional[str]
+    elapsed_seconds: float
+
+    @property
+    def compression_ratio(self) -> float:
+        """How many times smaller the sent body was than the raw file."""
+        return self.raw_bytes / self.sent_bytes if self.sent_bytes else 0.0
+
+
+def resolve_compression(compression: Optional[UploadCompression], file_size: int) -> Optional[str]:
+    """
+    Pick the codec for a file of ``file_size`` bytes.
+
+    Args:
+        compression: "gzip", "zstd", "auto" (zstd when installed, else gzip) or None
+        file_size: Size of the file to upload
+
+    Returns:
+        "gzip", "zstd", or None when the file should be sent as is
+
+    Raises:
+        ValueError: If the codec is unknown or zstd is requested but not installed
+    """
+    if compression is None:
+        return None
+    if compression != "auto" and compression not in COMPRESSION_FORMATS:
+        raise ValueError(f"Invalid compression: {compression}. Must be one of: gzip, zstd, auto")
+    if compression == "zstd" and not HAS_ZSTD:
+        raise ValueError("zstd compression requires the 'zstandard' package (pip install zapi[zstd])")
+    if file_size < MIN_COMPRESS_BYTES:
+        return None
+    if compression == "auto":
+        return "zstd" if HAS_ZSTD else "gzip"
+    return compression
+
+
+class CompressingReader:
+    """Readable that compresses another binary stream block by block, without a temp file."""
+
+    def __init__(self, fileobj: BinaryIO, codec: str, total_bytes: int = 0, level: Optional[int] = None):
+        """
+        Initialize the reader.
+
+        Args:
+            fileobj: Uncompressed source stream
+            codec: "gzip" or "zstd"
+            total_bytes: Size of the source, used for progress reporting
+            level: Compression level (default: 6 for gzip, 3 for zstd)
+        """
+        self._fileobj = fileobj
+        if codec == "gzip":
+            # wbits=31 writes the gzip header and trailer
+            compressor = zlib.compressobj(6 if level is None else level, zlib.DEFLATED, 31)
+            self._compress, self._flush = compressor.compress, compressor.flush
+        else:
+            compressor = zstandard.ZstdCompressor(level=3 if level is None else level).compressobj()
+            self._compress, self._flush = compressor.compress, compressor.flush
+        self._finished = False
+        self.raw_bytes = 0
+        self.total_bytes = total_bytes
+
+    def read(self, size: int) -> bytes:
+        """Return the next compressed bytes (possibly fewer than ``size``; b"" at the end)."""
+        while not self._finished:
+            block = self._fileobj.read(size)
+            if not block:
+                self._finished = True
+                return self._flush()
+            self.raw_bytes += len(block)
+            compressed = self._compress(block)
+            if compressed:
+                return compressed
+        return b""
+
+    def close(self) -> None:
+        """Close the source stream."""
+        self._fileobj.close()
+
+
+def upload_timeout(
+    total_bytes: int,
+    connect_timeout: float = 10.0,
+    base_timeout: float = 60.0,
+    min_bandwidth: int = MIN_UPLOAD_BANDWIDTH,
+) -> tuple[float, float]:
+    """
+    Compute (connect, read) timeouts for uploading ``total_bytes``.
+
+    The read timeout grows with the file so large HARs on slow links are not
+    cut off by a fixed limit, while small uploads keep the 60 second default.
+
+    Args:
+        total_bytes: Size of the request body
+        connect_timeout: Connection timeout in seconds
+        base_timeout: Minimum read timeout in seconds
+        min_bandwidth: Slowest acceptable bandwidth in bytes per second
+
+    Returns:
+        Tuple usable as the ``timeout`` argument of requests
+    """
+    return connect_timeout, max(base_timeout, base_timeout + total_bytes / min_bandwidth)
+
+
+class StreamingMultipartEncoder:
+    """
+    File-like multipart/form-data body that streams a file from disk.
+
+    ``requests`` reads the body in small blocks through ``read()`` and sends a
+    ``Content-Length`` taken from ``len()``, so memory use stays flat no matter
+    how large the file is (``requests.post(files=...)`` builds the whole body
+    in memory first). When the file part is compressed on the fly its size is
+    not known up front: send ``iter(encoder)`` instead, which uses chunked
+    transfer encoding.
+    """
+
+    def __init__(
+        self,
+        fields: dict[str, str],
+        file_field: str,
+        filename: str,
+        fileobj: BinaryIO,
+        file_size: Optional[int],
+        file_content_type: str = "application/json",
+        progress_callback: Optional[ProgressCallback] = None,
+    ):
+        """
+        Initialize the encoder.
+
+        Args:
+            fields: Plain form fields sent before the file
+            file_field: Form field name of the file part
+            filename: File name reported in the file part
+            fileobj: Binary file object (or CompressingReader) positioned at the start of the content
+            file_size: Number of bytes that will be read from ``fileobj``, None if unknown
+            file_content_type: Content type of the file part
+            progress_callback: Called with (bytes_sent, total_bytes) as the body is read.
+                               Compressed uploads report raw file bytes consumed instead.
+        """
+        self.boundary = uuid.uuid4().hex
+        self._fileobj = fileobj
+        self._file_remaining = file_size
+        self._file_size = file_size
+        self.progress_callback = progress_callback
+
+        head = io.BytesIO()
+        for name, value in fields.items():
+            head.write(f"--{self.boundary}\r\n".encode())
+            head.write(f'Content-Disposition: form-data; name="{name}"\r\n\r\n'.encode())
+            head.write(value.encode("utf-8"))
+            head.write(b"\r\n")
+        head.write(f"--{self.boundary}\r\n".encode())
+        head.write(f'Content-Disposition: form-data; name="{file_field}"; filename="{filename}"\r\n'.encode())
+        head.write(f"Content-Type: {file_content_type}\r\n\r\n".encode())
+
+        self._head = head.getvalue()
+        self._tail = f"\r\n--{self.boundary}--\r\n".encode()
+        self.length = None if file_size is None else len(self._head) + file_size + len(self._tail)
+        self._buffer = memoryview(self._head)
+        self._stage = "head"
+        self.bytes_read = 0
+
+    @classmethod
+    def from_path(
+        cls,
+        path: Union[str, Path],
+        fields: dict[str, str],
+        file_field: str = "file",
+        filename: Optional[str] = None,
+        file_content_type: str = "application/json",
+        progress_callback: Optional[ProgressCallback] = None,
+        compression: Optional[str] = None,
+    ) -> "StreamingMultipartEncoder":
+        """
+        Open ``path`` and build an encoder streaming it. Close the encoder when done.
+
+        Args:
+            compression: "gzip" or "zstd" to compress the file part on the fly
+                         (use resolve_compression() to pick one). The part's content
+                         type and filename suffix reflect the codec.
+
+        Raises:
+            FileNotFoundError, PermissionError: If the file cannot be opened
+        """
+        fileobj = open(path, "rb")  # noqa: SIM115 - owned and closed by the encoder
+        try:
+            size = os.fstat(fileobj.fileno()).st_size
+            filename = str(filename or path)
+            if compression:
+                file_content_type, suffix = COMPRESSION_FORMATS[compression]
+                filename += suffix
+                fileobj, size = CompressingReader(fileobj, compression, total_bytes=size), None
+            return cls(
+                fields,
+                file_field,
+                filename,
+                fileobj,
+                size,
+                file_content_type=file_content_type,
+                progress_callback=progress_callback,
+            )
+        except BaseException:
+            fileobj.close()
+            raise
+
+    @property
+    def content_type(self) -> str:
+        """Value for the request's Content-Type header."""
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        if self.length is None:
+            raise TypeError("Body length is unknown for compressed uploads; send iter(encoder)")
+        return self.length
+
+    @property
+    def raw_file_bytes(self) -> int:
+        """Bytes of the original file consumed so far."""
+        if isinstance(self._fileobj, CompressingReader):
+            return self._fileobj.raw_bytes
+        return self._file_size - self._file_remaining
+
+    def _next_block(self, size: int) -> bytes:
+        if self._stage == "head":
+            self._stage = "file"
+        if self._stage == "file":
+            if self._file_remaining is None:
+                block = self._fileobj.read(size)
+                if block:
+                    return block
+            elif self._file_remaining > 0:
+                block = self._fileobj.read(min(size, self._file_remaining))
+                if not block:
+                    raise OSError("File changed size while it was being uploaded")
+                self._file_remaining -= len(block)
+                return block
+            self._stage = "tail"
+            return self._tail
+        self._stage = "done"
+        return b""
+
+    def read(self, size: int = -1) -> bytes:
+        """Return up to ``size`` bytes of the body (``-1`` reads one file chunk)."""
+        if size is None or size < 0:
+            size = UPLOAD_CHUNK_SIZE
+
+        out = bytearray()
+        while len(out) < size and self._stage != "done":
+            if not self._buffer:
+                self._buffer = memoryview(self._next_block(max(size - len(out), UPLOAD_CHUNK_SIZE // 16)))
+                if not self._buffer:
+                    break
+            take = self._buffer[: size - len(out)]
+            self._buffer = self._buffer[len(take) :]
+            out += take
+
+        if out:
+            self.bytes_read += len(out)
+            if self.progress_callback:
+                if isinstance(self._fileobj, CompressingReader):
+                    # Compressed size is unknown up front: report progress through the raw file
+                    self.progress_callback(self._fileobj.raw_bytes, self._fileobj.total_bytes)
+                else:
+                    self.progress_callback(self.bytes_read, self.length)
+        return bytes(out)
+
+    def __iter__(self):
+        while True:
+            block = self.read(UPLOAD_CHUNK_SIZE)
+            if not block:
+                return
+            yield block
+
+    def close(self) -> None:
+        """Close the underlying file."""
+        self._fileobj.close()
+
+    def __enter__(self) -> "StreamingMultipartEncoder":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+
+# Default size of a resumable upload part
+UPLOAD_PART_SIZE = 8 * 1024 * 1024
+
+
+class ResumableUploadError(Exception):
+    """Raised when a resumable upload cannot be completed."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _sha256_hex(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class ResumableUploader:
+    """
+    Uploads a file in fixed-size parts that survive dropped connections.
+
+    Protocol (all paths relative to ``base_url``, JSON unless noted):
+
+    - ``POST /v1/api-discovery/uploads`` with ``{filename, size, part_size, part_count, metadata}``
+      returns ``{"upload_id": ...}``
+    - ``PUT /v1/api-discovery/uploads/<id>/parts/<n>`` with the raw part bytes and an
+      ``X-Part-SHA256`` header returns ``{"part": n, "sha256": ...}``
+    - ``POST /v1/api-discovery/uploads/<id>/complete`` with ``{"parts": [{part, sha256}, ...]}``
+      returns the same response as a single-request upload
+
+    Acknowledged parts are recorded with their checksums in a resume-state file
+    next to the HAR (``<file>.upload-state.json``). After a failure, calling
+    ``upload()`` again re-sends only parts that were not acknowledged or whose
+    content changed. ``examples/local_upload_server.py`` implements the server
+    side for local testing.
+    """
+
+    UPLOADS_PATH = "/v1/api-discovery/uploads"
+
+    def __init__(
+        self,
+        base_url: str,
+        auth_token: str,
+        part_size: int = UPLOAD_PART_SIZE,
+        concurrency: int = 4,
+        max_retries: int = 3,
+        timeout: tuple[float, float] = (10.0, 120.0),
+        progress_callback: Optional[ProgressCallback] = None,
+        session=None,
+    ):
+        """
+        Initialize the uploader.
+
+        Args:
+            base_url: API base URL
+            auth_token: Bearer token sent with every request
+            part_size: Bytes per part (default: 8 MB). Memory use is about
+                       ``part_size * concurrency``.
+            concurrency: Parts uploaded in parallel (default: 4)
+            max_retries: Attempts per part before the upload is abandoned (resumable later)
+            timeout: (connect, read) timeout for each request
+            progress_callback: Called with (bytes_acknowledged, total_bytes)
+            session: Optional requests.Session to send requests with
+        """
+        if part_size < 1 or concurrency < 1:
+            raise ValueError("part_size and concurrency must be at least 1")
+
+        self.base_url = base_url.rstrip("/")
+        self.auth_token = auth_token
+        self.part_size = part_size
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.progress_callback = progress_callback
+        self._session = session or requests.Session()
+        self._state_lock = threading.Lock()
+
+    @staticmethod
+    def state_path(path: Union[str, Path]) -> Path:
+        """Resume-state file used for ``path``."""
+        path = Path(path)
+        return path.with_name(f"{path.name}.upload-state.json")
+
+    def _request(self, method: str, url_path: str, **kwargs) -> dict:
+        headers = {"Authorization": f"Bearer {self.auth_token}", **kwargs.pop("headers", {})}
+        response = self._session.request(
+            method, f"{self.base_url}{url_path}", headers=headers, timeout=self.timeout, **kwargs
+        )
+        if response.status_code >= 400:
+            raise ResumableUploadError(
+                f"{method} {url_path} failed: HTTP {response.status_code}", status_code=response.status_code
+            )
+        try:
+            return response.json()
+        except ValueError:
+            raise ResumableUploadError(f"Invalid response format from {url_path}")
+
+    def _load_state(self, path: Path, size: int, mtime: float) -> Optional[dict]:
+        try:
+            with open(self.state_path(path), encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # A different file or part layout cannot be resumed
+        if state.get("size") != size or state.get("mtime") != mtime or state.get("part_size") != self.part_size:
+            return None
+        return state
+
+    def _save_state(self, path: Path, state: dict) -> None:
+        with self._state_lock:
+            write_private_json(self.state_path(path), state)
+
+    @staticmethod
+    def _read_part(path: Path, index: int, part_size: int) -> bytes:
+        with open(path, "rb") as f:
+            f.seek(index * part_size)
+            return f.read(part_size)
+
+    def _upload_part(self, path: Path, state: dict, index: int) -> int:
+        data = self._read_part(path, index, self.part_size)
+        checksum = _sha256_hex(data)
+        url_path = f"{self.UPLOADS_PATH}/{state['upload_id']}/parts/{index}"
+
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                ack = self._request(
+                    "PUT",
+                    url_path,
+                    data=data,
+                    headers={"Content-Type": "application/octet-stream", "X-Part-SHA256": checksum},
+                )
+                if ack.get("sha256") != checksum:
+                    raise ResumableUploadError(f"Checksum mismatch acknowledging part {index}")
+                break
+            except (requests.exceptions.RequestException, ResumableUploadError) as e:
+                status = getattr(e, "status_code", None)
+                if attempt == self.max_retries or (status is not None and 400 <= status < 500 and status != 429):
+                    raise
+                time.sleep(min(30.0, 0.5 * 2 ** (attempt - 1)) * random.uniform(0.5, 1.5))
+
+        with self._state_lock:
+            state["parts"][str(index)] = checksum
+        self._save_state(path, state)
+        return len(data)
+
+    def upload(self, path: Union[str, Path], metadata: Optional[dict] = None, filename: Optional[str] = None) -> dict:
+        """
+        Upload ``path``, resuming a previous attempt when possible.
+
+        Args:
+            path: File to upload
+            metadata: Metadata sent when the upload is created
+            filename: File name reported to the server (default: ``path``)
+
+        Returns:
+            Response JSON of the completed upload
+
+        Raises:
+            ResumableUploadError: If a part keeps failing or the server rejects the upload
+            requests.exceptions.RequestException: On network errors after all retries
+        """
+        path = Path(path)
+        stat = path.stat()
+        part_count = max(1, -(-stat.st_size // self.part_size))
+
+        state = self._load_state(path, stat.st_size, stat.st_mtime)
+        resumed = state is not None
+        if state is None:
+            created = self._request(
+                "POST",
+                self.UPLOADS_PATH,
+                json={
+                    "filename": filename or str(path),
+                    "size": stat.st_size,
+                    "part_size": self.part_size,
+                    "part_count": part_count,
+                    "metadata": metadata or {},
+                },
+            )
+            state = {
+                "upload_id": created["upload_id"],
+                "size": stat.st_size,
+                "mtime": stat.st_mtime,
+                "part_size": self.part_size,
+                "parts": {},
+            }
+            self._save_state(path, state)
+
+        # Only trust acknowledged parts whose bytes on disk still match
+        pending = []
+        acknowledged = 0
+        for index in range(part_count):
+            checksum = state["parts"].get(str(index))
+            data_len = min(self.part_size, stat.st_size - index * self.part_size)
+            if checksum and _sha256_hex(self._read_part(path, index, self.part_size)) == checksum:
+                acknowledged += data_len
+            else:
+                pending.append(index)
+
+        if acknowledged:
+            print(f"Resuming upload {state['upload_id']}: {part_count - len(pending)}/{part_count} parts already sent")
+        if self.progress_callback:
+            self.progress_callback(acknowledged, stat.st_size)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            futures = [pool.submit(self._upload_part, path, state, index) for index in pending]
+            try:
+                for future in as_completed(futures):
+                    acknowledged += future.result()
+                    if self.progress_callback:
+                        self.progress_callback(acknowledged, stat.st_size)
+            except ResumableUploadError as e:
+                for future in futures:
+                    future.cancel()
+                if e.status_code == 404 and resumed:
+                    # The server expired the upload: start over instead of failing on every retry
+                    self.state_path(path).unlink(missing_ok=True)
+                    print(f"Upload {state['upload_id']} expired on the server, starting a new upload")
+                    return self.upload(path, metadata, filename)
+                raise
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+        parts = [{"part": index, "sha256": state["parts"][str(index)]} for index in range(part_count)]
+        result = self._request("POST", f"{self.UPLOADS_PATH}/{state['upload_id']}/complete", json={"parts": parts})
+        self.state_path(path).unlink(missing_ok=True)
+        return result
@@ -0,0 +1,139 @@
+"""Handles on HAR uploads running in the background, through upload and discovery processing."""
+
+import random
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+from .upload import UploadStats
+
+# Upload job lifecycle states
+UPLOAD_QUEUED = "queued"
+UPLOAD_UPLOADING = "uploading"
+UPLOAD_PROCESSING = "processing"
+UPLOAD_COMPLETED = "completed"
+UPLOAD_FAILED = "failed"
+
+# Uploads running in parallel on a ZAPI instance's upload pool
+UPLOAD_JOB_WORKERS = 4
+
+# Discovery status polling: first delay, doubled after every poll up to the maximum
+STATUS_POLL_BASE_SECONDS = 1.0
+STATUS_POLL_MAX_SECONDS = 30.0
+
+# Keys the upload response may carry the discovery job ID under
+_JOB_ID_KEYS = ("job_id", "discovery_id", "upload_id", "id")
+
+# Discovery statuses reported by the backend that end polling
+_DONE_STATUSES = frozenset({"completed", "complete", "done", "succeeded", "success", "processed"})
+_FAILED_STATUSES = frozenset({"failed", "error", "errored", "cancelled", "canceled"})
+
+
+def discovery_job_id(upload_response: Any) -> Optional[str]:
+    """
+    Discovery job ID from an upload response.
+
+    Returns:
+        The ID, or None if the backend does not report one
+    """
+    if not isinstance(upload_response, dict):
+        return None
+    for key in _JOB_ID_KEYS:
+        value = upload_response.get(key)
+        if value not in (None, "") and not isinstance(value, bool):
+            return str(value)
+    return None
+
+
+def discovery_state(status: dict[str, Any]) -> Optional[str]:
+    """
+    Map a discovery status response to UPLOAD_COMPLETED or UPLOAD_FAILED.
+
+    Returns:
+        The final state, or None while processing is still running
+    """
+    value = str(status.get("status") or status.get("state") or "").lower()
+    if value in _DONE_STATUSES:
+        return UPLOAD_COMPLETED
+    if value in _FAILED_STATUSES:
+        return UPLOAD_FAILED
+    return None
+
+
+def status_poll_delay(attempt: int) -> float:
+    """Jittered delay before status poll number ``attempt`` (starting at 1)."""
+    delay = min(STATUS_POLL_MAX_SECONDS, STATUS_POLL_BASE_SECONDS * 2 ** (attempt - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+UploadJobCallback = Callable[["UploadJob"], None]
+
+
+class UploadJob:
+    """
+    Handle on a HAR upload started with ZAPI.upload_har_async() or upload_many().
+
+    The job moves from ``queued`` to ``uploading``, then ``processing`` while
+    the backend's discovery status is polled, and ends ``completed`` or
+    ``failed``. ``result()`` blocks until then; callbacks run on completion
+    without blocking the caller.
+    """
+
+    def __init__(self, har_file: Union[str, Path]):
+        self.har_file = str(har_file)
+        self.status = UPLOAD_QUEUED
+        # Response JSON of the upload request
+        self.response: Optional[dict] = None
+        # Last discovery status response, when the backend reports one
+        self.processing_status: Optional[dict] = None
+        self.stats: Optional[UploadStats] = None
+        self.error: Optional[BaseException] = None
+        self._future: Future = Future()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"UploadJob({self.har_file!r}, status={self.status!r}, job_id={self.job_id!r})"
+
+    @property
+    def job_id(self) -> Optional[str]:
+        """Discovery job ID reported by the upload response, if any."""
+        return discovery_job_id(self.response)
+
+    def done(self) -> bool:
+        """True once the job has completed or failed."""
+        return self._future.done()
+
+    def result(self, timeout: Optional[float] = None) -> dict:
+        """
+        Wait for the job to finish.
+
+        Args:
+            timeout: Seconds to wait (default: no limit)
+
+        Returns:
+            The final discovery status, or the upload response when the backend
+            does not report processing status
+
+        Raises:
+            concurrent.futures.TimeoutError: If the job is still running after ``timeout``
+            ZAPIError: If the upload or discovery processing failed
+        """
+        return self._future.result(timeout)
+
+    def add_done_callback(self, callback: UploadJobCallback) -> None:
+        """Call ``callback(job)`` once the job finishes (at once if it already has)."""
+        self._future.add_done_callback(lambda _: callback(self))
+
+    def _set_status(self, status: str) -> None:
+        with self._lock:
+            self.status = status
+
+    def _complete(self, result: dict) -> None:
+        self._set_status(UPLOAD_COMPLETED)
+        self._future.set_result(result)
+
+    def _fail(self, error: BaseException) -> None:
+        self.error = error
+        self._set_status(UPLOAD_FAILED)
+        self._future.set_exception(error)